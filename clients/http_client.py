@@ -1,17 +1,19 @@
+import asyncio
 import json
 import logging
 import os
-from datetime import datetime
 from typing import Optional
-from zoneinfo import ZoneInfo
 
 import requests
-from allure import attach, attachment_type
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from allure import attachment_type
 
+from clients.http_response_cache import HttpResponseCache
+from clients.http_transport import get_http_transport
 from constants.architecture_constants import EnvKeyConstants as Env_const
 from constants.architecture_constants import HTTPClientConstants as Http_const
+from constants.architecture_constants import HttpTransportConstants as Transport_const
+from utils.helpers.pytest_deferred_attach import attach_deferred
+from utils.helpers.time_conversion_utils import now_in
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +24,11 @@ class HttpClient:
     """
 
     def __init__(self):
-        self.session = self._create_retry_session()
+        transport = get_http_transport()
+        self.session = transport.session(Transport_const.RETRYING_POLICY)
+        self._plain_session = transport.session(Transport_const.PLAIN_POLICY)
+        # Заголовки клиента передаются в каждом запросе: сессии общие для всех клиентов процесса
+        self._headers: dict = {}
         self.suppress_recv_logging: bool = False
 
     def make_request(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
@@ -36,7 +42,7 @@ class HttpClient:
         try:
             if not self.suppress_recv_logging:
                 logging.info(f"[HTTP_CLIENT] Выполняю запрос: METHOD: {method} URL: {url}")
-            response = requests.request(method, url, **kwargs)
+            response = self._plain_session.request(method, url, **kwargs)
             response.raise_for_status()
             return response
         except requests.HTTPError as error:
@@ -59,7 +65,8 @@ class HttpClient:
         try:
             if not self.suppress_recv_logging:
                 logging.info(f"[HTTP_CLIENT] Выполняю запрос: METHOD: {method} URL: {url}")
-            response = self.session.request(method, url, **kwargs)
+            headers = {**self._headers, **(kwargs.pop("headers", None) or {})}
+            response = self.session.request(method, url, headers=headers, **kwargs)
             response.raise_for_status()
             if not self._should_suppress_recv_attach():
                 self._create_attach_from_http_response(response)
@@ -73,6 +80,12 @@ class HttpClient:
             logger.exception(f"[HTTP_CLIENT] [ERROR] При выполнении запроса. METHOD: {method} URL: {url}")
             raise
 
+    async def make_session_request_async(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
+        """
+        make_session_request в потоке: http-проверки выполняются параллельно с ожиданием ws-сообщений
+        """
+        return await asyncio.to_thread(self.make_session_request, method, url, **kwargs)
+
     @staticmethod
     def get_base_url(url_key: str) -> str:
         return os.environ.get(url_key)
@@ -128,44 +141,16 @@ class HttpClient:
     @staticmethod
     def _create_attach_from_http_response(response: requests.Response) -> None:
         """
-        Создает json вложение http ответа в аллюр
+        Создает json вложение http ответа в аллюр (при падении теста, см. pytest_deferred_attach)
         """
 
-        try:
-            attach(
-                body=json.dumps(
-                    {"headers": dict(response.headers), "body": response.json()}, ensure_ascii=False, indent=2
-                ),
-                name=f"HTTP Response от api-gateway {datetime.now(ZoneInfo(Http_const.ZONE_INFO))}",
-                attachment_type=attachment_type.JSON,
-            )
-        except (KeyError, RuntimeError) as error:
-            logger.debug("Allure attach пропущен: %s", error)
-
-    @staticmethod
-    def _create_retry_session(
-        retries: int = 3,
-        backoff_factor: float = 0.3,
-        status_forcelist: tuple = Http_const.STATUS_FORCE_LIST,
-        allowed_methods: tuple = Http_const.ALLOWED_METHODS,
-    ) -> requests.Session():
-        """
-        Создает сессию для выполнения нескольких одинаковых запросов
-        """
-        session = requests.Session()
-        retry = Retry(
-            total=retries,
-            read=retries,
-            connect=retries,
-            backoff_factor=backoff_factor,
-            status_forcelist=status_forcelist,
-            allowed_methods=allowed_methods,
-            raise_on_status=False,
+        attach_deferred(
+            lambda: json.dumps(
+                {"headers": dict(response.headers), "body": response.json()}, ensure_ascii=False, indent=2
+            ),
+            name=f"HTTP Response от api-gateway {now_in(Http_const.ZONE_INFO)}",
+            attachment_type=attachment_type.JSON,
         )
-        adapter = HTTPAdapter(max_retries=retry)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        return session
 
 
 class StandHttpClient(HttpClient):
@@ -173,22 +158,48 @@ class StandHttpClient(HttpClient):
     Выполняет http запросы к стендам
     """
 
-    def __init__(self, stand_url: str, token: str) -> None:
+    def __init__(self, stand_url: str, token: str, response_cache: Optional[HttpResponseCache] = None) -> None:
         super().__init__()
         self._stand_url = stand_url
         self._token = token
         self._headers = self._add_token_to_headers()
-        self.session.headers.update(self._headers)
+        self._response_cache = response_cache
 
-    def post_request(self, endpoint: str, payload: dict | str) -> Optional[requests.Response]:
+    def post_request(self, endpoint: str, payload: dict | str, use_cache: bool = True) -> Optional[requests.Response]:
         """
-        Делает http post запрос к стенду
+        Делает http post запрос к стенду.
+        Ответы справочных запросов берутся из кэша набора (response_cache), если он передан
+        :param use_cache: False - ответ не берётся из кэша, а запрашивается и обновляет кэш (long-poll статусов)
         """
         full_url = self.generate_full_url(self._stand_url, endpoint)
         json_payload = json.dumps(payload)
+        cache = self._response_cache
+        if cache is None or not (cache.is_cacheable(endpoint) or cache.is_invalidating(endpoint)):
+            return self.make_session_request(Http_const.POST_METHOD, full_url, data=json_payload)
+        if cache.is_invalidating(endpoint):
+            try:
+                return self.make_session_request(Http_const.POST_METHOD, full_url, data=json_payload)
+            finally:
+                # Команда могла выполниться и при ошибке ответа, поэтому кэш сбрасывается в любом случае
+                cache.invalidate(endpoint)
+        key = (self._stand_url, self._token, endpoint, json_payload)
+        response = cache.get(key) if use_cache else None
+        if response is not None:
+            if not self._should_suppress_recv_attach():
+                self._create_attach_from_http_response(response)
+            return response
         response = self.make_session_request(Http_const.POST_METHOD, full_url, data=json_payload)
+        cache.put(key, response)
         return response
 
+    async def post_request_async(
+        self, endpoint: str, payload: dict | str, use_cache: bool = True
+    ) -> Optional[requests.Response]:
+        """
+        post_request без блокировки event loop
+        """
+        return await asyncio.to_thread(self.post_request, endpoint, payload, use_cache)
+
     def _add_token_to_headers(self) -> dict:
         """
         Добавляет token в headers запроса
@@ -0,0 +1,81 @@
+import logging
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+
+import requests
+
+from constants.architecture_constants import HttpResponseCacheConstants as Cache_Const
+
+logger = logging.getLogger(__name__)
+
+
+class HttpResponseCache:
+    """
+    Кэш ответов идемпотентных справочных запросов к стенду (GetBasicInfo, GetBasicInfoAdmin,
+    GetTusInformation, Ping) на время набора. Ответ отдаётся из кэша не дольше ttl_seconds,
+    команды конфигуратора (LaunchLds/StopLds) сбрасывают кэш целиком. Кэш общий для http-клиентов набора
+    и потокобезопасен (post_request_async выполняет запросы в потоках). Считает попадания и промахи.
+    Пример использования:
+    cache = HttpResponseCache()
+    http_client = StandHttpClient(stand_host, auth_token, response_cache=cache)
+    http_client.post_request(HttpConst.GET_BASIC_INFO_URL_PATH, {})                   # промах, запрос к стенду
+    http_client.post_request(HttpConst.GET_BASIC_INFO_URL_PATH, {})                   # попадание
+    http_client.post_request(HttpConst.GET_BASIC_INFO_URL_PATH, {}, use_cache=False)  # запрос и обновление кэша
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = Cache_Const.TTL_SECONDS,
+        cacheable_paths: frozenset = Cache_Const.CACHEABLE_PATHS,
+        invalidating_paths: frozenset = Cache_Const.INVALIDATING_PATHS,
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._cacheable_paths = cacheable_paths
+        self._invalidating_paths = invalidating_paths
+        self._lock = threading.Lock()
+        # ключ запроса -> (время сохранения по time.monotonic(), ответ)
+        self._responses: Dict[Hashable, Tuple[float, requests.Response]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def is_cacheable(self, endpoint: str) -> bool:
+        return endpoint in self._cacheable_paths
+
+    def is_invalidating(self, endpoint: str) -> bool:
+        return endpoint in self._invalidating_paths
+
+    def get(self, key: Hashable) -> Optional[requests.Response]:
+        """
+        Ответ из кэша, если он сохранён не раньше ttl_seconds назад
+        :return: None - промах, запрос нужно выполнить
+        """
+        with self._lock:
+            cached = self._responses.get(key)
+            if cached is not None and time.monotonic() - cached[0] <= self._ttl_seconds:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, response: requests.Response) -> None:
+        with self._lock:
+            self._responses[key] = (time.monotonic(), response)
+
+    def invalidate(self, reason: str) -> None:
+        with self._lock:
+            dropped = len(self._responses)
+            self._responses.clear()
+        if dropped:
+            logger.debug(f"[HTTP_CACHE] Кэш ответов сброшен ({reason}), удалено ответов: {dropped}")
+
+    def clear(self) -> None:
+        """
+        Сбрасывает ответы и счётчики в конце набора, итог по набору пишется в лог
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            self._responses.clear()
+            self.hits = self.misses = 0
+        if hits or misses:
+            logger.info(f"[HTTP_CACHE] Справочные запросы набора: из кэша {hits}, к стенду {misses}")
@@ -0,0 +1,109 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from constants.architecture_constants import HTTPClientConstants as Http_const
+from constants.architecture_constants import HttpTransportConstants as Transport_const
+
+logger = logging.getLogger(__name__)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter с таймаутом по умолчанию для запросов, в которых timeout не передан
+    """
+
+    def __init__(self, *args, timeout: tuple = Transport_const.DEFAULT_TIMEOUT, **kwargs) -> None:
+        self._timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=self._timeout if timeout is None else timeout, **kwargs)
+
+
+class HttpTransport:
+    """
+    Общий для процесса пул http-соединений: keep-alive, ограничение соединений на хост, таймауты и повторы.
+    На каждую политику повторов одна requests.Session:
+    - RETRYING_POLICY - запросы к стендам: повторы по статусам STATUS_FORCE_LIST и ошибкам сети;
+    - PLAIN_POLICY - TestOps и Keycloak: повторяются только неудавшиеся подключения
+      (загрузка файлов и выдача токена по статусу ответа не повторяются).
+    Сессии общие для всех клиентов, поэтому заголовки авторизации передаются в каждом запросе, а не в сессии.
+    Пример использования:
+    session = get_http_transport().session(Transport_const.RETRYING_POLICY)
+    response = session.request(method, url, headers=headers, data=payload)
+    """
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session(self, policy: str = Transport_const.RETRYING_POLICY) -> requests.Session:
+        session = self._sessions.get(policy)
+        if session is not None:
+            return session
+        with self._lock:
+            if policy not in self._sessions:
+                self._sessions[policy] = self._create_session(self._create_retry(policy))
+                logger.debug(f"[HTTP_TRANSPORT] Создана сессия с политикой повторов {policy}")
+            return self._sessions[policy]
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    @staticmethod
+    def _create_retry(policy: str) -> Retry:
+        if policy == Transport_const.RETRYING_POLICY:
+            return Retry(
+                total=Transport_const.RETRIES,
+                read=Transport_const.RETRIES,
+                connect=Transport_const.RETRIES,
+                backoff_factor=Transport_const.BACKOFF_FACTOR,
+                status_forcelist=Http_const.STATUS_FORCE_LIST,
+                allowed_methods=Http_const.ALLOWED_METHODS,
+                raise_on_status=False,
+            )
+        if policy == Transport_const.PLAIN_POLICY:
+            return Retry(
+                total=None,
+                connect=Transport_const.RETRIES,
+                read=0,
+                status=0,
+                other=0,
+                backoff_factor=Transport_const.BACKOFF_FACTOR,
+                raise_on_status=False,
+            )
+        raise ValueError(f"Неизвестная политика повторов http: {policy}")
+
+    @staticmethod
+    def _create_session(retry: Retry) -> requests.Session:
+        session = requests.Session()
+        adapter = TimeoutHTTPAdapter(
+            pool_connections=Transport_const.POOL_HOSTS,
+            pool_maxsize=Transport_const.POOL_MAXSIZE_PER_HOST,
+            pool_block=True,
+            max_retries=retry,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_http_transport() -> HttpTransport:
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpTransport()
+    return _transport
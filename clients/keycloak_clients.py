@@ -5,6 +5,8 @@ from typing import Any, Dict, Optional
 import requests
 from dotenv import load_dotenv
 
+from clients.http_transport import get_http_transport
+from constants.architecture_constants import HttpTransportConstants as Transport_const
 from constants.architecture_constants import KeycloakClientConstants
 
 load_dotenv()
@@ -106,7 +108,8 @@ class KeycloakClient:
         }
         try:
             headers = self.keycloak_headers
-            response_token = requests.post(self.url, data=data, headers=headers, timeout=5)
+            session = get_http_transport().session(Transport_const.PLAIN_POLICY)
+            response_token = session.post(self.url, data=data, headers=headers, timeout=5)
             response_token.raise_for_status()
             token_data = response_token.json()
             token = token_data.get(self.token_key)
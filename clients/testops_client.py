@@ -8,7 +8,9 @@ from typing import BinaryIO, Optional
 import conftest
 import requests
 
+from clients.http_transport import get_http_transport
 from constants.architecture_constants import EnvKeyConstants as Env_Const
+from constants.architecture_constants import HttpTransportConstants as Transport_const
 from constants.architecture_constants import TestOpsConstants as T_const
 
 logger = logging.getLogger(__name__)
@@ -128,7 +130,8 @@ class AllureResultsUploader:
         :return: объект ответа
         """
         try:
-            response = requests.request(method, url, **kwargs)
+            session = get_http_transport().session(Transport_const.PLAIN_POLICY)
+            response = session.request(method, url, **kwargs)
             response.raise_for_status()
             return response
         except Exception as e:
@@ -1,15 +1,33 @@
 import asyncio
 import logging
+import threading
 import time
-from typing import Any, Callable, List, Optional
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
 
 import msgpack
 import websockets
 from websockets import InvalidStatus
 
+from clients.ws_message_router import (
+    ANY_KEY,
+    ChannelPolicy,
+    ChannelStats,
+    RoutedMessageQueue,
+    RouteKey,
+    WsMessageRouter,
+    invocation_key,
+    type_key,
+)
+from clients.ws_snapshot_store import (
+    WsSnapshotStore,
+    get_params_tu_ids,
+    get_reply_tu_id,
+    get_subscription_content_type,
+    get_subscription_key,
+)
+from clients.ws_traffic_recorder import WsTrafficRecorder
 from constants.architecture_constants import WebSocketClientConstants as WS_Const
-from utils.msgpack_utils.message_filters import is_desired_invocation_id, is_desired_type
-from utils.msgpack_utils.msgpack_utils import encode_with_varint_prefix, parse_message
+from utils.msgpack_utils.msgpack_utils import SignalRFrameDecoder, decode_message, encode_with_varint_prefix
 
 logger = logging.getLogger(__name__)
 
@@ -19,50 +37,103 @@ class WebSocketClient:
     Асинхронный ws-клиент для api-gateway по протоколу Async Api
     """
 
+    # Открытые клиенты и сессии процесса (для SuiteWatchdog): простой считается по каждому отдельно,
+    # чтобы данные одного соединения не скрывали замолчавшую подписку другого
+    _activity_lock = threading.Lock()
+    _open_clients: Set["WebSocketClient"] = set()
+
     def __init__(
         self,
         host: str,
         access_token: str,
         x_user_id: str,
         reconnect_interval: float = WS_Const.DEFAULT_RECONNECT_INTERVAL,
+        snapshot_store: Optional[WsSnapshotStore] = None,
+        channel_policies: Optional[Dict[str, ChannelPolicy]] = None,
+        recorder: Optional[WsTrafficRecorder] = None,
+        scheme: str = WS_Const.WS_SCHEME,
     ):
         self._host = host
         self._access_token = access_token
         self._x_user_id = x_user_id
         self._reconnect_interval = reconnect_interval
-        self._ws_url = f"wss://{host.rstrip('/')}{WS_Const.WS_HUBS}"
+        # scheme="ws" - локальный эмулятор хаба без TLS (infra/ws_hub_emulator.py)
+        self._ws_url = f"{scheme}://{host.rstrip('/')}{WS_Const.WS_HUBS}"
         self._buffer = b""
+        # Фрейм может содержать несколько сообщений SignalR
+        self._decoder = SignalRFrameDecoder()
         self._next_id = WS_Const.START_INVOCATION_ID
 
         self._ws: websockets.ClientConnection | None = None
-        self.recv_queue: asyncio.Queue[Any] = asyncio.Queue()
+        # Входящие сообщения раскладываются по каналам типа контента и invocation_id,
+        # recv_queue - общий канал в порядке поступления. Каналы частых подписок ограничены политиками
+        # (WsChannelPolicyConstants.DEFAULT_POLICIES), чтобы неизвлечённые push не копились
+        self._router = WsMessageRouter(policies=channel_policies)
+        self.recv_queue = RoutedMessageQueue(self._router)
+        # Последние сообщения подписок (общие для соединений набора, если store передан)
+        self.snapshot_store = snapshot_store if snapshot_store is not None else WsSnapshotStore()
+        # Подписки клиента: тип контента -> ключ подписки в snapshot_store -> tuId из её параметров
+        self._subscriptions: Dict[str, Dict[Tuple[str, str], Optional[FrozenSet[Hashable]]]] = {}
+        # Запись входящих фреймов для воспроизведения без стенда (WsReplayClient), у клиента свой номер соединения
+        self._recorder = recorder
+        self._record_connection_id = recorder.new_connection_id() if recorder is not None else 0
         self._recv_task: asyncio.Task | None = None
         self._stop_event = asyncio.Event()
         self._invocation_id: Optional[str] = None
         self.suppress_recv_logging: bool = False
+        # Время последнего сообщения с данными (не Ping), None - клиент ещё ничего не запрашивал
+        self._last_data_message_at: Optional[float] = None
 
     @property
     def invocation_id(self):
         return self._invocation_id
 
+    @classmethod
+    def get_data_idle_s(cls) -> Optional[float]:
+        """
+        Наибольший простой среди открытых WS-клиентов: сколько секунд клиент не получал сообщений с данными
+        после первого вызова (invoke). None - открытых клиентов, ожидающих данные, нет
+        """
+        with cls._activity_lock:
+            last_data = [
+                client._last_data_message_at
+                for client in cls._open_clients
+                if client._last_data_message_at is not None
+            ]
+        if not last_data:
+            return None
+        return time.monotonic() - min(last_data)
+
     def clear_queue(self):
         """
-        Очищает очередь путем пересоздания экземпляра класса очереди
+        Очищает очередь: все полученные, но не извлечённые сообщения отбрасываются
         """
-        while not self.recv_queue.empty():
-            try:
-                self.recv_queue.get_nowait()
-                self.recv_queue.task_done()
-            except asyncio.QueueEmpty as message_empty:
-                logger.info(f"Очередь сообщений очищена: {message_empty}")
-                break
+        self._router.clear()
+        logger.info("Очередь сообщений очищена")
+
+    @property
+    def is_connected(self) -> bool:
+        """
+        Соединение установлено и цикл приёма сообщений работает
+        """
+        return self._recv_task is not None and not self._recv_task.done()
 
     async def __aenter__(self):
-        await self._connect_loop()
+        await self.connect()
+        self._mark_session_opened()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
+        self._mark_session_closed()
+        await self.close()
+
+    async def connect(self) -> None:
+        await self._connect_loop()
+
+    async def close(self) -> None:
         self._stop_event.set()
+        self._router.stop_blocking()
+        self._log_dropped()
         if self._ws:
             await self._ws.close()
         if self._recv_task:
@@ -70,6 +141,44 @@ class WebSocketClient:
 
         # TODO: дергать ручку завершения сессии в LDS-4083
 
+    def set_channel_policy(self, message_type: str, policy: Optional[ChannelPolicy]) -> None:
+        """
+        Политика канала типа контента (KEEP_LATEST, RING, BLOCK), None - без ограничения по типу
+        """
+        self._router.set_policy(message_type, policy)
+
+    def get_queue_stats(self) -> Dict[str, ChannelStats]:
+        """
+        Глубина очереди и число вытесненных сообщений по типам контента ("any" - все сообщения)
+        """
+        return self._router.get_stats()
+
+    def _log_dropped(self) -> None:
+        if not self._router.dropped:
+            return
+        dropped = ", ".join(
+            f"{name}: {stats.dropped}" for name, stats in self._router.get_stats().items() if stats.dropped
+        )
+        logger.info(f"Вытеснено неизвлечённых сообщений: {self._router.dropped} ({dropped})")
+
+    def _mark_session_opened(self) -> None:
+        with WebSocketClient._activity_lock:
+            WebSocketClient._open_clients.add(self)
+
+    def _mark_session_closed(self) -> None:
+        with WebSocketClient._activity_lock:
+            WebSocketClient._open_clients.discard(self)
+
+    def _mark_data_received(self) -> None:
+        self._last_data_message_at = time.monotonic()
+
+    def _mark_data_expected(self) -> None:
+        """
+        Простой клиента отсчитывается с первого вызова: до него данных по соединению не ждут
+        """
+        if self._last_data_message_at is None:
+            self._last_data_message_at = time.monotonic()
+
     async def _handshake(self) -> None:
         payload = WS_Const.HANDSHAKE_MESSAGE + WS_Const.RS.decode()
         logger.debug(
@@ -110,6 +219,7 @@ class WebSocketClient:
                 )
                 # Handshake
                 await self._handshake()
+                self._decoder.reset()
                 # Запускаем приём в фоне
                 self._recv_task = asyncio.create_task(self._recv_loop())
                 logger.info("Websocket connected")
@@ -150,14 +260,27 @@ class WebSocketClient:
                 logger.warning(f"WebSocket соединение разорвано: {e}")
                 return
 
-            result_message = parse_message(chunk)
+            await self._handle_frame(chunk)
+
+    async def _handle_frame(self, chunk) -> None:
+        """
+        Раскладывает сообщения фрейма по очереди; тело сообщения декодируется, только когда его извлекут
+        """
+        if self._recorder is not None:
+            self._recorder.record(chunk, self._record_connection_id)
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        for result_message in self._decoder.feed_lazy(chunk):
+            if not result_message.is_ping:
+                self._mark_data_received()
+            self._update_snapshot(result_message)
             await self.recv_queue.put(result_message)
-            if not self.suppress_recv_logging:
-                str_message = str(result_message)
-                logger.info(
-                    f"Обработанное сообщение от api-gateway: {str_message[:200]}... полное сообщение в attach",
-                )
-            continue
+            self._log_received(result_message)
+
+    def _log_received(self, result_message: Any) -> None:
+        if not self.suppress_recv_logging:
+            # Только заголовок: тело большого сообщения не декодируется и не форматируется ради лога
+            logger.info(f"Получено сообщение от api-gateway: {result_message!r}")
 
     async def invoke(self, target: str, args: list) -> None:
         """
@@ -173,10 +296,7 @@ class WebSocketClient:
         Сообщение запаковывается в messagepack и отправляется через текущее websocket соединение
         """
 
-        if not self._ws:
-            raise websockets.WebSocketException("Не установлено подключение по wss")
-        self._invocation_id = str(self._next_id)
-        self._next_id += 1
+        self._invocation_id = self._next_invocation_id()
         invocation = [
             WS_Const.DEFAULT_SIGNALR_MESSAGE_TYPE,
             WS_Const.DEFAULT_SIGNALR_MAP_HEADERS,
@@ -188,16 +308,15 @@ class WebSocketClient:
         payload = msgpack.packb(invocation, use_bin_type=True)
         packet = encode_with_varint_prefix(payload)
         logger.debug(f"Отправляем сообщение: {packet}")
-        await self._ws.send(packet)
+        self._on_invocation_prepared(self._invocation_id, target, args, packet, stream=False)
+        await self.send_packet(packet)
+        self._mark_data_expected()
 
     async def invoke_stream(self, target: str, args: list) -> None:
         """
         Отправляет streaming-вызов (StreamInvocation) по протоколу SignalR.
         """
-        if not self._ws:
-            raise websockets.WebSocketException("Не установлено подключение по wss")
-        self._invocation_id = str(self._next_id)
-        self._next_id += 1
+        self._invocation_id = self._next_invocation_id(stream=True)
         invocation = [
             WS_Const.STREAM_INVOCATION_MESSAGE_TYPE,
             WS_Const.DEFAULT_SIGNALR_MAP_HEADERS,
@@ -208,17 +327,83 @@ class WebSocketClient:
         logger.info(f"Streaming-сообщение подготовлено к отправке: {invocation}")
         payload = msgpack.packb(invocation, use_bin_type=True)
         packet = encode_with_varint_prefix(payload)
+        self._on_invocation_prepared(self._invocation_id, target, args, packet, stream=True)
+        await self.send_packet(packet)
+        self._mark_data_expected()
+
+    async def send_packet(self, packet: bytes) -> None:
+        """
+        Отправляет готовый пакет (messagepack с varint-префиксом) по текущему соединению
+        """
+        if not self._ws:
+            raise websockets.WebSocketException("Не установлено подключение по wss")
         await self._ws.send(packet)
 
+    def _on_invocation_prepared(self, invocation_id: str, target: str, args: Any, packet: bytes, stream: bool) -> None:
+        """
+        Вызов подготовлен и будет отправлен: подписка запоминается, чтобы её push сохранялись в snapshot_store
+        под ключом её параметров (сессия пула дополнительно регистрирует подписку на соединении)
+        """
+        content_type = None if stream else get_subscription_content_type(target)
+        if content_type is not None:
+            key = get_subscription_key(content_type, args)
+            self._subscriptions.setdefault(content_type, {})[key] = get_params_tu_ids(args)
+
+    def _update_snapshot(self, message: Any) -> None:
+        """
+        Сохраняет push подписки клиента в snapshot_store. Тело декодируется, только если клиент подписан
+        на тип контента с разными параметрами: подписка выбирается по tuId из replyContent
+        """
+        subscriptions = self._subscriptions.get(getattr(message, "content_type", None))
+        if not subscriptions:
+            return
+        if len(subscriptions) == 1:
+            self.snapshot_store.update(message, next(iter(subscriptions)))
+            return
+        tu_id = get_reply_tu_id(decode_message(message))
+        matched = [key for key, tu_ids in subscriptions.items() if tu_ids is not None and tu_id in tu_ids]
+        if len(matched) == 1:
+            self.snapshot_store.update(message, matched[0])
+
+    def _next_invocation_id(self, stream: bool = False) -> str:
+        """
+        Следующий invocation_id соединения
+        :param stream: id для streaming-вызова (StreamInvocation)
+        """
+        invocation_id = str(self._next_id)
+        self._next_id += 1
+        return invocation_id
+
     async def receive_by_type(self, message_type: str, timeout: WS_Const.FILTERING_TIMEOUT) -> List[Any]:
         """
         Фильтрует сообщения по message_type
         """
         try:
-            return await self._receive_by(filter_func=lambda msg: is_desired_type(msg, message_type), timeout=timeout)
+            return await self._receive_by(type_key(message_type), timeout=timeout)
         except websockets.WebSocketException:
             raise websockets.WebSocketException(f"Ошибка при фильтрации сообщений по {message_type}")
 
+    def get_latest_by_type(self, message_type: str, params: Any, max_age_s: float) -> Optional[List[Any]]:
+        """
+        Последнее полученное сообщение подписки с параметрами params не старше max_age_s секунд,
+        без ожидания следующего push. Сообщение могло прийти и другому клиенту набора с той же подпиской.
+        Возвращённое сообщение из очереди клиента извлекается, receive_by_type вернёт уже следующее
+        :return: None - свежего сообщения нет
+        """
+        snapshot = self.snapshot_store.get_latest(get_subscription_key(message_type, params), max_age_s=max_age_s)
+        if snapshot is None:
+            return None
+        self._router.discard(type_key(message_type), snapshot.raw)
+        logger.info(f"Сообщение {message_type} взято из последних полученных (возраст {snapshot.age_s:.1f} с)")
+        return snapshot.message
+
+    async def receive_raw(self, timeout: Optional[float]) -> Any:
+        """
+        Следующее сообщение общего канала без декодирования тела (LazySignalRMessage)
+        :raises asyncio.TimeoutError: сообщение не пришло за timeout
+        """
+        return await self._router.wait(ANY_KEY, timeout=timeout, decode=False)
+
     async def receive_by_invocation_id(
         self, invocation_id: str, timeout: float = WS_Const.FILTERING_TIMEOUT
     ) -> List[Any]:
@@ -226,33 +411,16 @@ class WebSocketClient:
         Фильтрует сообщения по invocation_id
         """
         try:
-            return await self._receive_by(
-                filter_func=lambda msg: is_desired_invocation_id(msg, invocation_id), timeout=timeout
-            )
+            return await self._receive_by(invocation_key(invocation_id), timeout=timeout)
         except websockets.WebSocketException:
             raise websockets.WebSocketException("Ошибка при фильтрации сообщений по invocation_id")
 
-    async def _receive_by(self, filter_func: Callable[[list], bool], timeout: float) -> List[Any]:
+    async def _receive_by(self, route_key: RouteKey, timeout: float) -> List[Any]:
         """
-        Ждет и фильтрует сообщение по filter_func
+        Ждет сообщение канала route_key (тип контента или invocation_id).
+        Сообщения других каналов остаются в своих каналах и доступны следующим запросам
         """
-        # 1) Единая точка вычисления дедлайна
-        deadline = time.monotonic() + timeout
-
-        while True:
-            # 2) Остаток времени до таймаута
-            remaining = deadline - time.monotonic()
-            if remaining <= 0:
-                raise asyncio.TimeoutError(f"Timeout при фильтрации сообщений {timeout:.1f} секунд")
-
-            try:
-                # 3) Получает сообщение
-                msg = await asyncio.wait_for(self.recv_queue.get(), timeout=remaining)
-            except asyncio.TimeoutError:
-                # 4) Явно перехватывает и пробрасывает свой TimeoutError
-                raise asyncio.TimeoutError(f"Timeout при фильтрации сообщений {timeout:.1f} секунд")
-
-            # 5) Фильтрация по filter_func
-            if isinstance(msg, list) and filter_func(msg):
-                return msg
-                
\ No newline at end of file
+        try:
+            return await self._router.wait(route_key, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise asyncio.TimeoutError(f"Timeout при фильтрации сообщений {timeout:.1f} секунд")
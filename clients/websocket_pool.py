@@ -0,0 +1,485 @@
+import asyncio
+import itertools
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Set
+
+import msgpack
+
+from clients.websocket_client import WebSocketClient
+from clients.ws_snapshot_store import (
+    WsSnapshotStore,
+    get_params_tu_ids,
+    get_reply_tu_id,
+    get_subscription_content_type,
+)
+from clients.ws_traffic_recorder import WsTrafficRecorder
+from constants.architecture_constants import WebSocketClientConstants as WS_Const
+from constants.architecture_constants import WebSocketPoolConstants as WSPool_Const
+from utils.msgpack_utils.msgpack_utils import LazySignalRMessage, encode_with_varint_prefix
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _StandingInvocation:
+    """
+    Подписка или streaming-вызов сессии, действующие на хабе до закрытия сессии (повторяются при переподключении)
+    """
+
+    session: "WebSocketSession"
+    packet: bytes
+    content_type: Optional[str]  # None - streaming-вызов, его сообщения маршрутизируются по invocation_id
+    tu_ids: Optional[FrozenSet[Hashable]]
+
+
+class WebSocketSession(WebSocketClient):
+    """
+    Логическая ws-сессия теста поверх общего соединения WebSocketPool.
+    Интерфейс тот же, что у WebSocketClient (invoke, receive_by_type, recv_queue, invocation_id ...),
+    но handshake не выполняется: сессия получает только
+    - ответы на свои вызовы (по invocation_id);
+    - push по своим подпискам (Subscribe<X>Request -> <X>Content), пришедшие пока сессия открыта.
+      Если на соединении подписаны несколько сессий с разными tuId, push доставляется по tuId из replyContent.
+    Сессия может работать на любом event loop: сообщения передаются из потока пула потокобезопасно.
+    Поток пула не ждёт сессию: канал с политикой BLOCK в сессии вытесняет старые сообщения как RING.
+    """
+
+    def __init__(self, pool: "WebSocketPool") -> None:
+        super().__init__(pool.host, pool.access_token, pool.x_user_id, snapshot_store=pool.snapshot_store)
+        self._pool = pool
+        self._connection: Optional["_HubConnection"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stream_invocation_ids: List[str] = []
+
+    @property
+    def is_connected(self) -> bool:
+        return self._connection is not None
+
+    async def __aenter__(self):
+        self._loop = asyncio.get_running_loop()
+        self._connection = await self._pool.run(self._pool.acquire(self))
+        self._mark_session_opened()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._mark_session_closed()
+        self._log_dropped()
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            await self._pool.run(self._pool.release(connection, self, self._stream_invocation_ids))
+
+    async def send_packet(self, packet: bytes) -> None:
+        if self._connection is None:
+            raise ConnectionError("WS-сессия не открыта")
+        await self._pool.run(self._connection.send_packet(packet))
+
+    def _next_invocation_id(self, stream: bool = False) -> str:
+        if self._connection is None:
+            raise ConnectionError("WS-сессия не открыта")
+        invocation_id = self._connection.register_invocation(self)
+        if stream:
+            self._stream_invocation_ids.append(invocation_id)
+        return invocation_id
+
+    def _on_invocation_prepared(self, invocation_id: str, target: str, args: Any, packet: bytes, stream: bool) -> None:
+        """
+        Подписки и streaming-вызовы регистрируются на соединении до отправки, чтобы первый push не прошёл мимо
+        """
+        super()._on_invocation_prepared(invocation_id, target, args, packet, stream)
+        if self._connection is None:
+            return
+        content_type = None if stream else get_subscription_content_type(target)
+        if stream or content_type is not None:
+            self._connection.register_standing(
+                invocation_id, _StandingInvocation(self, packet, content_type, get_params_tu_ids(args))
+            )
+
+    def deliver(self, message: Any) -> None:
+        """
+        Передаёт сообщение в recv_queue сессии (вызывается из потока пула)
+        """
+        try:
+            self._loop.call_soon_threadsafe(self._put_message, message)
+        except RuntimeError:
+            # event loop теста уже закрыт - сообщение никому не нужно
+            logger.debug("[WS POOL] Сообщение для закрытой сессии отброшено")
+
+    def _put_message(self, message: Any) -> None:
+        # Ping до сессий не доходят (см. _HubConnection._route)
+        self._mark_data_received()
+        self._update_snapshot(message)
+        self.recv_queue.put_nowait(message)
+        self._log_received(message)
+
+
+class _HubConnection:
+    """
+    Физическое соединение пула. Работает только на event loop пула.
+    Маршрутизирует входящие сообщения по сессиям и прозрачно переподключается при разрыве,
+    повторяя подписки и streaming-вызовы открытых сессий.
+    Отписки у хаба нет: соединение, на котором были подписки (has_subscriptions), после ухода
+    всех сессий закрывается, чтобы push прошлых тестов не попали в следующие.
+    """
+
+    def __init__(self, pool: "WebSocketPool", index: int) -> None:
+        self._pool = pool
+        self.name = f"ws-pool-{index}"
+        self.sessions: Set[WebSocketSession] = set()
+        self.sessions_served = 0
+        self._client: Optional[WebSocketClient] = None
+        # invocation_id регистрируются из потоков тестов, маршрутизация - в потоке пула
+        self._owners: Dict[str, WebSocketSession] = {}
+        self._owners_lock = threading.Lock()
+        self._invocation_ids = itertools.count(WS_Const.START_INVOCATION_ID)
+        # invocation_id -> подписка / streaming-вызов открытой сессии (под _owners_lock)
+        self._standing: Dict[str, _StandingInvocation] = {}
+        # Типы контента подписок закрытых сессий: их push без подписчика отбрасываются
+        self._orphaned_content_types: Set[str] = set()
+        self.has_subscriptions = False
+        self._connect_lock = asyncio.Lock()
+        self._dispatch_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def is_connected(self) -> bool:
+        return self._client is not None and self._client.is_connected
+
+    def register_invocation(self, session: WebSocketSession) -> str:
+        """
+        Уникальный в пределах соединения invocation_id, ответы на который получит только эта сессия
+        """
+        with self._owners_lock:
+            invocation_id = str(next(self._invocation_ids))
+            self._owners[invocation_id] = session
+        return invocation_id
+
+    def register_standing(self, invocation_id: str, standing: _StandingInvocation) -> None:
+        with self._owners_lock:
+            self._standing[invocation_id] = standing
+            if standing.content_type is not None:
+                self.has_subscriptions = True
+
+    async def ensure_connected(self) -> None:
+        async with self._connect_lock:
+            if self.is_connected:
+                return
+            reconnect = self._client is not None
+            if reconnect:
+                logger.warning(f"[WS POOL] Соединение {self.name} разорвано, переподключение")
+                await self._close_client()
+            client = WebSocketClient(
+                self._pool.host,
+                self._pool.access_token,
+                self._pool.x_user_id,
+                snapshot_store=self._pool.snapshot_store,
+                recorder=self._pool.recorder,
+            )
+            # Сообщения логируются в сессиях, которым они доставлены
+            client.suppress_recv_logging = True
+            try:
+                await client.connect()
+            except BaseException:
+                # В том числе отмена открытия взамен закрытого при WebSocketPool.close
+                await asyncio.shield(client.close())
+                raise
+            self._client = client
+            logger.info(f"[WS POOL] Соединение {self.name} установлено")
+            if self._dispatch_task is None or self._dispatch_task.done():
+                self._dispatch_task = asyncio.create_task(self._dispatch())
+            if reconnect:
+                await self._replay_standing()
+
+    async def send_packet(self, packet: bytes) -> None:
+        await self.ensure_connected()
+        await self._client.send_packet(packet)
+
+    def add_session(self, session: WebSocketSession) -> None:
+        self.sessions.add(session)
+        self.sessions_served += 1
+
+    async def remove_session(self, session: WebSocketSession, stream_invocation_ids: List[str]) -> None:
+        """
+        Закрывает сессию: отменяет её streaming-вызовы и забывает её invocation_id и подписки
+        """
+        self.sessions.discard(session)
+        for invocation_id in stream_invocation_ids:
+            await self._cancel_invocation(invocation_id)
+        with self._owners_lock:
+            self._owners = {
+                invocation_id: owner for invocation_id, owner in self._owners.items() if owner is not session
+            }
+            for invocation_id, standing in list(self._standing.items()):
+                if standing.session is session:
+                    del self._standing[invocation_id]
+                    if standing.content_type is not None:
+                        self._orphaned_content_types.add(standing.content_type)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._dispatch_task is not None:
+            self._dispatch_task.cancel()
+            try:
+                await self._dispatch_task
+            except asyncio.CancelledError:
+                pass
+        await self._close_client()
+        logger.info(f"[WS POOL] Соединение {self.name} закрыто (обслужено сессий: {self.sessions_served})")
+
+    async def _dispatch(self) -> None:
+        """
+        Разбирает очередь сообщений соединения по сессиям, при разрыве переподключается
+        """
+        while not self._closed:
+            client = self._client
+            if client is None:
+                # Идёт переподключение из send_packet
+                await asyncio.sleep(WSPool_Const.HEALTH_CHECK_INTERVAL_S)
+                continue
+            try:
+                message = await client.receive_raw(timeout=WSPool_Const.HEALTH_CHECK_INTERVAL_S)
+            except asyncio.TimeoutError:
+                if not client.is_connected and client.recv_queue.empty() and self.sessions:
+                    try:
+                        await self.ensure_connected()
+                    except Exception:
+                        logger.exception(f"[WS POOL] [ERROR] Не удалось переподключить {self.name}")
+                continue
+            self._route(message)
+
+    def _route(self, message: LazySignalRMessage) -> None:
+        """
+        Маршрутизация по заголовку сообщения; тело декодирует сессия, которая его извлечёт.
+        Сообщения без получателя отбрасываются недекодированными
+        """
+        if message.kind is None or message.is_ping:
+            return
+        invocation_id = message.invocation_id
+        if invocation_id is not None:
+            # Ответ на вызов закрытой сессии (например, хвост stream) остальным сессиям не передаётся
+            with self._owners_lock:
+                owner = self._owners.get(str(invocation_id))
+            if owner is not None and owner in self.sessions:
+                owner.deliver(message)
+            return
+        for session in self._get_subscribers(message):
+            session.deliver(message)
+
+    def _get_subscribers(self, message: LazySignalRMessage) -> Set["WebSocketSession"]:
+        """
+        Сессии, подписанные на тип контента push. Тело декодируется, только если подписки сессий
+        различаются по tuId. Push без подписки сессий (не Subscribe-вызовы) получают все сессии, как раньше
+        """
+        content_type = message.content_type
+        with self._owners_lock:
+            subscriptions = [
+                standing
+                for standing in self._standing.values()
+                if standing.content_type is not None
+                and standing.content_type == content_type
+                and standing.session in self.sessions
+            ]
+            orphaned = content_type in self._orphaned_content_types
+        if not subscriptions:
+            return set() if orphaned else set(self.sessions)
+        sessions = {standing.session for standing in subscriptions}
+        if len(sessions) > 1 and len({standing.tu_ids for standing in subscriptions}) > 1:
+            tu_id = get_reply_tu_id(message.decode())
+            matched = {
+                standing.session
+                for standing in subscriptions
+                if standing.tu_ids is None or tu_id in standing.tu_ids
+            }
+            if matched:
+                return matched
+        return sessions
+
+    async def _replay_standing(self) -> None:
+        """
+        Повторяет подписки и streaming-вызовы открытых сессий на новом соединении (с теми же invocation_id)
+        """
+        with self._owners_lock:
+            standing = [item for item in self._standing.values() if item.session in self.sessions]
+        for item in standing:
+            await self._client.send_packet(item.packet)
+        if standing:
+            logger.info(f"[WS POOL] На соединении {self.name} восстановлено подписок и stream: {len(standing)}")
+
+    async def _cancel_invocation(self, invocation_id: str) -> None:
+        if not self.is_connected:
+            return
+        cancel = [WS_Const.CANCEL_INVOCATION_MESSAGE_TYPE, WS_Const.DEFAULT_SIGNALR_MAP_HEADERS, invocation_id]
+        try:
+            await self._client.send_packet(encode_with_varint_prefix(msgpack.packb(cancel, use_bin_type=True)))
+        except Exception:
+            logger.debug(f"[WS POOL] Не удалось отменить stream {invocation_id}", exc_info=True)
+
+    async def _close_client(self) -> None:
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            await client.close()
+        except Exception:
+            logger.debug(f"[WS POOL] Ошибка закрытия соединения {self.name}", exc_info=True)
+
+
+class WebSocketPool:
+    """
+    Общие ws-соединения с api-gateway на время набора данных (вместо connect + handshake в каждом тесте).
+    Соединения живут на отдельном event loop в фоновом потоке, тесты получают логические сессии (WebSocketSession)
+    с собственной очередью сообщений. Новая сессия занимает свободное соединение; если свободных нет,
+    открывается новое (до max_connections), иначе сессия делит наименее загруженное соединение.
+    Соединение с подписками закрывается после ухода сессий (отписки у хаба нет), взамен в фоне
+    открывается новое, поэтому следующий тест не ждёт handshake и не получает push чужих подписок.
+    Пример использования:
+    pool = WebSocketPool(host, access_token, x_user_id)
+    async with pool.session() as ws_client:
+        await ws_client.invoke(...)
+    pool.close()  # teardown набора
+    """
+
+    def __init__(
+        self,
+        host: str,
+        access_token: str,
+        x_user_id: str,
+        max_connections: int = WSPool_Const.MAX_CONNECTIONS,
+        max_sessions_per_connection: int = WSPool_Const.MAX_SESSIONS_PER_CONNECTION,
+        snapshot_store: Optional[WsSnapshotStore] = None,
+        recorder: Optional[WsTrafficRecorder] = None,
+    ) -> None:
+        self.host = host
+        self.access_token = access_token
+        self.x_user_id = x_user_id
+        # Последние сообщения по типу контента со всех соединений пула
+        self.snapshot_store = snapshot_store if snapshot_store is not None else WsSnapshotStore()
+        # Запись входящих фреймов всех соединений пула
+        self.recorder = recorder
+        self._max_connections = max_connections
+        self._max_sessions_per_connection = max_sessions_per_connection
+        self._connections: List[_HubConnection] = []
+        self._connection_index = itertools.count(1)
+        # Фоновые закрытия и открытия соединений на event loop пула
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._prewarm_tasks: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def session(self) -> WebSocketSession:
+        return WebSocketSession(self)
+
+    async def run(self, coro) -> Any:
+        """
+        Выполняет корутину на event loop пула и ожидает результат на текущем event loop
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        return await asyncio.wrap_future(future)
+
+    async def acquire(self, session: WebSocketSession) -> _HubConnection:
+        """
+        Выбирает соединение для сессии (выполняется на event loop пула)
+        """
+        connection = self._choose_connection()
+        connection.add_session(session)
+        try:
+            await connection.ensure_connected()
+        except BaseException:
+            connection.sessions.discard(session)
+            if not connection.sessions and not connection.is_connected:
+                self._connections.remove(connection)
+            raise
+        return connection
+
+    async def release(
+        self, connection: _HubConnection, session: WebSocketSession, stream_invocation_ids: List[str]
+    ) -> None:
+        """
+        Закрывает сессию. Соединение без сессий закрывается, если на нём остались подписки хаба
+        или оно обслужило max_sessions_per_connection сессий; взамен в фоне открывается новое
+        """
+        await connection.remove_session(session, stream_invocation_ids)
+        if connection.sessions:
+            return
+        if not connection.has_subscriptions and connection.sessions_served < self._max_sessions_per_connection:
+            return
+        if connection in self._connections:
+            self._connections.remove(connection)
+        self._spawn(connection.close())
+        self._prewarm_tasks.add(self._spawn(self._prewarm()))
+
+    def close(self) -> None:
+        """
+        Закрывает все соединения и останавливает поток пула
+        """
+        if self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._close_connections(), self._loop)
+        try:
+            future.result(timeout=WSPool_Const.CLOSE_TIMEOUT_S)
+        except Exception:
+            logger.exception("[WS POOL] [ERROR] Ошибка закрытия соединений пула")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=WSPool_Const.CLOSE_TIMEOUT_S)
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+    def _choose_connection(self) -> _HubConnection:
+        idle_connections = [
+            connection
+            for connection in self._connections
+            if not connection.sessions and not connection.has_subscriptions
+        ]
+        if idle_connections:
+            return max(idle_connections, key=lambda connection: connection.is_connected)
+        if len(self._connections) < self._max_connections:
+            connection = _HubConnection(self, next(self._connection_index))
+            self._connections.append(connection)
+            return connection
+        return min(self._connections, key=lambda connection: len(connection.sessions))
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        task.add_done_callback(self._prewarm_tasks.discard)
+        return task
+
+    async def _prewarm(self) -> None:
+        """
+        Открывает соединение взамен закрытого, если свободного соединения нет
+        """
+        if len(self._connections) >= self._max_connections or any(
+            not connection.sessions and not connection.has_subscriptions for connection in self._connections
+        ):
+            return
+        connection = _HubConnection(self, next(self._connection_index))
+        self._connections.append(connection)
+        try:
+            await connection.ensure_connected()
+        except Exception:
+            logger.warning(f"[WS POOL] Не удалось заранее открыть {connection.name}", exc_info=True)
+            if not connection.sessions and connection in self._connections:
+                self._connections.remove(connection)
+                await connection.close()
+
+    async def _close_connections(self) -> None:
+        # Открытие соединения взамен закрытого не ждём: оно может ретраить подключение до таймаута
+        for task in self._prewarm_tasks:
+            task.cancel()
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            await connection.close()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name="ws-pool", daemon=True)
+                self._thread.start()
+        return self._loop
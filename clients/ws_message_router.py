@@ -0,0 +1,376 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Hashable, List, Optional, Tuple
+
+from constants.architecture_constants import WebSocketClientConstants as WS_Const
+from constants.architecture_constants import WsChannelPolicyConstants as Policy_Const
+from utils.msgpack_utils.msgpack_utils import LazySignalRMessage, decode_message
+
+logger = logging.getLogger(__name__)
+
+RouteKey = Tuple[str, Hashable]
+
+ANY_KEY: RouteKey = ("any", None)
+
+
+def type_key(message_type: str) -> RouteKey:
+    return "type", message_type
+
+
+def invocation_key(invocation_id: Any) -> RouteKey:
+    return "invocation", str(invocation_id)
+
+
+@dataclass(frozen=True)
+class ChannelPolicy:
+    """Политика канала типа контента: KEEP_LATEST, RING (последние capacity) или BLOCK"""
+
+    mode: str
+    capacity: int = 1
+
+    def __post_init__(self) -> None:
+        if self.mode not in (Policy_Const.KEEP_LATEST, Policy_Const.RING, Policy_Const.BLOCK):
+            raise ValueError(f"Неизвестная политика канала: {self.mode}")
+        if self.mode == Policy_Const.KEEP_LATEST:
+            object.__setattr__(self, "capacity", 1)
+        if self.capacity < 1:
+            raise ValueError(f"Ёмкость канала должна быть больше 0: {self.capacity}")
+
+
+def default_channel_policies() -> Dict[str, ChannelPolicy]:
+    return {
+        message_type: ChannelPolicy(mode, capacity)
+        for message_type, (mode, capacity) in Policy_Const.DEFAULT_POLICIES.items()
+    }
+
+
+@dataclass(frozen=True)
+class ChannelStats:
+    """Метрики канала: неизвлечённых сообщений сейчас и вытеснено политикой/переполнением"""
+
+    depth: int
+    dropped: int
+    policy: Optional[ChannelPolicy] = None
+
+
+class _Entry:
+    """Сообщение в буфере роутера. Лежит сразу в нескольких каналах, извлекается один раз"""
+
+    __slots__ = ("message", "keys", "consumed")
+
+    def __init__(self, message: Any, keys: List[RouteKey]) -> None:
+        self.message = message
+        self.keys = keys
+        self.consumed = False
+
+
+class WsMessageRouter:
+    """
+    Демультиплексор входящих ws-сообщений.
+    Каждое сообщение попадает в общий канал (порядок поступления) и в каналы по типу контента
+    (msg[EVENT_TYPE_INDEX]) и по invocation_id (msg[INVOCATION_ID_INDEX]).
+    Извлечение из любого канала помечает сообщение извлечённым для остальных: сообщение достаётся
+    ровно одному получателю, несовпавшие с фильтром сообщения не теряются и не перебираются повторно.
+    Если получатель уже ждёт (future), сообщение передаётся ему сразу, минуя буфер.
+    LazySignalRMessage раскладывается по заголовку и декодируется только при извлечении (decode=True):
+    вытесненные и очищенные сообщения не декодируются.
+    Каналы типов контента ограничены политиками (ChannelPolicy), общий канал - max_buffered сообщениями.
+    BLOCK действует только для put (цикл приёма соединения ждёт места), publish вытесняет как RING.
+    Пример использования:
+    router = WsMessageRouter()
+    router.publish(message)                                          # цикл приёма
+    msg = await router.wait(type_key("CommonSchemeContent"), 10.0)   # ожидание по типу
+    msg = router.take(ANY_KEY)                                       # неблокирующее извлечение
+    router.get_stats()                                               # глубина и вытесненные по каналам
+    """
+
+    def __init__(
+        self,
+        max_buffered: int = WS_Const.MAX_BUFFERED_MESSAGES,
+        policies: Optional[Dict[str, ChannelPolicy]] = None,
+    ) -> None:
+        self._max_buffered = max_buffered
+        self._policies: Dict[str, ChannelPolicy] = default_channel_policies() if policies is None else dict(policies)
+        self._channels: Dict[RouteKey, Deque[_Entry]] = {ANY_KEY: deque()}
+        self._depth: Dict[RouteKey, int] = {}
+        self._dropped: Dict[RouteKey, int] = {}
+        self._waiters: Dict[RouteKey, Deque[asyncio.Future]] = {}
+        self._space_waiters: Dict[RouteKey, List[asyncio.Future]] = {}
+        self._blocking_enabled = True
+        self._pending = 0
+        self._dropped_total = 0
+
+    @property
+    def pending(self) -> int:
+        """Сообщений в буфере, ещё не извлечённых ни из одного канала"""
+        return self._pending
+
+    @property
+    def dropped(self) -> int:
+        """Всего сообщений вытеснено политиками каналов и переполнением общего канала"""
+        return self._dropped_total
+
+    def set_policy(self, message_type: str, policy: Optional[ChannelPolicy]) -> None:
+        """
+        Политика канала типа контента, None - канал ограничен только общим max_buffered
+        """
+        if policy is None:
+            self._policies.pop(message_type, None)
+        else:
+            self._policies[message_type] = policy
+        self._release_space(type_key(message_type))
+
+    def get_stats(self) -> Dict[str, ChannelStats]:
+        """
+        Метрики каналов типов контента и общего канала (ключ "any")
+        """
+        stats = {"any": ChannelStats(depth=self._pending, dropped=self._dropped_total)}
+        for key in {*self._depth, *self._dropped}:
+            kind, name = key
+            if kind != "type":
+                continue
+            stats[name] = ChannelStats(
+                depth=self._depth.get(key, 0),
+                dropped=self._dropped.get(key, 0),
+                policy=self._policies.get(name),
+            )
+        return stats
+
+    def publish(self, message: Any) -> None:
+        keys = self._get_keys(message)
+        for key in (*keys, ANY_KEY):
+            if self._resolve_waiter(key, message):
+                return
+        self._append(message, keys)
+
+    async def put(self, message: Any) -> None:
+        """
+        publish с ожиданием места в канале с политикой BLOCK
+        """
+        keys = self._get_keys(message)
+        for key in (*keys, ANY_KEY):
+            if self._resolve_waiter(key, message):
+                return
+        for key in keys:
+            policy = self._get_policy(key)
+            if policy is None or policy.mode != Policy_Const.BLOCK:
+                continue
+            while self._blocking_enabled and self._depth.get(key, 0) >= policy.capacity:
+                future = asyncio.get_running_loop().create_future()
+                self._space_waiters.setdefault(key, []).append(future)
+                await future
+                policy = self._get_policy(key)
+                if policy is None or policy.mode != Policy_Const.BLOCK:
+                    break
+            # Пока ждали место, сообщение мог начать ждать получатель
+            if self._resolve_waiter(key, message):
+                return
+        self._append(message, keys)
+
+    def stop_blocking(self) -> None:
+        """
+        Снимает ожидание BLOCK (закрытие соединения): дальнейшие put вытесняют как RING
+        """
+        self._blocking_enabled = False
+        for key in list(self._space_waiters):
+            self._release_space(key)
+
+    def take(self, key: RouteKey, decode: bool = True) -> Optional[Any]:
+        """
+        Извлекает самое раннее неизвлечённое сообщение канала, None - канал пуст
+        :param decode: False - вернуть LazySignalRMessage без декодирования тела
+        """
+        channel = self._channels.get(key)
+        while channel:
+            entry = channel.popleft()
+            if not entry.consumed:
+                self._consume(entry)
+                return decode_message(entry.message) if decode else entry.message
+        if channel is not None and key is not ANY_KEY:
+            self._channels.pop(key, None)
+        return None
+
+    def discard(self, key: RouteKey, message: Any) -> None:
+        """
+        Помечает извлечённым это сообщение (по идентичности), если оно ещё лежит в канале key
+        """
+        for entry in self._channels.get(key, ()):
+            if entry.message is message and not entry.consumed:
+                self._consume(entry)
+                return
+
+    async def wait(self, key: RouteKey, timeout: Optional[float], decode: bool = True) -> Any:
+        """
+        Ожидает сообщение канала
+        :param decode: False - вернуть LazySignalRMessage без декодирования тела
+        :raises asyncio.TimeoutError: сообщение не пришло за timeout
+        """
+        message = self.take(key, decode=decode)
+        if message is not None:
+            return message
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(key, deque())
+        waiters.append(future)
+        try:
+            message = await asyncio.wait_for(future, timeout=timeout)
+            return decode_message(message) if decode else message
+        finally:
+            try:
+                waiters.remove(future)
+            except ValueError:
+                pass
+            if not waiters:
+                self._waiters.pop(key, None)
+
+    def clear(self) -> None:
+        for channel in self._channels.values():
+            for entry in channel:
+                entry.consumed = True
+        self._channels = {ANY_KEY: deque()}
+        self._depth = {}
+        self._pending = 0
+        for key in list(self._space_waiters):
+            self._release_space(key)
+
+    def _append(self, message: Any, keys: List[RouteKey]) -> None:
+        for key in keys:
+            policy = self._get_policy(key)
+            if policy is not None:
+                while self._depth.get(key, 0) >= policy.capacity:
+                    self._drop_oldest(key)
+
+        any_channel = self._channels[ANY_KEY]
+        while self._pending >= self._max_buffered:
+            self._drop_oldest(ANY_KEY)
+        entry = _Entry(message, keys)
+        any_channel.append(entry)
+        for key in keys:
+            self._channels.setdefault(key, deque()).append(entry)
+            self._depth[key] = self._depth.get(key, 0) + 1
+        self._pending += 1
+        self._compact(ANY_KEY)
+
+    def _consume(self, entry: _Entry) -> None:
+        entry.consumed = True
+        self._pending -= 1
+        for key in entry.keys:
+            depth = self._depth.get(key, 0) - 1
+            if depth > 0:
+                self._depth[key] = depth
+            else:
+                self._depth.pop(key, None)
+            if key in self._space_waiters:
+                self._release_space(key)
+            self._compact(key)
+
+    def _compact(self, key: RouteKey) -> None:
+        """
+        Убирает из канала сообщения, извлечённые через другие каналы, чтобы они не держали память
+        """
+        channel = self._channels.get(key)
+        if channel is None:
+            return
+        while channel and channel[0].consumed:
+            channel.popleft()
+        if not channel and key is not ANY_KEY:
+            self._channels.pop(key, None)
+        elif len(channel) > 2 * self._depth_of(key) + WS_Const.ROUTER_COMPACT_SLACK:
+            self._channels[key] = deque(entry for entry in channel if not entry.consumed)
+
+    def _depth_of(self, key: RouteKey) -> int:
+        return self._pending if key is ANY_KEY else self._depth.get(key, 0)
+
+    def _get_policy(self, key: RouteKey) -> Optional[ChannelPolicy]:
+        kind, name = key
+        return self._policies.get(name) if kind == "type" else None
+
+    def _release_space(self, key: RouteKey) -> None:
+        for future in self._space_waiters.pop(key, ()):
+            if not future.done():
+                future.set_result(None)
+
+    def _resolve_waiter(self, key: RouteKey, message: Any) -> bool:
+        waiters = self._waiters.get(key)
+        while waiters:
+            future = waiters.popleft()
+            if not future.done():
+                future.set_result(message)
+                return True
+        return False
+
+    def _drop_oldest(self, key: RouteKey) -> None:
+        """
+        Канал заполнен: самое старое неизвлечённое сообщение канала вытесняется из всех каналов
+        """
+        channel = self._channels.get(key)
+        while channel:
+            entry = channel.popleft()
+            if not entry.consumed:
+                break
+        else:
+            return
+        self._consume(entry)
+        self._dropped_total += 1
+        self._dropped[key] = self._dropped.get(key, 0) + 1
+        dropped = self._dropped[key]
+        if key is ANY_KEY and (dropped == 1 or dropped % self._max_buffered == 0):
+            logger.warning(
+                f"[WS ROUTER] Буфер сообщений переполнен ({self._max_buffered}), "
+                f"отброшено старых сообщений: {dropped}"
+            )
+        elif key is not ANY_KEY and dropped == 1:
+            logger.info(f"[WS ROUTER] Канал {key[1]}: старые сообщения вытесняются ({self._get_policy(key)})")
+
+    @staticmethod
+    def _get_keys(message: Any) -> List[RouteKey]:
+        if isinstance(message, LazySignalRMessage):
+            keys = []
+            if message.content_type is not None:
+                keys.append(type_key(message.content_type))
+            if message.invocation_id is not None:
+                keys.append(invocation_key(message.invocation_id))
+            return keys
+        if not isinstance(message, list):
+            return []
+        keys = []
+        if len(message) > WS_Const.EVENT_TYPE_INDEX and isinstance(message[WS_Const.EVENT_TYPE_INDEX], str):
+            keys.append(type_key(message[WS_Const.EVENT_TYPE_INDEX]))
+        if len(message) > WS_Const.INVOCATION_ID_INDEX and message[WS_Const.INVOCATION_ID_INDEX] is not None:
+            keys.append(invocation_key(message[WS_Const.INVOCATION_ID_INDEX]))
+        return keys
+
+
+class RoutedMessageQueue:
+    """
+    recv_queue поверх WsMessageRouter: тот же интерфейс, что у asyncio.Queue (empty, get_nowait, get, put ...).
+    Сообщения, извлечённые через receive_by_type / receive_by_invocation_id, из очереди исчезают
+    """
+
+    def __init__(self, router: WsMessageRouter) -> None:
+        self._router = router
+
+    def empty(self) -> bool:
+        return self._router.pending == 0
+
+    def qsize(self) -> int:
+        return self._router.pending
+
+    def get_nowait(self) -> Any:
+        message = self._router.take(ANY_KEY)
+        if message is None and self._router.pending == 0:
+            raise asyncio.QueueEmpty
+        return message
+
+    async def get(self) -> Any:
+        return await self._router.wait(ANY_KEY, timeout=None)
+
+    def put_nowait(self, message: Any) -> None:
+        self._router.publish(message)
+
+    async def put(self, message: Any) -> None:
+        await self._router.put(message)
+
+    def task_done(self) -> None:
+        """Совместимость с asyncio.Queue"""
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+import time
+from typing import Iterable, Optional
+
+from clients.websocket_client import WebSocketClient
+from clients.ws_traffic_recorder import WsRecordingReader
+from constants.architecture_constants import WsRecordingConstants as Rec_Const
+
+logger = logging.getLogger(__name__)
+
+
+class WsReplayClient(WebSocketClient):
+    """
+    Ws-клиент без стенда: воспроизводит запись WsTrafficRecorder через ту же очередь и роутер,
+    что и WebSocketClient. Сценарии, парсеры и хелперы работают с ним как с обычным ws_client,
+    поэтому их можно профилировать и сравнивать по времени на записанном трафике.
+    Вызовы (invoke, invoke_stream) не отправляются: ответы на них берутся из записи по invocation_id,
+    который выдаётся в том же порядке, что и при записи. invocation_id нумеруются в каждом соединении заново,
+    поэтому для ответов на вызовы воспроизводится одно соединение записи (connection_id).
+    Пример использования:
+    async with WsReplayClient("select_3.wsrec", speed=0, connection_id=3) as ws_client:
+        payload = await t_utils.connect_and_subscribe_msg(ws_client, "CommonSchemeContent", ...)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        speed: float = Rec_Const.REPLAY_SPEED,
+        content_types: Optional[Iterable[str]] = None,
+        connection_id: Optional[int] = None,
+    ) -> None:
+        """
+        :param speed: ускорение относительно записи: 1 - реальное время, 10 - в 10 раз быстрее, 0 - без пауз
+        :param content_types: воспроизводить только фреймы с этими типами контента (None - все)
+        :param connection_id: воспроизводить только фреймы этого соединения (None - всех соединений набора)
+        """
+        super().__init__(host="replay", access_token="", x_user_id="")
+        self._reader = WsRecordingReader(path)
+        self._speed = speed
+        self._content_types = content_types
+        self._connection_id = connection_id
+        self.frames_replayed = 0
+
+    async def connect(self) -> None:
+        self._decoder.reset()
+        self._recv_task = asyncio.create_task(self._replay())
+        logger.info(f"[WS REPLAY] Воспроизведение {self._reader.path} (скорость {self._speed or 'без пауз'})")
+
+    async def close(self) -> None:
+        self._stop_event.set()
+        self._router.stop_blocking()
+        if self._recv_task:
+            self._recv_task.cancel()
+            try:
+                await self._recv_task
+            except asyncio.CancelledError:
+                pass
+        self._log_dropped()
+
+    async def send_packet(self, packet: bytes) -> None:
+        logger.debug(f"[WS REPLAY] Пакет не отправляется ({len(packet)} байт)")
+
+    async def _replay(self) -> None:
+        started_at = time.monotonic()
+        for recorded in self._reader.frames(self._content_types, self._connection_id):
+            if self._stop_event.is_set():
+                return
+            if self._speed:
+                delay = started_at + recorded.offset_s / self._speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await self._handle_frame(recorded.frame)
+            self.frames_replayed += 1
+        logger.info(f"[WS REPLAY] Воспроизведено фреймов: {self.frames_replayed}")
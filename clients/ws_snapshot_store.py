@@ -0,0 +1,115 @@
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Hashable, Optional, Tuple
+
+from constants.architecture_constants import WebSocketClientConstants as WS_Const
+from utils.msgpack_utils.msgpack_utils import decode_message
+
+
+@dataclass(frozen=True)
+class WsSnapshot:
+    """Полученное сообщение подписки и время его получения (time.monotonic())"""
+
+    raw: Any  # как пришло в роутер: LazySignalRMessage или декодированный список
+    received_at: float
+
+    @property
+    def message(self) -> Any:
+        return decode_message(self.raw)
+
+    @property
+    def age_s(self) -> float:
+        return time.monotonic() - self.received_at
+
+
+class WsSnapshotStore:
+    """
+    Последние полученные сообщения по (тип контента, параметры подписки) - для подписок, которые пушат
+    состояние целиком (CommonSchemeContent, MainPageInfoContent ...). Тест может взять свежее сообщение
+    сразу, не дожидаясь следующего push. Сообщение сохраняет клиент, подписанный с этими параметрами,
+    поэтому push подписки с другими параметрами (например, additionalProperties) не подменит ответ.
+    Хранилище общее для соединений набора и потокобезопасно, сообщения хранятся недекодированными.
+    Пример использования:
+    store = WsSnapshotStore()
+    store.update(message, get_subscription_key("CommonSchemeContent", params))  # цикл приёма
+    snapshot = store.get_latest(get_subscription_key("CommonSchemeContent", params), max_age_s=5.0)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshots: Dict[Tuple[str, str], WsSnapshot] = {}
+
+    def update(self, message: Any, subscription_key: Tuple[str, str]) -> None:
+        snapshot = WsSnapshot(raw=message, received_at=time.monotonic())
+        with self._lock:
+            self._snapshots[subscription_key] = snapshot
+
+    def get_latest(self, subscription_key: Tuple[str, str], max_age_s: Optional[float] = None) -> Optional[WsSnapshot]:
+        """
+        Последнее сообщение подписки не старше max_age_s
+        :return: None - подходящего сообщения нет
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(subscription_key)
+        if snapshot is None or (max_age_s is not None and snapshot.age_s > max_age_s):
+            return None
+        return snapshot
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
+
+
+def get_subscription_content_type(target: str) -> Optional[str]:
+    """
+    Тип контента push-сообщений подписки: SubscribeCommonSchemeRequest -> CommonSchemeContent.
+    None - вызов не создаёт подписку
+    """
+    if target in WS_Const.SUBSCRIPTION_CONTENT_TYPES:
+        return WS_Const.SUBSCRIPTION_CONTENT_TYPES[target]
+    prefix = WS_Const.SUBSCRIBE_TARGET_PREFIX
+    if not target.lower().startswith(prefix):
+        return None
+    name = target[len(prefix) :]
+    if name.endswith(WS_Const.SUBSCRIBE_TARGET_SUFFIX):
+        name = name[: -len(WS_Const.SUBSCRIBE_TARGET_SUFFIX)]
+    if not name:
+        return None
+    return f"{name[0].upper()}{name[1:]}{WS_Const.SUBSCRIPTION_CONTENT_SUFFIX}"
+
+
+def get_subscription_key(content_type: str, params: Any) -> Tuple[str, str]:
+    """
+    Ключ подписки в WsSnapshotStore: тип контента и параметры подписки без учёта порядка ключей
+    """
+    return content_type, json.dumps(params, sort_keys=True, default=str)
+
+
+def get_params_tu_ids(params: Any) -> Optional[FrozenSet[Hashable]]:
+    """
+    tuId из параметров подписки ({"tuId": 1} или {"tuIds": [1, 2]}), None - подписка не по конкретным ТУ
+    """
+    if not isinstance(params, dict):
+        return None
+    if params.get("tuId") is not None:
+        return frozenset((params["tuId"],))
+    tu_ids = params.get("tuIds")
+    if isinstance(tu_ids, (list, tuple)) and tu_ids:
+        return frozenset(tu_ids)
+    return None
+
+
+def get_reply_tu_id(message: Any) -> Optional[Hashable]:
+    """
+    tuId из replyContent аргументов декодированного сообщения SignalR
+    """
+    if not isinstance(message, list) or len(message) <= WS_Const.EVENT_TYPE_INDEX + 1:
+        return None
+    args = message[WS_Const.EVENT_TYPE_INDEX + 1]
+    for elem in args if isinstance(args, (list, tuple)) else ():
+        reply_content = elem.get("replyContent") if isinstance(elem, dict) else None
+        if isinstance(reply_content, dict):
+            return reply_content.get("tuId")
+    return None
@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from constants.architecture_constants import WsRecordingConstants as Rec_Const
+from utils.msgpack_utils.msgpack_utils import SignalRFrameDecoder, encode_with_varint_prefix, read_varint
+
+logger = logging.getLogger(__name__)
+
+# Заголовок записи: время от начала записи (с), флаг сжатия, номер соединения
+_RECORD_HEADER = struct.Struct("<dBI")
+# Записи первой версии формата - без номера соединения
+_RECORD_HEADER_V1 = struct.Struct("<dB")
+_RAW = 0
+_ZLIB = 1
+
+
+@dataclass(frozen=True)
+class RecordedFrame:
+    """Ws-фрейм из записи, время его получения от начала записи и номер соединения, которое его получило"""
+
+    offset_s: float
+    frame: bytes
+    connection_id: int = 0
+
+
+class WsTrafficRecorder:
+    """
+    Запись входящих ws-фреймов в файл для воспроизведения без стенда (WsReplayClient).
+    Формат: заголовок файла, затем записи varint(длина) + (время, флаг сжатия, номер соединения, фрейм).
+    Фреймы больше COMPRESS_MIN_BYTES сжимаются zlib по отдельности, поэтому запись читается с любой записи.
+    Индекс "тип контента -> смещения записей" сохраняется рядом (<файл>.idx.json) при close().
+    Потокобезопасен: один recorder можно передать всем соединениям набора, каждое соединение получает свой
+    номер (new_connection_id), поэтому фреймы соединений пула, записанные вперемешку, можно разделить.
+    Пример использования:
+    recorder = WsTrafficRecorder("select_3.wsrec")
+    ws_client = WebSocketClient(host, token, x_user_id, recorder=recorder)  # номер соединения - в клиенте
+    ...
+    recorder.close()
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "wb")
+        self._file.write(Rec_Const.FILE_MAGIC)
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self._index: Dict[str, List[int]] = {}
+        self._frames = 0
+        self._connections = 0
+
+    def new_connection_id(self) -> int:
+        with self._lock:
+            self._connections += 1
+            return self._connections
+
+    def record(self, frame: bytes, connection_id: int = 0) -> None:
+        if isinstance(frame, str):
+            frame = frame.encode()
+        offset_s = time.monotonic() - self._started_at
+        content_types = {
+            message.content_type
+            for message in SignalRFrameDecoder().feed_lazy(frame)
+            if message.content_type is not None
+        }
+        if len(frame) >= Rec_Const.COMPRESS_MIN_BYTES:
+            body = _RECORD_HEADER.pack(offset_s, _ZLIB, connection_id) + zlib.compress(frame, Rec_Const.COMPRESS_LEVEL)
+        else:
+            body = _RECORD_HEADER.pack(offset_s, _RAW, connection_id) + bytes(frame)
+        record = encode_with_varint_prefix(body)
+        with self._lock:
+            if self._file.closed:
+                return
+            position = self._file.tell()
+            self._file.write(record)
+            self._frames += 1
+            for content_type in content_types:
+                self._index.setdefault(content_type, []).append(position)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.close()
+            with open(self.path + Rec_Const.INDEX_SUFFIX, "w", encoding="utf-8") as index_file:
+                json.dump(self._index, index_file, ensure_ascii=False)
+        logger.info(f"[WS RECORD] Записано фреймов: {self._frames} ({self._connections} соединений) -> {self.path}")
+
+
+class WsRecordingReader:
+    """
+    Чтение записи WsTrafficRecorder. С индексом фреймы нужных типов контента читаются без полного прохода.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._index: Optional[Dict[str, List[int]]] = None
+        index_path = path + Rec_Const.INDEX_SUFFIX
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as index_file:
+                self._index = json.load(index_file)
+
+    @property
+    def content_types(self) -> List[str]:
+        return sorted(self._index) if self._index else []
+
+    def frames(
+        self, content_types: Optional[Iterable[str]] = None, connection_id: Optional[int] = None
+    ) -> Iterator[RecordedFrame]:
+        """
+        Фреймы записи по порядку
+        :param content_types: только фреймы с сообщениями этих типов контента (None - все фреймы)
+        :param connection_id: только фреймы этого соединения (None - всех соединений)
+        """
+        for frame in self._frames(content_types):
+            if connection_id is None or frame.connection_id == connection_id:
+                yield frame
+
+    def connection_ids(self) -> List[int]:
+        """
+        Номера соединений в записи (полный проход по записи)
+        """
+        return sorted({frame.connection_id for frame in self._frames(None)})
+
+    def _frames(self, content_types: Optional[Iterable[str]]) -> Iterator[RecordedFrame]:
+        with open(self.path, "rb") as file:
+            data = file.read()
+        if data.startswith(Rec_Const.FILE_MAGIC):
+            header = _RECORD_HEADER
+        elif data.startswith(Rec_Const.FILE_MAGIC_V1):
+            header = _RECORD_HEADER_V1
+        else:
+            raise ValueError(f"Файл {self.path} не является записью ws-трафика")
+        if content_types is None:
+            offset = len(Rec_Const.FILE_MAGIC)
+            while offset < len(data):
+                try:
+                    frame, offset = self._read_record(data, offset, header)
+                except ValueError:
+                    logger.warning(f"[WS RECORD] Запись {self.path} обрезана, прочитаны фреймы до смещения {offset}")
+                    return
+                yield frame
+            return
+        wanted = set(content_types)
+        if self._index is not None:
+            positions = sorted({position for name in wanted for position in self._index.get(name, ())})
+            for position in positions:
+                yield self._read_record(data, position, header)[0]
+            return
+        # Индекса нет (запись прервана) - фильтр по заголовкам сообщений
+        for frame in self._frames(None):
+            if any(message.content_type in wanted for message in SignalRFrameDecoder().feed_lazy(frame.frame)):
+                yield frame
+
+    @staticmethod
+    def _read_record(data: bytes, offset: int, header: struct.Struct) -> Tuple[RecordedFrame, int]:
+        length, header_len = read_varint(data, offset)
+        start = offset + header_len
+        end = start + length
+        if end > len(data):
+            raise ValueError("Запись ws-трафика обрезана")
+        offset_s, flag, *connection_id = header.unpack_from(data, start)
+        payload = data[start + header.size : end]  # fmt: skip
+        frame = zlib.decompress(payload) if flag == _ZLIB else payload
+        return RecordedFrame(offset_s, frame, connection_id[0] if connection_id else 0), end
@@ -10,19 +10,51 @@ import pytest
 import pytest_asyncio
 
 from clients.testops_client import AllureResultsUploader, logger
+from clients.websocket_client import WebSocketClient
 from constants.architecture_constants import ImitatorConstants as ImConst
+from constants.architecture_constants import OffsetDriftConstants as DriftConst
+from constants.architecture_constants import TimelinePlanConstants as PlanConst
 from constants.enums import RejectionSensorTag
 from constants.test_constants import BaseTN3Constants
 from infra.stand_setup_manager import StandSetupManager
+from infra.suite_pack_setup_manager import SuitePackSetupManager
+from infra.suite_watchdog import SuiteWatchdog
 from test_config.datasets import get_config_by_name
 from test_scenarios import lds_configurator_scenarios
 from utils.helpers import lds_configurator_utils as lds_cfg_utils
 from utils.helpers.pytest_auth import (
     clear_suite_auth,
+    close_suite_ws_pool,
+    close_suite_ws_recorder,
     ensure_auth_for_fixture,
     ensure_suite_auth,
     init_http_stand_client,
     init_ws_stand_client,
+    open_ws_stand_client,
+)
+from utils.helpers.pytest_checkpoint import SessionCheckpointStore
+from utils.helpers.pytest_deferred_attach import (
+    DEFERRED_ATTACHMENTS_KEY,
+    DeferredAttachments,
+    activate_deferred_attachments,
+    discard_item_attachments,
+    flush_item_attachments,
+)
+from utils.helpers.pytest_offset_drift import OffsetDriftRecorder
+from utils.helpers.pytest_offset_window import OffsetWindowExecutor
+from utils.helpers.pytest_stand_pool import (
+    acquire_session_stand,
+    add_suite_xdist_group,
+    get_worker_id,
+    is_stand_pool_enabled,
+    is_xdist_worker,
+    release_session_stand,
+)
+from utils.helpers.pytest_timeline import TimelinePlanner
+from utils.helpers.suite_packing import (
+    SuitePackCandidate,
+    SuitePackingPlanner,
+    get_suite_imitator_start_time,
 )
 from utils.helpers.ws_message_parser import ws_message_parser as lds_ws_parser
 
@@ -37,6 +69,69 @@ def pytest_addoption(parser):
         default=None,
         help="Запустить только указанные наборы данных. Пример: --suites=select_4,select_19_20",
     )
+    parser.addoption(
+        "--stand-pool",
+        action="store",
+        default=None,
+        help=(
+            "Пул стендов для параллельного прогона наборов (pytest-xdist, --dist loadgroup). "
+            "Пример: -n 2 --dist loadgroup --stand-pool=dev1,dev2. По умолчанию берётся из STAND_POOL"
+        ),
+    )
+    parser.addoption(
+        "--concurrent-offsets",
+        action="store_true",
+        default=False,
+        help="Выполнять параллельно тесты одного набора данных с одинаковым offset",
+    )
+    parser.addoption(
+        "--pack-suites",
+        action="store_true",
+        default=False,
+        help="Прогонять совместимые наборы данных (разные ТУ, близкая длительность) в одной сессии стенда",
+    )
+    parser.addoption(
+        "--plan",
+        action="store_true",
+        default=False,
+        help="Только построить план прогона (временную шкалу тестов) без обращения к стенду",
+    )
+    parser.addoption(
+        "--plan-file",
+        action="store",
+        default=PlanConst.DEFAULT_PLAN_FILE_NAME,
+        help="Файл для плана прогона в формате JSON (для --plan)",
+    )
+    parser.addoption(
+        "--ws-pool",
+        action="store_true",
+        default=False,
+        help="Общие WS-соединения набора (WebSocketPool) вместо отдельного WS-соединения на каждый тест",
+    )
+    parser.addoption(
+        "--ws-record",
+        action="store",
+        default=None,
+        help=(
+            "Записывать входящий WS-трафик каждого набора в <каталог>/<набор>.wsrec "
+            "для воспроизведения без стенда (WsReplayClient)"
+        ),
+    )
+    parser.addoption(
+        "--allure-verbose-attachments",
+        action="store_true",
+        default=False,
+        help="Прикреплять к Allure все ws/http сообщения сразу, а не только сообщения упавших тестов",
+    )
+    parser.addoption(
+        "--resume",
+        action="store_true",
+        default=False,
+        help=(
+            "Продолжить упавший прогон по checkpoint стенда: пропустить завершённые тесты "
+            "и подключиться к ещё работающему имитатору"
+        ),
+    )
 
 
 def _find_config_by_suite_name(suite_name: str):
@@ -88,11 +183,17 @@ def pytest_configure(config):
     Храним состояние сессии
     """
     config.addinivalue_line("markers", "critical_stop: если тест упал, останавливаем дальнейшее выполнение сессии")
+    config.addinivalue_line("markers", "xdist_group(name): набор данных выполняется целиком на одном воркере")
+    config.addinivalue_line("markers", "suite_pack(name): пакет наборов данных, прогоняемых в одной сессии стенда")
     config.group_state = {
+        "stand_name": None,  # стенд текущего процесса (арендованный из пула или STAND_NAME)
+        "stand_lease_manager": None,
         "current_suite": None,
         "suite_start_time": None,
         "stand_manager": None,
         "imitator_start_time": None,  # datetime объект времени старта имитатора для расчёта интервалов утечек
+        "imitator_start_times": {},  # время старта имитатора по наборам пакета (--pack-suites)
+        "suite_packs": {},  # имя пакета -> SuitePack
         "use_lds_configurator": True,
         "resolved_tu_id": None,
         "admin_tu_name": None,
@@ -103,7 +204,32 @@ def pytest_configure(config):
         "auth_token": None,
         "x_user_id": None,
         "auth_suite": None,
+        "offset_window_executor": None,
+        "offset_drift_recorder": OffsetDriftRecorder(),  # опоздание старта тестов относительно offset
+        "checkpoint_store": None,  # checkpoint сессии стенда для --resume
+        "suite_watchdog": None,  # фоновый контроль имитатора, core и WS текущего набора
+        "use_ws_pool": config.getoption("--ws-pool"),
+        "ws_pool": None,  # общие WS-соединения набора (WebSocketPool)
+        "ws_record_dir": config.getoption("--ws-record"),
+        "ws_recorder": None,  # запись входящего WS-трафика набора (--ws-record)
+        "allure_verbose_attachments": config.getoption("--allure-verbose-attachments"),
     }
+    if config.getoption("--resume") and is_stand_pool_enabled(config):
+        # Воркеры арендуют разные стенды и по их checkpoint собрали бы разные наборы тестов - xdist прервёт прогон
+        raise pytest.UsageError("--resume нельзя использовать вместе с пулом стендов (--stand-pool / STAND_POOL)")
+    if not config.getoption("--plan"):
+        acquire_session_stand(config)
+        checkpoint_store = SessionCheckpointStore(config.group_state["stand_name"])
+        if config.getoption("--resume"):
+            checkpoint_store.load()
+        config.group_state["checkpoint_store"] = checkpoint_store
+
+
+def pytest_unconfigure(config):
+    """
+    Освобождает арендованный из пула стенд
+    """
+    release_session_stand(config)
 
 
 def _update_sensor_ids(stand_manager: StandSetupManager) -> None:
@@ -121,11 +247,40 @@ def pytest_runtest_makereport(item, call):
     Делает падение критического теста с маркировкой critical_stop однозначным:
     - рисуем fail для теста
     - после него прекращаем запуск остальных тестов
+    Прикрепляет отложенные вложения сообщений упавшего теста
     """
     outcome = yield
     report = outcome.get_result()
+    if report.failed:
+        flush_item_attachments(item)
+    if report.when == "teardown":
+        discard_item_attachments(item)
     if report.when == "call" and report.failed and item.get_closest_marker("critical_stop"):
         item.session.shouldstop = f"Критическая проверка упала: {item.nodeid}"
+    if report.when == "call":
+        if (window_duration_s := OffsetWindowExecutor.get_item_duration(item)) is not None:
+            # Call-фаза теста из окна длится всё окно (первый тест) или ~0 (остальные)
+            report.duration = window_duration_s
+        _attach_offset_drift(item, report)
+        if checkpoint_store := item.config.group_state.get("checkpoint_store"):
+            checkpoint_store.mark_completed(item.nodeid)
+
+
+def _attach_offset_drift(item, report) -> None:
+    """
+    Дописывает длительность теста в замер опоздания и прикладывает замер к Allure
+    """
+    recorder = item.config.group_state.get("offset_drift_recorder")
+    if recorder is None or recorder.record_duration(item.nodeid, report.duration) is None:
+        return
+    try:
+        allure.attach(
+            recorder.format_attachment(item.nodeid),
+            name=DriftConst.ATTACHMENT_NAME,
+            attachment_type=allure.attachment_type.JSON,
+        )
+    except Exception:
+        logger.debug("Не удалось прикрепить замер опоздания теста к Allure", exc_info=True)
 
 
 # ===== Маппинг имён тестов на атрибуты конфига для получения маркеров =====
@@ -302,12 +457,16 @@ def _get_test_markers_config(item, test_name):
     return None
 
 
+@pytest.hookimpl(tryfirst=True)  # маркер xdist_group нужен до того, как xdist сформирует группы
 def pytest_collection_modifyitems(session, config, items):
     """
     1. Фильтрует тесты по --suites (если указано)
     2. Исключает тесты, у которых конфиг = None (тест отключён для этого набора данных)
     3. Добавляет маркеры offset и test_case_id из конфига к каждому параметризованному тесту
     4. Сортирует тесты по test_suite_name для группировки по наборам данных
+    5. При --pack-suites объединяет совместимые наборы в пакеты (маркер suite_pack)
+    6. При пуле стендов добавляет маркер xdist_group по набору/пакету (целиком на одном воркере)
+    7. При --resume исключает тесты, завершённые в прошлом прогоне (по checkpoint стенда)
     """
     # Получаем список выбранных наборов из --suites
     suites_option = config.getoption("--suites")
@@ -316,10 +475,16 @@ def pytest_collection_modifyitems(session, config, items):
         # Парсим список наборов: "select_4,select_19_20" -> ["select_4", "select_19_20"]
         selected_suites = [s.strip().lower() for s in suites_option.split(",")]
 
+    stand_pool_enabled = is_stand_pool_enabled(config)
+    checkpoint_store = config.group_state.get("checkpoint_store") if config.getoption("--resume") else None
     selected_items = []
     deselected_items = []
 
     for item in items:
+        if checkpoint_store and checkpoint_store.is_completed(item.nodeid):
+            deselected_items.append(item)
+            continue
+
         # Фильтрация по --suites
         if selected_suites:
             suite_marker = item.get_closest_marker("test_suite_name")
@@ -362,6 +527,9 @@ def pytest_collection_modifyitems(session, config, items):
     # Заменяем список тестов на отфильтрованный
     items[:] = selected_items
 
+    if config.getoption("--pack-suites"):
+        _assign_suite_packs(config, items)
+
     # Сортировка тестов по test_suite_name и offset
     # Цель: обеспечить запуск тестов строго по offset строго внутри набора данных
     # При равных offset сохраняем исходный порядок коллекции, чтобы порядок параметризации не перескакивал
@@ -382,11 +550,12 @@ def pytest_collection_modifyitems(session, config, items):
             offset_value = float("inf")
 
         original_index = getattr(item, "_collection_index", 0)
-        # Возвращаем тройку ключей сортировки
-        # 1) test_suite_name - группировка по набору
-        # 2) offset_value - порядок внутри набора по времени
-        # 3) original_index - стабильность при равных offset
-        return test_suite_name, offset_value, original_index
+        # Возвращаем ключи сортировки
+        # 1) сессия стенда - группировка по набору (или пакету наборов при --pack-suites)
+        # 2) offset_value - порядок внутри набора/пакета по времени
+        # 3) test_suite_name - при равных offset тесты набора идут подряд
+        # 4) original_index - стабильность при равных offset
+        return _get_session_key(item) or test_suite_name, offset_value, test_suite_name, original_index
 
     # Сохраняем исходный порядок коллекции для стабильной сортировки
     for index, item in enumerate(items):
@@ -399,6 +568,148 @@ def pytest_collection_modifyitems(session, config, items):
         if hasattr(item, "_collection_index"):
             delattr(item, "_collection_index")
 
+    if stand_pool_enabled:
+        for item in items:
+            if session_key := _get_session_key(item):
+                add_suite_xdist_group(item, session_key)
+
+
+def _get_session_key(item):
+    """
+    Ключ сессии стенда для теста: имя пакета наборов (--pack-suites) или имя набора данных.
+    Setup/teardown стенда выполняются при смене ключа.
+    """
+    if item is None:
+        return None
+    if pack_marker := item.get_closest_marker("suite_pack"):
+        return pack_marker.args[0]
+    if suite_marker := item.get_closest_marker("test_suite_name"):
+        return suite_marker.args[0]
+    return None
+
+
+def _get_suite_offsets(items, suite_name: str) -> list[float]:
+    """
+    Значения @pytest.mark.offset(...) (в минутах) всех тестов набора
+    """
+    offsets = []
+    for suite_item in items:
+        suite_marker = suite_item.get_closest_marker("test_suite_name")
+        if not suite_marker or suite_marker.args[0] != suite_name:
+            continue
+        if offset_marker := suite_item.get_closest_marker("offset"):
+            try:
+                offsets.append(float(offset_marker.args[0]))
+            except Exception:
+                continue
+    return offsets
+
+
+def _assign_suite_packs(config, items) -> None:
+    """
+    Планирует пакеты совместимых наборов и помечает их тесты маркером suite_pack.
+    Наборы без offset (длительность имитатора неизвестна) в пакеты не попадают.
+    """
+    first_items = {}
+    for item in items:
+        if suite_marker := item.get_closest_marker("test_suite_name"):
+            first_items.setdefault(suite_marker.args[0], item)
+
+    candidates = []
+    for suite_name, item in first_items.items():
+        offsets = _get_suite_offsets(items, suite_name)
+        if not offsets:
+            continue
+        suite_config = _find_config_by_suite_name(suite_name)
+        candidates.append(
+            SuitePackCandidate(
+                suite_name=suite_name,
+                data_id=item.get_closest_marker("test_suite_data_id").args[0],
+                data_name=item.get_closest_marker("test_data_name").args[0],
+                tu_id=item.get_closest_marker("tu_id").args[0],
+                duration_m=max(offsets) + ImConst.IMITATOR_FINISH_DELAY_MINUTE,
+                measure_conversion_rules=getattr(suite_config, "measure_conversion_rules", None),
+                use_lds_configurator=getattr(suite_config, "use_lds_configurator", False),
+            )
+        )
+
+    suite_packs = {}
+    for pack in SuitePackingPlanner().plan(candidates):
+        if not pack.is_packed:
+            continue
+        suite_packs[pack.name] = pack
+        logger.info(f"[PACK] Наборы {pack.name} прогоняются в одной сессии стенда ({pack.duration_m} мин.)")
+        pack_suite_names = {suite.suite_name for suite in pack.suites}
+        for item in items:
+            suite_marker = item.get_closest_marker("test_suite_name")
+            if suite_marker and suite_marker.args[0] in pack_suite_names:
+                item.add_marker(pytest.mark.suite_pack(pack.name))
+    config.group_state["suite_packs"] = suite_packs
+
+
+def pytest_collection_finish(session):
+    """
+    При --concurrent-offsets формирует окна тестов с одинаковым offset по итоговому списку тестов
+    (после фильтрации --suites, -k и сортировки по offset).
+    При --plan строит план прогона и снимает все тесты с выполнения.
+    """
+    if session.config.getoption("--plan"):
+        _report_timeline_plan(session)
+        return
+    if not session.config.getoption("--concurrent-offsets"):
+        return
+    executor = OffsetWindowExecutor(session.config.group_state)
+    executor.build_windows(session.items)
+    session.config.group_state["offset_window_executor"] = executor
+
+
+def _report_timeline_plan(session) -> None:
+    """
+    Печатает план прогона, сохраняет его в JSON и исключает все тесты из выполнения
+    """
+    config = session.config
+    planner = TimelinePlanner(
+        compute_imitator_duration,
+        _get_session_key,
+        concurrent_offsets=config.getoption("--concurrent-offsets"),
+    )
+    plan = planner.build(session.items)
+    terminal_reporter = config.pluginmanager.get_plugin("terminalreporter")
+    for line in planner.format_report(plan):
+        if terminal_reporter:
+            terminal_reporter.write_line(line)
+        else:
+            logger.info(line)
+    plan_path = planner.write_json(plan, config.getoption("--plan-file"))
+    logger.info(f"[PLAN] План прогона сохранён в {plan_path.resolve()}")
+
+    if session.items:
+        config.hook.pytest_deselected(items=list(session.items))
+        session.items[:] = []
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    """
+    Тесты из окна одинакового offset выполняются через OffsetWindowExecutor
+    """
+    executor = pyfuncitem.config.group_state.get("offset_window_executor")
+    if executor and executor.run_item(pyfuncitem):
+        return True
+    return None
+
+
+@pytest.fixture(autouse=True)
+def deferred_allure_attachments(request):
+    """
+    Буфер Allure-вложений ws/http сообщений теста: рендерятся и прикрепляются только при падении теста
+    """
+    attachments = DeferredAttachments(verbose=request.config.group_state["allure_verbose_attachments"])
+    request.node.stash[DEFERRED_ATTACHMENTS_KEY] = attachments
+    activate_deferred_attachments(attachments)
+    yield attachments
+    activate_deferred_attachments(None)
+
 
 @pytest.fixture(autouse=True)
 def allure_tms_link(request):
@@ -421,9 +732,14 @@ def require_suite_infra(request):
     """
     if not request.node.get_closest_marker("test_suite_name"):
         return
+    if OffsetWindowExecutor.is_window_executed(request.node):
+        # Тест уже выполнен в окне одинакового offset, проверка прошла перед выполнением окна
+        return
     cfg = request.config.group_state
     if cfg.get("current_suite") and not cfg.get("suite_infra_ready"):
         pytest.skip("[SETUP] [ERROR] Набор пропущен: инфраструктура не готова")
+    if (watchdog := cfg.get("suite_watchdog")) and watchdog.is_aborted:
+        pytest.fail(watchdog.abort_reason)
 
 
 @pytest.fixture(autouse=True)
@@ -434,13 +750,26 @@ def offset_wait(request):
     cfg = request.config.group_state
     if cfg.get("current_suite") and not cfg.get("suite_infra_ready"):
         return
+    if OffsetWindowExecutor.is_window_executed(request.node):
+        return
     if offset_marker := request.node.get_closest_marker("offset"):
         offset_sec = float(offset_marker.args[0]) * BaseTN3Constants.SEC_PER_MIN
         start = request.config.group_state["suite_start_time"] or 0
         elapsed = time.monotonic() - start
         to_wait = max(0, offset_sec - elapsed)
         if to_wait:
-            time.sleep(to_wait)
+            # Ожидание прерывается, если watchdog остановил набор (упал имитатор или core)
+            watchdog = cfg.get("suite_watchdog")
+            if watchdog is None:
+                time.sleep(to_wait)
+            elif watchdog.wait_abort(to_wait):
+                pytest.fail(watchdog.abort_reason)
+        if OffsetWindowExecutor.is_windowed(request.node):
+            # Старт тестов окна записывает OffsetWindowExecutor по фактическому старту каждого теста
+            return
+        suite_marker = request.node.get_closest_marker("test_suite_name")
+        if start and suite_marker and (recorder := cfg.get("offset_drift_recorder")):
+            recorder.record_start(request.node.nodeid, suite_marker.args[0], offset_sec, time.monotonic() - start)
 
 
 def compute_imitator_duration(item, current_test_suite: str) -> float:
@@ -455,20 +784,7 @@ def compute_imitator_duration(item, current_test_suite: str) -> float:
       - Если ничего не найдено — pytest.fail с понятным текстом
     """
 
-    suite_items = [
-        suite_item
-        for suite_item in item.session.items
-        if (marker := suite_item.get_closest_marker("test_suite_name")) and marker.args[0] == current_test_suite
-    ]
-
-    offsets = []
-    for suite_item in suite_items:
-        offset_marker = suite_item.get_closest_marker("offset")
-        if offset_marker:
-            try:
-                offsets.append(float(offset_marker.args[0]))
-            except Exception:
-                continue
+    offsets = _get_suite_offsets(item.session.items, current_test_suite)
 
     if offsets:
         max_offset = max(offsets)
@@ -502,6 +818,7 @@ def _skip_current_suite_after_setup_failure(cfg: dict, message: str) -> None:
         logger.debug("Не удалось прикрепить ошибку setup к Allure", exc_info=True)
 
     logger.info("[TEARDOWN] LDS Configurator очистка после ошибки setup набора")
+    _stop_suite_watchdog(cfg)
     _run_lds_configurator_teardown_if_needed(cfg)
     if stand_manager := cfg.get("stand_manager"):
         try:
@@ -518,17 +835,20 @@ def _skip_current_suite_after_setup_failure(cfg: dict, message: str) -> None:
 @pytest.hookimpl(hookwrapper=True)
 def pytest_runtest_setup(item):
     """
-    Перезапуск имитатора при смене test_suite_name
+    Перезапуск имитатора при смене test_suite_name (или пакета наборов при --pack-suites)
     """
     cfg = item.config.group_state
 
     test_suite_marker = item.get_closest_marker("test_suite_name")
     if not test_suite_marker:
         pytest.fail("Тест без @pytest.mark.test_suite_name")
-    current_test_suite = test_suite_marker.args[0]
+    current_test_suite = _get_session_key(item)
 
     if current_test_suite != cfg["current_suite"]:
         # stop old
+        _stop_suite_watchdog(cfg)
+        close_suite_ws_pool(cfg)
+        close_suite_ws_recorder(cfg)
         _run_lds_configurator_teardown_if_needed(cfg)
         if stand_manager := cfg["stand_manager"]:
             try:
@@ -549,6 +869,7 @@ def pytest_runtest_setup(item):
         cfg["suite_start_time"] = None
         cfg["suite_infra_ready"] = False
         cfg["suite_setup_failure"] = None
+        cfg["imitator_start_times"] = {}
         clear_suite_auth(cfg)
 
         data_id = item.get_closest_marker("test_suite_data_id").args[0]
@@ -556,9 +877,10 @@ def pytest_runtest_setup(item):
         # legacy: id из enum TU для имитатора (tn{id}_tags.txt), не resolved_tu_id из Администрирования
         tu_id = item.get_closest_marker("tu_id").args[0]
 
-        imitator_duration = compute_imitator_duration(item, current_test_suite)
+        # Для пакета (--pack-suites) параметры всех наборов берутся из cfg["suite_packs"]
+        imitator_duration = compute_imitator_duration(item, test_suite_marker.args[0])
 
-        suite_config = _find_config_by_suite_name(current_test_suite)
+        suite_config = _find_config_by_suite_name(test_suite_marker.args[0])
         measure_conversion_rules = suite_config.measure_conversion_rules if suite_config is not None else None
 
         if suite_config is not None and suite_config.use_lds_configurator:
@@ -568,14 +890,35 @@ def pytest_runtest_setup(item):
                     "при use_lds_configurator=True"
                 )
 
-        stand_manager = StandSetupManager(
-            duration_m=imitator_duration,
-            test_data_id=data_id,
-            test_data_name=test_data_name,
-            tu_id=tu_id,
-            measure_conversion_rules=measure_conversion_rules,
-        )
+        suite_pack = cfg["suite_packs"].get(current_test_suite)
+        if suite_pack:
+            stand_manager = SuitePackSetupManager(
+                {
+                    suite.suite_name: StandSetupManager(
+                        duration_m=suite.duration_m,
+                        test_data_id=suite.data_id,
+                        test_data_name=suite.data_name,
+                        tu_id=suite.tu_id,
+                        measure_conversion_rules=suite.measure_conversion_rules,
+                        stand_name=cfg["stand_name"],
+                    )
+                    for suite in suite_pack.suites
+                }
+            )
+        else:
+            stand_manager = StandSetupManager(
+                duration_m=imitator_duration,
+                test_data_id=data_id,
+                test_data_name=test_data_name,
+                tu_id=tu_id,
+                measure_conversion_rules=measure_conversion_rules,
+                stand_name=cfg["stand_name"],
+            )
         cfg["stand_manager"] = stand_manager
+        if _resume_suite_session(item.config, stand_manager, current_test_suite):
+            _start_suite_watchdog(cfg, stand_manager)
+            yield
+            return
         try:
             stand_manager.check_opc_server_status()
         except RuntimeError as error:
@@ -624,6 +967,8 @@ def pytest_runtest_setup(item):
 
         # Сохраняем время старта имитатора для расчёта интервалов утечек в тестах
         cfg["imitator_start_time"] = stand_manager.start_time
+        if isinstance(stand_manager, SuitePackSetupManager):
+            cfg["imitator_start_times"] = stand_manager.start_times
 
         if suite_config is not None and suite_config.use_lds_configurator:
             if suite_config.admin_tu is None:
@@ -640,10 +985,82 @@ def pytest_runtest_setup(item):
                 )
 
         cfg["suite_infra_ready"] = True
+        _start_suite_watchdog(cfg, stand_manager)
+        if checkpoint_store := cfg.get("checkpoint_store"):
+            checkpoint_store.begin_session(
+                cfg, stand_manager, suite_pack.duration_m if suite_pack else imitator_duration
+            )
 
     yield  # pytest продолжит выполнение теста
 
 
+def _start_suite_watchdog(cfg: dict, stand_manager) -> None:
+    """
+    Запускает фоновый контроль набора: имитатор, контейнеры core и поток сообщений WS
+    """
+    watchdog = SuiteWatchdog(stand_manager, cfg["suite_start_time"], WebSocketClient.get_data_idle_s)
+    watchdog.start()
+    cfg["suite_watchdog"] = watchdog
+
+
+def _stop_suite_watchdog(cfg: dict) -> None:
+    if watchdog := cfg.get("suite_watchdog"):
+        watchdog.stop()
+        cfg["suite_watchdog"] = None
+
+
+def _resume_suite_session(config, stand_manager, session_key: str) -> bool:
+    """
+    --resume: подключение к имитатору набора/пакета, оставшемуся от упавшего прогона.
+    Подготовка стенда, запуск имитатора и core пропускаются, offset считаются от сохранённого старта core.
+    :return: True, если сессия возобновлена
+    """
+    cfg = config.group_state
+    checkpoint_store = cfg.get("checkpoint_store")
+    if not config.getoption("--resume") or checkpoint_store is None:
+        return False
+    active_session = checkpoint_store.take_resumable_session(session_key)
+    if active_session is None:
+        return False
+    is_pack = isinstance(stand_manager, SuitePackSetupManager)
+    try:
+        # Сначала подключение: до него поиск процесса имитатора идёт по данным нового прогона
+        if is_pack:
+            stand_manager.attach_to_running_imitators(
+                active_session.remote_data_paths, active_session.get_start_times()
+            )
+        else:
+            stand_manager.attach_to_running_imitator(
+                active_session.remote_data_paths[session_key], active_session.get_start_times()[session_key]
+            )
+        if not stand_manager.is_imitator_running():
+            raise RuntimeError("имитатор на стенде не запущен")
+        checkpoint_store.restore_group_state(cfg, active_session)
+        ensure_suite_auth(cfg, session_key)
+        _update_sensor_ids(stand_manager)
+    except BaseException as error:
+        logger.warning(f"[SETUP] [RESUME] Не удалось продолжить сессию {session_key}, полный setup: {error}")
+        checkpoint_store.end_session()
+        cfg["suite_start_time"] = None
+        cfg["imitator_start_times"] = {}
+        clear_suite_auth(cfg)
+        try:
+            if is_pack:
+                stand_manager.detach_from_imitators(active_session.remote_data_paths)
+            else:
+                stand_manager.detach_from_imitator(active_session.remote_data_paths[session_key])
+        except Exception as detach_error:
+            _skip_current_suite_after_setup_failure(
+                cfg, f"[SETUP] [ERROR] Имитатор прошлого прогона не остановлен, полный setup невозможен: {detach_error}"
+            )
+        return False
+    cfg["suite_infra_ready"] = True
+    logger.info(
+        f"[SETUP] [RESUME] Сессия {session_key} продолжена: прошло {active_session.elapsed_s:.0f} с от старта core"
+    )
+    return True
+
+
 def _run_lds_configurator_ws(coro_factory) -> None:
     """Запускает async WS-сценарий lds-configurator"""
     lds_cfg_utils.set_configurator_flow_active(True)
@@ -728,10 +1145,12 @@ def pytest_runtest_teardown(item, nextitem):
     yield
     cfg = item.config.group_state
 
-    next_marker = nextitem.get_closest_marker("test_suite_name") if nextitem else None
-    next_suite = next_marker.args[0] if next_marker else None
+    next_suite = _get_session_key(nextitem)
 
     if next_suite != cfg["current_suite"]:
+        _stop_suite_watchdog(cfg)
+        close_suite_ws_pool(cfg)
+        close_suite_ws_recorder(cfg)
         if stand_manager := cfg["stand_manager"]:
             try:
                 if cfg.get("suite_infra_ready"):
@@ -743,9 +1162,12 @@ def pytest_runtest_teardown(item, nextitem):
                 stand_manager.server_test_data_remover()
             finally:
                 cfg["stand_manager"] = None
+        if checkpoint_store := cfg.get("checkpoint_store"):
+            checkpoint_store.end_session()
         cfg["current_suite"] = None
         cfg["suite_start_time"] = None
         cfg["imitator_start_time"] = None
+        cfg["imitator_start_times"] = {}
         cfg["suite_infra_ready"] = False
 
         # опционально дождаться завершения потока (если не daemon) — безопасный join
@@ -766,9 +1188,13 @@ async def ws_client(request):
     :return: Объект wss соединения
     """
     cfg = request.config.group_state
+    if OffsetWindowExecutor.is_windowed(request.node):
+        # Тест из окна одинакового offset получает собственную ws-сессию внутри OffsetWindowExecutor
+        yield None
+        return
     ensure_auth_for_fixture(cfg)
-    ws_client = init_ws_stand_client(cfg)
-    async with ws_client as client:
+    # Сессия общего соединения набора: без connect и handshake на каждый тест
+    async with open_ws_stand_client(cfg) as client:
         yield client
 
 
@@ -793,7 +1219,9 @@ def imitator_start_time(request):
     - leak_start_time = imitator_start_time + timedelta(seconds=LEAK_START_INTERVAL)
     - leak_end_time = imitator_start_time + timedelta(seconds=LEAK_START_INTERVAL + ALLOWED_TIME_DIFF_SECONDS)
     """
-    start_time = request.config.group_state.get("imitator_start_time")
+    suite_marker = request.node.get_closest_marker("test_suite_name")
+    suite_name = suite_marker.args[0] if suite_marker else None
+    start_time = get_suite_imitator_start_time(request.config.group_state, suite_name)
     if start_time is None:
         pytest.fail("imitator_start_time не установлен. Убедитесь что тест запущен после инициализации имитатора.")
     return start_time
@@ -803,9 +1231,16 @@ def pytest_sessionfinish(session, exitstatus):
     """
     В завершении сессии — отправляем единый Allure‑отчёт в TestOps.
     """
+    # --plan: стенд не использовался, отчёт не формировался
+    if session.config.getoption("--plan"):
+        return
+
     # 1) teardown стенда: LDS Configurator + остановка имитатора
     try:
         group_state = getattr(session.config, "group_state", {})
+        _stop_suite_watchdog(group_state)
+        close_suite_ws_pool(group_state)
+        close_suite_ws_recorder(group_state)
         _run_lds_configurator_teardown_if_needed(group_state)
         stand_manager = group_state.get("stand_manager")
         if stand_manager:
@@ -824,6 +1259,27 @@ def pytest_sessionfinish(session, exitstatus):
     except Exception:
         logger.exception("[ERROR] [TEARDOWN] Ошибка при получении stand_manager из group_state")
 
+    # Сессия завершена, имитатор остановлен - возобновлять нечего
+    if checkpoint_store := getattr(session.config, "group_state", {}).get("checkpoint_store"):
+        checkpoint_store.clear()
+
+    # Отчёт об опоздании тестов относительно offset (у каждого xdist-воркера свой файл)
+    if recorder := getattr(session.config, "group_state", {}).get("offset_drift_recorder"):
+        worker_id = get_worker_id(session.config)
+        report_name = DriftConst.REPORT_FILE_NAME
+        if worker_id != "master":
+            report_name = report_name.replace(".json", f"_{worker_id}.json")
+        try:
+            if report_path := recorder.write_json(report_name):
+                logger.info(f"[TEARDOWN] Отчёт об опоздании тестов сохранён в {report_path.resolve()}")
+        except OSError:
+            logger.exception("[ERROR] [TEARDOWN] Не удалось сохранить отчёт об опоздании тестов")
+
+    # xdist-воркер не выгружает отчёт: результаты всех воркеров пишутся в общий allure-results,
+    # выгрузка и очистка выполняются один раз в управляющем процессе
+    if is_xdist_worker(session.config):
+        return
+
     # 2) Выгрузка allure-results в TestOps
     try:
         uploader = AllureResultsUploader()
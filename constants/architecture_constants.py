@@ -32,8 +32,12 @@ class ImitatorConstants:
     IMITATOR_TIME_FORMAT: str = "%Y%m%dT%H%M%S"
     IMITATOR_START_DELAY_S: int = 100
     IMITATOR_FINISH_DELAY_MINUTE: float = 2.0
-    IMITATOR_CHECK_CMD: str = "pgrep -f Playground"
-    IMITATOR_KILL_CMD: str = "pkill -f Playground"
+    # Процесс имитатора набора ищется по пути к его данным в командной строке: на стенде пакета работают
+    # имитаторы нескольких наборов. [P] - чтобы шаблон не совпадал с командной строкой оболочки самого pgrep
+    IMITATOR_PROCESS_PATTERN: str = "[P]layground.*{data_path}/"
+    IMITATOR_CHECK_CMD: str = "pgrep -f '{pattern}'"
+    IMITATOR_KILL_CMD: str = "pkill -f '{pattern}'"
+    IMITATOR_STOP_WAIT_S: int = 10  # Сколько ждать завершения процесса имитатора после pkill
     IMITATOR_PATH = "/data/imitator/lds-flow-playground-csv-latest"
     IMITATOR_RUN_CMD: str = f"dotnet {IMITATOR_PATH}/TN.LDS.Flow.Playground.Application.dll"
     IMITATOR_LOG_FILE_NAME: str = "imitator.log"
@@ -80,6 +84,54 @@ class ImitatorConstants:
     }
 
 
+class StandLeaseConstants:
+    LEASE_DIR_ENV_KEY: str = "STAND_LEASE_DIR"
+    LEASE_DIR_DEFAULT_NAME: str = "lds_stand_leases"
+    LEASE_FILE_SUFFIX: str = ".lease"
+    LEASE_LOCK_FILE_SUFFIX: str = ".lock"  # Блокировка ОС на время проверки, перехвата и записи аренды
+    LEASE_TTL_S: int = 5 * 60  # Аренда без heartbeat дольше TTL считается брошенной (упавший воркер или runner)
+    LEASE_HEARTBEAT_INTERVAL_S: int = 60  # Как часто владелец обновляет heartbeat_at в файле аренды
+    LEASE_WAIT_TIMEOUT_S: int = 30 * 60  # Сколько ждать освобождения стенда из пула
+    LEASE_POLL_INTERVAL_S: int = 30
+    STAND_POOL_SEPARATOR: str = ","
+    XDIST_WORKER_ENV_KEY: str = "PYTEST_XDIST_WORKER"
+
+
+class SuitePackingConstants:
+    MAX_PACK_SIZE: int = 3  # Сколько наборов данных (имитаторов) запускать одновременно на одном стенде
+    DURATION_TOLERANCE_M: float = 20.0  # Допустимая разница длительности наборов в пакете, мин.
+    PACK_NAME_SEPARATOR: str = "+"
+
+
+class TimelinePlanConstants:
+    DEFAULT_PLAN_FILE_NAME: str = "test_plan.json"
+    # Оценки для --plan: фактические значения зависят от стенда, уточняются по логам прогонов
+    SUITE_SETUP_ESTIMATE_S: int = 6 * 60  # загрузка данных, остановка/очистка/запуск контейнеров, auth
+    SUITE_TEARDOWN_ESTIMATE_S: int = 60  # остановка имитатора, удаление данных со стенда
+    TEST_DURATION_ESTIMATE_S: int = 30  # длительность одного теста после его offset
+
+
+class OffsetDriftConstants:
+    DRIFT_WARNING_THRESHOLD_S: float = 60.0  # Опоздание старта теста относительно offset, после которого - warning
+    REPORT_FILE_NAME: str = "offset_drift.json"
+    ATTACHMENT_NAME: str = "Offset drift"
+
+
+class CheckpointConstants:
+    FILE_NAME_TEMPLATE: str = ".lds_checkpoint_{stand}.json"
+
+
+class SuiteWatchdogConstants:
+    CHECK_INTERVAL_S: float = 15.0
+    CHECK_CMD_TIMEOUT_S: int = 30
+    FAILURE_CONFIRMATIONS: int = 2  # Подряд неуспешных проверок до остановки набора (защита от разового сбоя ssh)
+    IMITATOR_STOP_GRACE_S: float = 60.0  # Завершение имитатора ближе к --stopTime считается штатным
+    # Открытый WS-клиент без сообщений с данными. Дольше самых долгих ожиданий сценариев
+    # (JOURNAL_STATUS_TOTAL_WAIT, BALANCE_ALGORITHM_TOTAL_WAIT, VERIFY_UI_SYNC_TIME_SECONDS - 300 с,
+    # MASK_MESSAGE_TIMEOUT - 180 с), в которые подписки с push по изменению могут молчать
+    WS_STALE_TIMEOUT_S: float = 600.0
+
+
 class ClickhouseConstants(ImitatorConstants):
     CH_TABLE_NAMES: list = ["lds.records", "lds.records_lastvalue"]
     EVO_OBJECT_ID_KEY_NAME: str = "evoObjectId"
@@ -95,6 +147,7 @@ class DockerConstants:
     STOP_CMD: str = "docker stop"
     START_CMD: str = "docker start"
     CHECK_STATUS_CMD: str = "docker inspect -f '{{.State.Status}}'"
+    CHECK_GROUP_STATUS_CMD: str = "docker inspect -f '{{.Name}} {{.State.Status}}'"
     RUNNING_STATUS: str = "running"
     EXITED_STATUS: str = "exited"
     CORE_CONTAINERS_GROUP: list = ["lds-core-node1", "lds-core-node2", "lds-core-node3"]
@@ -151,11 +204,37 @@ class HTTPClientConstants(StandConstants):
     COLUMNS_SELECTION_DEFAULT: list = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13]
 
 
+class HttpTransportConstants:
+    RETRYING_POLICY: str = "retrying"  # Запросы к стендам: повторы по статусам и ошибкам сети
+    PLAIN_POLICY: str = "plain"  # TestOps, Keycloak: повторяются только неудавшиеся подключения
+    RETRIES: int = 3
+    BACKOFF_FACTOR: float = 0.3
+    POOL_HOSTS: int = 10  # Хостов с пулом соединений в одной сессии
+    POOL_MAXSIZE_PER_HOST: int = 10  # Одновременных соединений на хост, остальные запросы ждут свободное
+    DEFAULT_TIMEOUT: tuple = (10, 120)  # (connect, read) секунд, если timeout не передан в запрос
+
+
+class HttpResponseCacheConstants:
+    TTL_SECONDS: float = 30.0  # Сколько ответ справочного запроса отдаётся из кэша набора
+    # Идемпотентные запросы к стенду, ответы на которые кэшируются
+    CACHEABLE_PATHS: frozenset = frozenset(
+        {
+            StandConstants.GET_BASIC_INFO_URL_PATH,
+            StandConstants.GET_BASIC_INFO_ADMIN_URL_PATH,
+            StandConstants.GET_TUS_INFORMATION_URL_PATH,
+            StandConstants.PING_URL_PATH,
+        }
+    )
+    # Команды конфигуратора, после которых кэш набора сбрасывается
+    INVALIDATING_PATHS: frozenset = frozenset({StandConstants.LAUNCH_LDS_URL_PATH, StandConstants.STOP_LDS_URL_PATH})
+
+
 class WebSocketClientConstants(StandConstants):
     RS: bytes = b'\x1E'  # ASCII Record Separator
     HANDSHAKE_WAITING: float | int = 5.0
     HANDSHAKE_MESSAGE: str = "{\"protocol\":\"messagepack\",\"version\":1}"
     WS_HUBS: str = "/hubs/ldsClientHub"
+    WS_SCHEME: str = "wss"
     START_INVOCATION_ID: str = 1
     DEFAULT_RECONNECT_INTERVAL: float | int = 5.0
     WS_CONNECT_TIMEOUT_SECONDS: float = 120.0
@@ -166,6 +245,8 @@ class WebSocketClientConstants(StandConstants):
     STREAM_INVOCATION_MESSAGE_TYPE: int = 4  # StreamInvocation
     STREAM_ITEM_MESSAGE_TYPE: int = 2  # StreamItem
     COMPLETION_MESSAGE_TYPE: int = 3  # Completion
+    CANCEL_INVOCATION_MESSAGE_TYPE: int = 5  # CancelInvocation
+    PING_MESSAGE_TYPE: int = 6  # Ping
     # Текст ошибки Completion при неуспешном streaming (SignalR CompletionWithDetail)
     COMPLETION_ERROR_MESSAGE_INDEX: int = 4
     DEFAULT_SIGNALR_MAP_HEADERS: dict = {}
@@ -173,6 +254,83 @@ class WebSocketClientConstants(StandConstants):
     INVOCATION_ID_INDEX = 2
     SERVICE_NAME: str = StandConstants.MAIN_SUBDOMAIN
     FILTERING_TIMEOUT: int | float = 10.0
+    MAX_BUFFERED_MESSAGES: int = 10000  # Неизвлечённых сообщений в буфере соединения, старые вытесняются
+    # Вызов Subscribe<X>Request создаёт на хабе подписку с push типа контента <X>Content
+    SUBSCRIBE_TARGET_PREFIX: str = "subscribe"
+    SUBSCRIBE_TARGET_SUFFIX: str = "Request"
+    SUBSCRIPTION_CONTENT_SUFFIX: str = "Content"
+    SUBSCRIPTION_CONTENT_TYPES: dict = {}  # Исключения из правила: target подписки -> тип контента push
+    ROUTER_COMPACT_SLACK: int = 64  # Извлечённых сообщений, которые канал роутера держит до пересборки
+    HEADER_PEEK_BYTES: int = 256  # Начало сообщения, из которого LazySignalRMessage читает заголовок
+
+
+class WsChannelPolicyConstants:
+    # Политики каналов типов контента в WsMessageRouter
+    KEEP_LATEST: str = "keep_latest"  # хранится только последнее неизвлечённое сообщение
+    RING: str = "ring"  # последние capacity сообщений, старые вытесняются
+    BLOCK: str = "block"  # приём соединения ждёт, пока получатель освободит место
+    # Тип контента -> (политика, ёмкость). Подписки с частыми push полного состояния
+    DEFAULT_POLICIES: dict = {
+        "BalanceAlgorithmResultsContent": (RING, 64),
+        "InputSignalsContent": (RING, 64),
+        "SchemeSignalsStateContent": (RING, 16),
+        "MainPageSignalsInfoContent": (RING, 16),
+        "CommonSchemeContent": (RING, 16),
+        "MainPageInfoContent": (RING, 16),
+    }
+
+
+class WsRecordingConstants:
+    FILE_MAGIC: bytes = b"LDSWSREC2\n"
+    FILE_MAGIC_V1: bytes = b"LDSWSREC1\n"  # Записи без номера соединения, читаются как соединение 0
+    INDEX_SUFFIX: str = ".idx.json"
+    FILE_NAME_TEMPLATE: str = "{suite}.wsrec"
+    COMPRESS_MIN_BYTES: int = 256  # Фреймы меньше пишутся без сжатия
+    COMPRESS_LEVEL: int = 1
+    REPLAY_SPEED: float = 1.0  # 1 - реальное время, 0 - без пауз
+
+
+class SchemeIndexConstants:
+    CACHE_SIZE: int = 8  # Индексов последних списков flowAreas (SchemeIndex.of)
+
+
+class JournalStoreConstants:
+    CACHE_SIZE: int = 8  # Индексов последних списков messagesInfo (JournalStore.of)
+
+
+class JournalPagerConstants:
+    PAGE_LIMIT: int = 50  # Сообщений на странице журнала (JournalPager)
+    MAX_PAGES: int = 20  # Страниц журнала за одно чтение, дальше не запрашиваются
+
+
+class AllureAttachConstants:
+    MAX_PENDING: int = 500  # Отложенных вложений на тест, ранние вытесняются
+    DROPPED_ATTACHMENT_NAME: str = "Вытесненные вложения"
+
+
+class WsBenchmarkConstants:
+    HOST: str = "127.0.0.1"
+    HANDSHAKE_REPLY: bytes = b"{}\x1e"
+    COMPLETION_RESULT_KIND: int = 3  # Completion с результатом
+    SENT_AT_HEADER: str = "sentAt"  # время отправки (time.perf_counter) в заголовках сообщения
+    DURATION_S: float = 10.0
+    TU_ID: int = 1
+    # content_type:сообщений в секунду:элементов в сообщении
+    DEFAULT_STREAMS: tuple = ("CommonSchemeContent:20:200", "InputSignalsContent:50:100", "LeaksContent:5:10")
+    LATENCY_PERCENTILES: tuple = (50, 95, 99)
+    STOP_TIMEOUT_S: float = 10.0
+    # Сравнение dacite и сгенерированных декодеров: элементов в сообщении, повторов декодирования
+    DECODER_ITEMS: int = 5000
+    DECODER_REPEATS: int = 20
+    BALANCE_CONTENT_TYPE: str = "BalanceAlgorithmResultsContent"
+
+
+class WebSocketPoolConstants:
+    MAX_CONNECTIONS: int = 4  # Одновременно открытых соединений пула (тесты окна --concurrent-offsets)
+    # Соединение закрывается после стольких тестов, чтобы на нём не копились подписки прошлых тестов
+    MAX_SESSIONS_PER_CONNECTION: int = 50
+    HEALTH_CHECK_INTERVAL_S: float = 1.0
+    CLOSE_TIMEOUT_S: float = 30.0
 
 
 class MockConstants:
@@ -194,6 +352,7 @@ class EnvKeyConstants:
     SSH_KEY_NAME: str = "SSH_KEY_NAME"
     SSH_USER_DEV: str = "SSH_USER_DEV"
     STAND_NAME: str = "STAND_NAME"
+    STAND_POOL: str = "STAND_POOL"
     DATA_PATH: str = "DATA_PATH"
     OPC_URL: str = "OPC_URL"
     TU_ID: str = "TU_ID"
@@ -132,6 +132,8 @@ class BaseTN3Constants:
     # ===== Прочие константы =====
     BASIC_MESSAGE_TIMEOUT = 10.0  # Таймаут ожидания сообщений в секундах
     SUBSCRIBE_MESSAGE_POLL_ATTEMPTS = 5  # Число чтений из потока подписки до отказа
+    # Сообщение подписки CommonScheme/MainPageInfo не старше стольких секунд берётся без ожидания push
+    SUBSCRIPTION_SNAPSHOT_MAX_AGE_S = 3.0
     MASK_MESSAGE_TIMEOUT = 180.0  # Таймаут ожидания сообщений в секундах
     PRECISION = 3  # Точность округления для координат
     DIGITS_WITH_DOT_PATTERN = r'\d+(?:\.\d+)?'  # Регулярное выражение для поиска чисел с точкой
@@ -244,6 +244,13 @@ class UploadImitatorDataCmdGenerator(BaseCmdGenerator):
         # Путь к архиву во временной директории на удаленном сервере
         self._full_remote_tar_path = self._path_generator.generate_full_remote_tar_path()
 
+    def set_remote_temp_dir_path(self, remote_temp_dir_path: str) -> None:
+        """
+        Переключает команды на другую временную директорию (данные, загруженные прошлым прогоном)
+        """
+        self._remote_temp_dir_path = remote_temp_dir_path
+        self._full_remote_tar_path = str(PurePosixPath(remote_temp_dir_path) / self._tar_package_name)
+
     def generate_check_remote_data_cmd(self) -> str:
         """
         Создает команду проверки существования директории с данными и сопутствующих файлов
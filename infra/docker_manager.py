@@ -70,6 +70,20 @@ class DockerContainerManager:
             )
             raise RuntimeError
 
+    def get_containers_status(self, containers: list, timeout: int = None) -> dict[str, str]:
+        """
+        Статусы группы контейнеров одной командой (без проверки на ожидаемый статус)
+        :return: словарь имя контейнера: статус. Контейнер, не попавший в вывод, отсутствует в словаре
+        """
+        check_cmd = self._add_containers_to_cmd(DC_const.CHECK_GROUP_STATUS_CMD, containers)
+        result = self._client.run_cmd(check_cmd, check=False, timeout=timeout, need_output=True) or ""
+        statuses = {}
+        for line in result.splitlines():
+            name, _, status = line.strip().partition(" ")
+            if name:
+                statuses[name.lstrip("/")] = status
+        return statuses
+
     @staticmethod
     def _add_containers_to_cmd(command: str, containers: list) -> str:
         """
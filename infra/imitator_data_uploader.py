@@ -90,6 +90,26 @@ class ImitatorDataUploader:
             raise ValueError("[DATA UPLOADER] [ERROR] При проверке удаления данных")
         logging.info(f"[DATA UPLOADER] [OK] Тестовые данные успешно удалены с удаленного сервера: {self._host}")
 
+    def attach_remote_data_dir(self, remote_temp_dir_path: str) -> None:
+        """
+        Привязывает uploader к данным, уже загруженным на удаленный сервер (возобновление прогона --resume)
+        """
+        self.remote_temp_dir_path = remote_temp_dir_path
+        self._cmd_generator.set_remote_temp_dir_path(remote_temp_dir_path)
+        if not self._subprocess_client.check_remote_unpack_data():
+            raise FileNotFoundError(
+                "[DATA UPLOADER] [ERROR] Данные прошлого прогона не найдены на удаленном сервере: "
+                f"{remote_temp_dir_path}"
+            )
+        logging.info(f"[DATA UPLOADER] [OK] Используются данные прошлого прогона: {remote_temp_dir_path}")
+
+    def detach_remote_data_dir(self) -> None:
+        """
+        Возвращает uploader к временной директории текущего прогона (возобновление --resume не удалось)
+        """
+        self.remote_temp_dir_path = self._path_generator.remote_temp_dir_path
+        self._cmd_generator.set_remote_temp_dir_path(self.remote_temp_dir_path)
+
     def _get_test_data_attachment_id_by_name(self, attachments_list: dict) -> int:
         """
         Получает id архива данных для имитатора
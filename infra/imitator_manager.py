@@ -1,5 +1,7 @@
 import logging
+import re
 import subprocess
+import time
 from typing import Optional
 
 from clients.subprocess_client import SubprocessClient
@@ -24,11 +26,14 @@ class ImitatorManager:
     Для остановки имитатора:
     imitator_manager.stop_imitator()
     Для получения процесса с запущенным имитатором
+    Проверка и остановка на стенде касаются только имитатора с данными data_path,
+    имитаторы других наборов пакета не затрагиваются
     """
 
-    def __init__(self, client: SubprocessClient, imitator_run_cmd: str) -> None:
+    def __init__(self, client: SubprocessClient, imitator_run_cmd: str, data_path: str) -> None:
         self._client = client
         self._imitator_run_cmd = imitator_run_cmd
+        self._data_path = data_path
         self._logger: logging.getLogger() = logging.getLogger(self.__class__.__name__)
         self._setup_logger()
         self._imitator_process: Optional[subprocess.Popen] = None
@@ -37,6 +42,12 @@ class ImitatorManager:
     def imitator_process(self) -> Optional[subprocess.Popen]:
         return self._imitator_process
 
+    def set_data_path(self, data_path: str) -> None:
+        """
+        Переключает поиск процесса на имитатор с другими данными (запущенный прошлым прогоном, --resume)
+        """
+        self._data_path = data_path
+
     def _setup_logger(self) -> None:
         """
         Настраивает отдельный логер для имитатора
@@ -81,16 +92,30 @@ class ImitatorManager:
         except (OSError, ValueError):
             logging.exception("[IMITATOR] [ERROR] Ошибка при получении логов имитатора!")
 
-    def _is_imitator_running(self) -> bool:
+    def _is_imitator_running(self, log_status: bool = True) -> bool:
         """
-        Проверяет наличие PID имитатора на стенде
+        Проверяет наличие PID имитатора набора на стенде
+        :param log_status: писать ли в лог, остановлен ли имитатор
         """
-        result = self._client.run_cmd(Im_const.IMITATOR_CHECK_CMD, check=False, need_output=True)
-        if result:
-            logger.warning(f"[IMITATOR] [WARNING] Имитатор не остановлен! PID: {result}")
-        else:
-            logger.info("[IMITATOR] [OK] Имитатор остановлен успешно")
-        return bool(result and result.strip())
+        result = self._client.run_cmd(self._get_check_cmd(), check=False, need_output=True)
+        is_running = bool(result and result.strip())
+        if log_status:
+            if is_running:
+                logger.warning(f"[IMITATOR] [WARNING] Имитатор не остановлен! PID: {result}")
+            else:
+                logger.info("[IMITATOR] [OK] Имитатор остановлен успешно")
+        return is_running
+
+    def _kill_remote_imitator(self) -> bool:
+        """
+        Останавливает процесс имитатора набора на стенде, если он ещё работает
+        :return: True - имитатор остановлен
+        """
+        if not self._is_imitator_running():
+            return True
+        self._client.run_cmd(self._get_kill_cmd(), check=False)
+        self._wait_imitator_stopped()
+        return not self._is_imitator_running()
 
     def stop_imitator(self) -> None:
         """
@@ -98,15 +123,25 @@ class ImitatorManager:
         """
         try:
             self._client.terminate_process(self._imitator_process, timeout=Im_const.POPEN_WAIT_TIMOUT_S)
-            if self._is_imitator_running():
-                # Останавливает имитатор на стенде
-                self._client.run_cmd(Im_const.IMITATOR_KILL_CMD)
-                logger.info("[IMITATOR] [OK] Имитатор остановлен успешно")
+            self._kill_remote_imitator()
             self._imitator_process = None
         except RuntimeError:
             logger.exception("[IMITATOR] [ERROR] Ошибка остановки имитатора")
             raise
 
+    def is_remote_imitator_running(self) -> bool:
+        """
+        Проверяет, запущен ли имитатор на стенде (в том числе запущенный прошлым прогоном)
+        """
+        return self._is_imitator_running(log_status=False)
+
+    def stop_remote_imitator(self) -> None:
+        """
+        Останавливает имитатор на стенде, запущенный без локального процесса (прошлым прогоном)
+        """
+        if not self._kill_remote_imitator():
+            raise RuntimeError("[IMITATOR] [ERROR] Имитатор прошлого прогона не остановлен")
+
     def wait_and_stop_imitator(self) -> None:
         """
         Ожидает окончания работы имитатора и завершает его работу
@@ -120,3 +155,26 @@ class ImitatorManager:
             raise
         finally:
             self.stop_imitator()
+
+    def _wait_imitator_stopped(self) -> None:
+        """
+        Ждёт завершения процесса имитатора после pkill (SIGTERM), не дольше IMITATOR_STOP_WAIT_S
+        """
+        deadline = time.monotonic() + Im_const.IMITATOR_STOP_WAIT_S
+        while time.monotonic() < deadline:
+            if not self._is_imitator_running(log_status=False):
+                return
+            time.sleep(1)
+
+    def _get_process_pattern(self) -> str:
+        """
+        Шаблон pgrep/pkill (ERE) для процесса имитатора с данными текущего набора
+        """
+        data_path = re.sub(r"([.\[\\()*+?{|^$])", r"\\\1", self._data_path.rstrip("/"))
+        return Im_const.IMITATOR_PROCESS_PATTERN.format(data_path=data_path)
+
+    def _get_check_cmd(self) -> str:
+        return Im_const.IMITATOR_CHECK_CMD.format(pattern=self._get_process_pattern())
+
+    def _get_kill_cmd(self) -> str:
+        return Im_const.IMITATOR_KILL_CMD.format(pattern=self._get_process_pattern())
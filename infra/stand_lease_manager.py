@@ -0,0 +1,305 @@
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from constants.architecture_constants import ImitatorConstants as Im_const
+from constants.architecture_constants import StandLeaseConstants as Lease_const
+
+logger = logging.getLogger(__name__)
+
+
+class StandLeaseError(RuntimeError):
+    """
+    Не удалось арендовать стенд из пула
+    """
+
+
+class StandLeaseManager:
+    """
+    Аренда стенда из пула через lock-файлы в общей директории.
+    Один lock-файл на стенд: создаётся атомарно (O_CREAT | O_EXCL), поэтому
+    несколько pytest-воркеров (и несколько пайпов на одном runner) не возьмут один стенд.
+    Проверка, перехват брошенной аренды и запись файла выполняются под блокировкой ОС на файле
+    <стенд>.lease.lock, поэтому два воркера не перехватят одну аренду. Пока стенд арендован,
+    фоновый поток обновляет heartbeat_at в файле аренды.
+    Пример использования:
+    lease_manager = StandLeaseManager(["dev1", "dev2"], owner="gw0")
+    stand_name = lease_manager.acquire()
+    ...
+    lease_manager.release()
+    """
+
+    def __init__(self, stand_pool: List[str], owner: str, lease_dir: Optional[Path] = None) -> None:
+        self._stand_pool = self._filter_stand_pool(stand_pool)
+        self._owner = owner
+        self._lease_dir = lease_dir or self._get_default_lease_dir()
+        self._leased_stand: Optional[str] = None
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    @property
+    def leased_stand(self) -> Optional[str]:
+        return self._leased_stand
+
+    @property
+    def stand_pool(self) -> List[str]:
+        return list(self._stand_pool)
+
+    @staticmethod
+    def parse_stand_pool(value: Optional[str]) -> List[str]:
+        """
+        Парсит список стендов: "dev1,dev2" -> ["dev1", "dev2"]
+        """
+        if not value:
+            return []
+        stands = [stand.strip().lower() for stand in value.split(Lease_const.STAND_POOL_SEPARATOR)]
+        return list(dict.fromkeys(stand for stand in stands if stand))
+
+    def acquire(
+        self,
+        timeout_s: float = Lease_const.LEASE_WAIT_TIMEOUT_S,
+        poll_interval_s: float = Lease_const.LEASE_POLL_INTERVAL_S,
+        start_index: int = 0,
+    ) -> str:
+        """
+        Арендует первый свободный стенд пула, при занятости всех стендов ждёт освобождения.
+        :param start_index: с какого стенда начинать обход (разводит воркеров по разным стендам)
+        :return: имя арендованного стенда
+        """
+        if self._leased_stand:
+            return self._leased_stand
+        if not self._stand_pool:
+            raise StandLeaseError("[LEASE] [ERROR] Пул стендов пуст")
+
+        self._lease_dir.mkdir(parents=True, exist_ok=True)
+        deadline = time.monotonic() + timeout_s
+        offset = start_index % len(self._stand_pool)
+        ordered_pool = self._stand_pool[offset:] + self._stand_pool[:offset]
+
+        while True:
+            for stand_name in ordered_pool:
+                if self._try_lease(stand_name):
+                    self._leased_stand = stand_name
+                    self._start_heartbeat()
+                    logger.info(f"[LEASE] [OK] Стенд {stand_name} арендован владельцем {self._owner}")
+                    return stand_name
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise StandLeaseError(
+                    f"[LEASE] [ERROR] Нет свободных стендов в пуле {self._stand_pool} за {timeout_s:.0f} с"
+                )
+            logger.info(
+                f"[LEASE] Все стенды пула {self._stand_pool} заняты. "
+                f"Повтор через {poll_interval_s} с, осталось {remaining:.0f} с"
+            )
+            time.sleep(min(poll_interval_s, remaining))
+
+    def release(self) -> None:
+        """
+        Освобождает арендованный стенд. Может вызываться повторно.
+        """
+        if not self._leased_stand:
+            return
+        self._stop_heartbeat()
+        lease_path = self._get_lease_path(self._leased_stand)
+        try:
+            with self._lease_lock(self._leased_stand):
+                lease_info = self._read_lease(lease_path)
+                if lease_info and lease_info.get("owner_id") == self._owner_id():
+                    lease_path.unlink()
+                    logger.info(f"[LEASE] [OK] Стенд {self._leased_stand} освобождён")
+                else:
+                    logger.warning(
+                        f"[LEASE] [WARNING] Аренда стенда {self._leased_stand} перехвачена другим владельцем"
+                    )
+        except FileNotFoundError:
+            logger.warning(f"[LEASE] [WARNING] Файл аренды стенда {self._leased_stand} уже удалён")
+        except OSError:
+            logger.exception(f"[LEASE] [ERROR] Не удалось освободить стенд {self._leased_stand}")
+        finally:
+            self._leased_stand = None
+
+    def _try_lease(self, stand_name: str) -> bool:
+        """
+        Создаёт lock-файл стенда. Брошенную аренду (нет heartbeat, мёртвый pid, нечитаемый файл) перехватывает.
+        Проверка и перехват выполняются под блокировкой стенда, поэтому аренду, только что созданную
+        другим воркером, удалить нельзя.
+        """
+        lease_path = self._get_lease_path(stand_name)
+        with self._lease_lock(stand_name):
+            if lease_path.exists() and self._is_lease_stale(lease_path):
+                logger.warning(f"[LEASE] [WARNING] Найдена брошенная аренда стенда {stand_name}, перехватываем")
+                try:
+                    lease_path.unlink()
+                except FileNotFoundError:
+                    pass
+            try:
+                fd = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                return False
+            now = time.time()
+            lease_info = {
+                "stand": stand_name,
+                "owner": self._owner,
+                "owner_id": self._owner_id(),
+                "host": socket.gethostname(),
+                "pid": os.getpid(),
+                "leased_at": now,
+                "heartbeat_at": now,
+            }
+            with os.fdopen(fd, "w", encoding=Im_const.ENCODING_UTF_8) as lease_file:
+                json.dump(lease_info, lease_file, ensure_ascii=False)
+        return True
+
+    def _heartbeat(self) -> bool:
+        """
+        Обновляет heartbeat_at в файле аренды
+        :return: False - аренда больше не принадлежит этому владельцу
+        """
+        stand_name = self._leased_stand
+        if not stand_name:
+            return False
+        lease_path = self._get_lease_path(stand_name)
+        try:
+            with self._lease_lock(stand_name):
+                lease_info = self._read_lease(lease_path)
+                if not lease_info or lease_info.get("owner_id") != self._owner_id():
+                    logger.error(f"[LEASE] [ERROR] Аренда стенда {stand_name} перехвачена другим владельцем")
+                    return False
+                lease_info["heartbeat_at"] = time.time()
+                tmp_path = lease_path.with_name(f"{lease_path.name}.{os.getpid()}.tmp")
+                with tmp_path.open("w", encoding=Im_const.ENCODING_UTF_8) as lease_file:
+                    json.dump(lease_info, lease_file, ensure_ascii=False)
+                os.replace(tmp_path, lease_path)
+        except FileNotFoundError:
+            logger.error(f"[LEASE] [ERROR] Файл аренды стенда {stand_name} удалён")
+            return False
+        except OSError:
+            logger.exception(f"[LEASE] [ERROR] Не удалось обновить heartbeat аренды стенда {stand_name}")
+        return True
+
+    def _heartbeat_loop(self) -> None:
+        while not self._heartbeat_stop.wait(Lease_const.LEASE_HEARTBEAT_INTERVAL_S):
+            if not self._heartbeat():
+                return
+
+    def _start_heartbeat(self) -> None:
+        self._heartbeat_stop.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop, name=f"stand-lease-{self._owner}", daemon=True
+        )
+        self._heartbeat_thread.start()
+
+    def _stop_heartbeat(self) -> None:
+        self._heartbeat_stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
+
+    def _is_lease_stale(self, lease_path: Path) -> bool:
+        """
+        Аренда брошена, если файл не читается или владелец не обновлял heartbeat дольше TTL.
+        Владельца с этого же хоста вне Windows можно перехватить сразу, если его процесса уже нет
+        (на Windows os.kill(pid, 0) отправляет CTRL_C_EVENT, поэтому там только TTL).
+        Вызывается под блокировкой стенда, поэтому недописанного файла быть не может
+        """
+        try:
+            lease_info = self._read_lease(lease_path)
+        except FileNotFoundError:
+            return False
+        if not isinstance(lease_info, dict):
+            return True
+        try:
+            heartbeat_at = float(lease_info.get("heartbeat_at", lease_info.get("leased_at")))
+        except (TypeError, ValueError):
+            return True
+        if time.time() - heartbeat_at > Lease_const.LEASE_TTL_S:
+            return True
+        if os.name != Im_const.OS_NAME_WIN and lease_info.get("host") == socket.gethostname():
+            try:
+                os.kill(int(lease_info.get("pid")), 0)
+            except ProcessLookupError:
+                return True
+            except (OSError, TypeError, ValueError):
+                # Нет прав на процесс или pid не записан - решает heartbeat
+                return False
+        return False
+
+    @contextmanager
+    def _lease_lock(self, stand_name: str) -> Iterator[None]:
+        """
+        Эксклюзивная блокировка ОС на sidecar-файле стенда; снимается и при падении процесса
+        """
+        self._lease_dir.mkdir(parents=True, exist_ok=True)
+        lock_path = self._lease_dir / f"{stand_name}{Lease_const.LEASE_FILE_SUFFIX}{Lease_const.LEASE_LOCK_FILE_SUFFIX}"
+        with lock_path.open("a+b") as lock_file:
+            if os.name == Im_const.OS_NAME_WIN:
+                import msvcrt
+
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _read_lease(lease_path: Path) -> Optional[dict]:
+        try:
+            with lease_path.open("r", encoding=Im_const.ENCODING_UTF_8) as lease_file:
+                return json.load(lease_file)
+        except FileNotFoundError:
+            raise
+        except (OSError, ValueError):
+            # Файлы пишутся под блокировкой стенда, нечитаемый файл - повреждённая аренда
+            logger.debug(f"[LEASE] Не удалось прочитать файл аренды {lease_path}", exc_info=True)
+            return None
+
+    def _get_lease_path(self, stand_name: str) -> Path:
+        return self._lease_dir / f"{stand_name}{Lease_const.LEASE_FILE_SUFFIX}"
+
+    def _owner_id(self) -> str:
+        return f"{socket.gethostname()}:{os.getpid()}:{self._owner}"
+
+    @staticmethod
+    def _get_default_lease_dir() -> Path:
+        lease_dir = os.environ.get(Lease_const.LEASE_DIR_ENV_KEY)
+        if lease_dir:
+            return Path(lease_dir)
+        return Path(tempfile.gettempdir()) / Lease_const.LEASE_DIR_DEFAULT_NAME
+
+    @staticmethod
+    def _filter_stand_pool(stand_pool: List[str]) -> List[str]:
+        """
+        Оставляет только известные стенды того же окружения, что и STAND_NAME:
+        пути конфигурации (CONFIG_PATH) вычисляются один раз по STAND_NAME при импорте констант.
+        """
+        filtered_pool = []
+        for stand_name in stand_pool:
+            if stand_name not in Im_const.HOST_MAP:
+                logger.warning(f"[LEASE] [WARNING] Стенд {stand_name} отсутствует в HOST_MAP и исключён из пула")
+                continue
+            if stand_name[:-1] != Im_const.STAND_ENV_NAMING:
+                logger.warning(
+                    f"[LEASE] [WARNING] Стенд {stand_name} не относится к окружению "
+                    f"{Im_const.STAND_ENV_NAMING} (STAND_NAME) и исключён из пула"
+                )
+                continue
+            filtered_pool.append(stand_name)
+        return filtered_pool
@@ -1,9 +1,10 @@
 import logging
 import os
+from datetime import datetime
 from urllib.parse import urlparse
 
 from clients.subprocess_client import SubprocessClient
-from constants.architecture_constants import EnvKeyConstants
+from constants.architecture_constants import DockerConstants, EnvKeyConstants
 from constants.architecture_constants import ImitatorConstants as Im_const
 from constants.enums import TU, MeasureConversionRule
 from infra.clickhouse_manager import ClickHouseManager
@@ -57,13 +58,23 @@ class StandSetupManager:
         self._cmd_generator = self._choose_cmd_generator()
         self._final_cmd = self._cmd_generator.generate_final_imitator_cmd()
         # Экземпляр имитатор менеджера нужно создавать после генерации команды, отдельно от других клиентов
-        self._imitator_manager = ImitatorManager(self._stand_client, self._final_cmd)
+        self._imitator_manager = ImitatorManager(self._stand_client, self._final_cmd, self._data_path)
         self._remote_data_uploaded = False
+        # Возобновление прогона (--resume): имитатор запущен прошлым прогоном, локального процесса нет
+        self._imitator_attached = False
+        self._attached_start_time: datetime | None = None
 
     @property
     def remote_data_uploaded(self) -> bool:
         return self._remote_data_uploaded
 
+    @property
+    def remote_data_path(self) -> str:
+        """
+        Путь к данным имитатора на удаленном сервере
+        """
+        return self._data_path
+
     @property
     def start_time(self):
         """
@@ -72,24 +83,88 @@ class StandSetupManager:
         - leak_start_time = start_time + LEAK_START_INTERVAL
         - leak_end_time = start_time + LEAK_START_INTERVAL + ALLOWED_TIME_DIFF_SECONDS
         """
+        if self._attached_start_time is not None:
+            return self._attached_start_time
         return self._cmd_generator.start_time
 
-    def setup_stand_for_imitator_run(self) -> None:
+    def is_imitator_running(self) -> bool:
         """
-        Обертка, в которой проходит полная подготовка стенда
+        Проверяет, запущен ли имитатор на стенде
+        """
+        return self._imitator_manager.is_remote_imitator_running()
+
+    @property
+    def duration_m(self) -> float:
+        return self._duration_m
+
+    def get_imitator_exit_code(self) -> int | None:
+        """
+        Код завершения процесса имитатора.
+        None - имитатор работает или запущен не этим процессом pytest (--resume)
+        """
+        imitator_process = self._imitator_manager.imitator_process
+        return imitator_process.poll() if imitator_process is not None else None
+
+    def get_not_running_core_containers(self, timeout: int = None) -> list[str]:
+        """
+        Контейнеры core, которые не в статусе running. Пустой вывод docker inspect (сбой ssh) не считается падением
+        """
+        statuses = self._docker_manager.get_containers_status(DockerConstants.CORE_CONTAINERS_GROUP, timeout=timeout)
+        if not statuses:
+            return []
+        return [
+            container
+            for container in DockerConstants.CORE_CONTAINERS_GROUP
+            if statuses.get(container) != DockerConstants.RUNNING_STATUS
+        ]
+
+    def attach_to_running_imitator(self, remote_data_path: str, start_time: datetime) -> None:
+        """
+        Подключается к имитатору, запущенному прошлым (упавшим) прогоном, вместо полной подготовки стенда:
+        данные уже загружены, контейнеры и имитатор работают
         """
         try:
-            self._uploader.upload_with_confirm()
+            # Поиск процесса имитатора переключается первым: проверка и остановка видят имитатор прошлого прогона
+            self._imitator_manager.set_data_path(remote_data_path)
+            self._imitator_attached = True
+            self._attached_start_time = start_time
+            self._uploader.attach_remote_data_dir(remote_data_path)
+            self._data_path = remote_data_path
             self._remote_data_uploaded = True
+            self._clickhouse_manager.copy_configuration_file_from_stand()
+            logger.info(f"[SETUP] [OK] Подключение к запущенному имитатору, данные: {remote_data_path}")
+        except Exception as error:
+            error_msg = "[SETUP] [ERROR] Не удалось подключиться к запущенному имитатору"
+            logger.exception(error_msg)
+            raise RuntimeError(error_msg) from error
+
+    def detach_from_imitator(self, remote_data_path: str) -> None:
+        """
+        Отменяет подключение к имитатору прошлого прогона (--resume не удался):
+        останавливает его, чтобы полный setup не запустил второй имитатор рядом,
+        и возвращает пути данных текущего прогона
+        :param remote_data_path: данные имитатора прошлого прогона из checkpoint
+        """
+        self._imitator_manager.set_data_path(remote_data_path)
+        try:
+            self._imitator_manager.stop_remote_imitator()
+        finally:
+            self._imitator_attached = False
+            self._attached_start_time = None
+            self._remote_data_uploaded = False
+            self._uploader.detach_remote_data_dir()
+            self._data_path = self._uploader.remote_temp_dir_path
+            self._imitator_manager.set_data_path(self._data_path)
+        logger.info(f"[SETUP] [OK] Имитатор прошлого прогона остановлен, данные: {remote_data_path}")
 
+    def setup_stand_for_imitator_run(self) -> None:
+        """
+        Обертка, в которой проходит полная подготовка стенда
+        """
+        try:
+            self.upload_test_data()
             self.stop_all_containers()
-            if self._signal_unit_conversion_manager is not None:
-                self._signal_unit_conversion_manager.setup_signal_unit_conversion_rules()
-            else:
-                logger.info(
-                    "[SETUP] [SKIP] measure_conversion_rules не задан в конфигурации набора данных - "
-                    "проверка и настройка единиц измерения (signal_unit_conversion_rules.json) не выполняется"
-                )
+            self.setup_signal_unit_conversion_rules()
             self.clean_redis_and_clickhouse()
             self.start_containers_without_core()
         except Exception as error:
@@ -97,6 +172,25 @@ class StandSetupManager:
             logger.exception(error_msg)
             raise RuntimeError(error_msg) from error
 
+    def upload_test_data(self) -> None:
+        """
+        Загружает набор данных имитатора на стенд
+        """
+        self._uploader.upload_with_confirm()
+        self._remote_data_uploaded = True
+
+    def setup_signal_unit_conversion_rules(self) -> None:
+        """
+        Настраивает единицы измерения сигналов (signal_unit_conversion_rules.json), если они заданы в наборе
+        """
+        if self._signal_unit_conversion_manager is not None:
+            self._signal_unit_conversion_manager.setup_signal_unit_conversion_rules()
+        else:
+            logger.info(
+                "[SETUP] [SKIP] measure_conversion_rules не задан в конфигурации набора данных - "
+                "проверка и настройка единиц измерения (signal_unit_conversion_rules.json) не выполняется"
+            )
+
     def restore_signal_unit_conversion_rules(self) -> None:
         """
         Возвращает оригинальный signal_unit_conversion_rules.json на стенд.
@@ -109,11 +203,22 @@ class StandSetupManager:
         """
         Чистит БД: Clickhouse и Redis
         """
-        # Копирование файла конфигурации на runner
-        self._clickhouse_manager.copy_configuration_file_from_stand()
         # Чистка ключей Redis
-        self._redis_cleaner.delete_keys_with_check()
+        self.clean_redis()
         # Чистка ключей ClickHouse
+        self.clean_clickhouse()
+
+    def clean_redis(self) -> None:
+        """
+        Чистит ключи Redis стенда
+        """
+        self._redis_cleaner.delete_keys_with_check()
+
+    def clean_clickhouse(self) -> None:
+        """
+        Чистит ClickHouse по датчикам ТУ набора данных (файл конфигурации ТУ копируется на runner)
+        """
+        self._clickhouse_manager.copy_configuration_file_from_stand()
         self._clickhouse_manager.delete_clickhouse_keys_with_check()
 
     def get_sensor_ids_by_address(self) -> dict[str, int]:
@@ -174,6 +279,11 @@ class StandSetupManager:
         """
         try:
             if not self._imitator_manager.imitator_process:
+                if self._imitator_attached:
+                    self._imitator_manager.stop_remote_imitator()
+                    self._imitator_attached = False
+                    logger.info("[TEARDOWN] [OK] Имитатор прошлого прогона остановлен")
+                    return
                 logger.info("[TEARDOWN] [SKIP] Имитатор не был запущен")
                 return
             self._imitator_manager.stop_imitator()
@@ -0,0 +1,163 @@
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+from infra.stand_setup_manager import StandSetupManager
+
+logger = logging.getLogger(__name__)
+
+
+class SuitePackSetupManager:
+    """
+    Подготовка стенда к одновременному прогону нескольких совместимых наборов данных (пакета).
+    Повторяет интерфейс StandSetupManager, поэтому conftest работает с пакетом как с одним набором:
+    контейнеры останавливаются/запускаются и Redis чистится один раз на пакет,
+    данные загружаются, ClickHouse чистится и имитатор запускается для каждого набора (ТУ) отдельно.
+    Пример использования:
+    pack_manager = SuitePackSetupManager({"select_3": manager_3, "select_4": manager_4})
+    pack_manager.setup_stand_for_imitator_run()
+    imitator_thread = threading.Thread(target=pack_manager.start_imitator, daemon=True)
+    core_thread = threading.Thread(target=pack_manager.start_core)
+    start_times = pack_manager.start_times  # время старта имитатора по наборам
+    """
+
+    def __init__(self, managers: Dict[str, StandSetupManager]) -> None:
+        if not managers:
+            raise ValueError("[SETUP] [ERROR] Пакет наборов данных пуст")
+        self._managers = managers
+        # Операции уровня стенда выполняются через первый менеджер пакета
+        self._lead_manager = next(iter(managers.values()))
+
+    @property
+    def managers(self) -> Dict[str, StandSetupManager]:
+        return self._managers
+
+    @property
+    def start_time(self) -> datetime:
+        """
+        Время старта имитатора первого набора пакета (совместимость с StandSetupManager)
+        """
+        return self._lead_manager.start_time
+
+    @property
+    def start_times(self) -> Dict[str, datetime]:
+        """
+        Время старта имитатора по именам наборов данных
+        """
+        return {suite_name: manager.start_time for suite_name, manager in self._managers.items()}
+
+    @property
+    def remote_data_paths(self) -> Dict[str, str]:
+        return {suite_name: manager.remote_data_path for suite_name, manager in self._managers.items()}
+
+    def is_imitator_running(self) -> bool:
+        """
+        Проверяет, что на стенде запущены имитаторы всех наборов пакета
+        """
+        return all(manager.is_imitator_running() for manager in self._managers.values())
+
+    def attach_to_running_imitators(self, remote_data_paths: Dict[str, str], start_times: Dict[str, datetime]) -> None:
+        """
+        Подключается к имитаторам пакета, запущенным прошлым (упавшим) прогоном
+        """
+        for suite_name, manager in self._managers.items():
+            manager.attach_to_running_imitator(remote_data_paths[suite_name], start_times[suite_name])
+
+    def detach_from_imitators(self, remote_data_paths: Dict[str, str]) -> None:
+        """
+        Останавливает имитаторы пакета прошлого прогона (--resume не удался), в том числе не подключённые
+        """
+        errors = []
+        for suite_name, manager in self._managers.items():
+            try:
+                manager.detach_from_imitator(remote_data_paths[suite_name])
+            except Exception as error:
+                errors.append(f"{suite_name}: {error}")
+        if errors:
+            raise RuntimeError(f"[SETUP] [ERROR] Имитаторы прошлого прогона не остановлены: {'; '.join(errors)}")
+
+    @property
+    def duration_m(self) -> float:
+        return max(manager.duration_m for manager in self._managers.values())
+
+    def get_imitator_exit_code(self) -> int | None:
+        """
+        Код завершения первого завершившегося имитатора пакета
+        """
+        return next(
+            (code for manager in self._managers.values() if (code := manager.get_imitator_exit_code()) is not None),
+            None,
+        )
+
+    def get_not_running_core_containers(self, timeout: int = None) -> List[str]:
+        return self._lead_manager.get_not_running_core_containers(timeout=timeout)
+
+    def check_opc_server_status(self) -> None:
+        self._lead_manager.check_opc_server_status()
+
+    def setup_stand_for_imitator_run(self) -> None:
+        """
+        Подготовка стенда для всего пакета
+        """
+        try:
+            for suite_name, manager in self._managers.items():
+                logger.info(f"[SETUP] [PACK] Загрузка данных набора {suite_name}")
+                manager.upload_test_data()
+            self._lead_manager.stop_all_containers()
+            # Наборы пакета совместимы по measure_conversion_rules - правила настраиваются один раз
+            self._lead_manager.setup_signal_unit_conversion_rules()
+            self._lead_manager.clean_redis()
+            for manager in self._managers.values():
+                manager.clean_clickhouse()
+            self._lead_manager.start_containers_without_core()
+        except Exception as error:
+            error_msg = "[SETUP] [ERROR] Ошибка подготовки стенда к запуску пакета наборов данных"
+            logger.exception(error_msg)
+            raise RuntimeError(error_msg) from error
+
+    def start_imitator(self) -> None:
+        """
+        Запускает имитаторы всех наборов пакета, каждый в своём потоке (логи stdout пишутся до остановки)
+        """
+        imitator_threads: List[threading.Thread] = [
+            threading.Thread(target=manager.start_imitator, name=f"imitator->{suite_name}", daemon=True)
+            for suite_name, manager in self._managers.items()
+        ]
+        for imitator_thread in imitator_threads:
+            imitator_thread.start()
+        for imitator_thread in imitator_threads:
+            imitator_thread.join()
+
+    def start_core(self) -> None:
+        self._lead_manager.start_core()
+
+    def get_sensor_ids_by_address(self) -> dict[str, int]:
+        """
+        Объединённый словарь address: id по конфигурациям всех ТУ пакета
+        """
+        sensor_ids_by_address: dict[str, int] = {}
+        for manager in self._managers.values():
+            sensor_ids_by_address.update(manager.get_sensor_ids_by_address())
+        return sensor_ids_by_address
+
+    def stop_imitator_wrapper(self) -> None:
+        """
+        Останавливает имитаторы всех наборов пакета. Ошибка одного не мешает остановке остальных
+        """
+        errors = []
+        for suite_name, manager in self._managers.items():
+            try:
+                manager.stop_imitator_wrapper()
+            except RuntimeError as error:
+                logger.error(f"[TEARDOWN] [ERROR] Имитатор набора {suite_name} не остановлен: {error}")
+                errors.append(error)
+        if errors:
+            raise RuntimeError("[TEARDOWN] [ERROR] Не удалось остановить имитаторы пакета") from errors[0]
+
+    def restore_signal_unit_conversion_rules(self) -> None:
+        self._lead_manager.restore_signal_unit_conversion_rules()
+
+    def server_test_data_remover(self) -> None:
+        for manager in self._managers.values():
+            manager.server_test_data_remover()
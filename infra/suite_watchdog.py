@@ -0,0 +1,127 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from constants.architecture_constants import ImitatorConstants as Im_const
+from constants.architecture_constants import SuiteWatchdogConstants as WD_const
+from constants.test_constants import BaseTN3Constants
+
+logger = logging.getLogger(__name__)
+
+
+class SuiteWatchdog:
+    """
+    Фоновый контроль сессии стенда во время прогона набора (пакета наборов).
+    Останавливает набор, если:
+    - имитатор завершился раньше --stopTime;
+    - контейнеры core не в статусе running;
+    - открытый WS-клиент (соединение или сессия пула) после своих вызовов долго не получает сообщений с данными.
+    После остановки оставшиеся тесты набора падают сразу, без ожидания offset и таймаутов сообщений.
+    Пример использования:
+    watchdog = SuiteWatchdog(stand_manager, suite_start_time, WebSocketClient.get_data_idle_s)
+    watchdog.start()
+    if watchdog.wait_abort(to_wait):  # вместо time.sleep до offset
+        pytest.fail(watchdog.abort_reason)
+    watchdog.stop()
+    """
+
+    def __init__(
+        self,
+        stand_manager,
+        suite_start_time: float,
+        ws_idle_fn: Optional[Callable[[], Optional[float]]] = None,
+        check_interval_s: float = WD_const.CHECK_INTERVAL_S,
+        ws_stale_timeout_s: float = WD_const.WS_STALE_TIMEOUT_S,
+        failure_confirmations: int = WD_const.FAILURE_CONFIRMATIONS,
+    ) -> None:
+        """
+        :param stand_manager: StandSetupManager или SuitePackSetupManager
+        :param suite_start_time: time.monotonic() старта core
+        :param ws_idle_fn: наибольший простой открытых WS-клиентов в секундах (None - данных никто не ждёт)
+        """
+        self._stand_manager = stand_manager
+        self._ws_idle_fn = ws_idle_fn
+        self._check_interval_s = check_interval_s
+        self._ws_stale_timeout_s = ws_stale_timeout_s
+        self._failure_confirmations = failure_confirmations
+        # Имитатор стартует за CORE_START_DELAY_S до core и работает duration_m минут
+        self._imitator_stop_at = (
+            suite_start_time
+            - Im_const.CORE_START_DELAY_S
+            + stand_manager.duration_m * BaseTN3Constants.SEC_PER_MIN
+            - WD_const.IMITATOR_STOP_GRACE_S
+        )
+        self._abort_reason: Optional[str] = None
+        self._aborted = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failures: dict[str, int] = {}
+
+    @property
+    def abort_reason(self) -> Optional[str]:
+        return self._abort_reason
+
+    @property
+    def is_aborted(self) -> bool:
+        return self._aborted.is_set()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="suite-watchdog", daemon=True)
+        self._thread.start()
+        logger.info("[WATCHDOG] Контроль имитатора, core и WS запущен")
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self._check_interval_s)
+            self._thread = None
+
+    def wait_abort(self, timeout_s: float) -> bool:
+        """
+        Ожидание (вместо time.sleep), прерываемое остановкой набора
+        :return: True, если набор остановлен
+        """
+        return self._aborted.wait(timeout_s)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._check_interval_s):
+            try:
+                reason = self._check()
+            except Exception:
+                logger.exception("[WATCHDOG] [ERROR] Ошибка проверки стенда")
+                continue
+            if reason:
+                self._abort_reason = f"[WATCHDOG] Набор остановлен: {reason}"
+                logger.error(self._abort_reason)
+                self._aborted.set()
+                return
+
+    def _check(self) -> Optional[str]:
+        """
+        :return: причина остановки набора, если условие подтвердилось failure_confirmations проверок подряд
+        """
+        exit_code = self._stand_manager.get_imitator_exit_code()
+        imitator_failed = exit_code is not None and time.monotonic() < self._imitator_stop_at
+        if self._confirm("imitator", imitator_failed):
+            return f"имитатор завершился раньше --stopTime (код {exit_code})"
+
+        containers = self._stand_manager.get_not_running_core_containers(timeout=WD_const.CHECK_CMD_TIMEOUT_S)
+        if self._confirm("core", bool(containers)):
+            return f"контейнеры core не в статусе running: {', '.join(containers)}"
+
+        ws_idle_s = self._ws_idle_fn() if self._ws_idle_fn else None
+        if self._confirm("ws", ws_idle_s is not None and ws_idle_s > self._ws_stale_timeout_s):
+            return f"нет сообщений с данными по WS {ws_idle_s:.0f} с"
+        return None
+
+    def _confirm(self, check_name: str, failed: bool) -> bool:
+        if not failed:
+            self._failures[check_name] = 0
+            return False
+        self._failures[check_name] = self._failures.get(check_name, 0) + 1
+        logger.warning(
+            f"[WATCHDOG] [WARNING] Проверка {check_name} не пройдена "
+            f"({self._failures[check_name]}/{self._failure_confirmations})"
+        )
+        return self._failures[check_name] >= self._failure_confirmations
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import msgpack
+import websockets
+
+from constants.architecture_constants import WebSocketClientConstants as WS_Const
+from constants.architecture_constants import WsBenchmarkConstants as Bench_Const
+from constants.enums import ReplyStatus
+from utils.msgpack_utils.msgpack_utils import SignalRFrameDecoder, encode_with_varint_prefix
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SyntheticStream:
+    """Поток push-сообщений эмулятора: тип контента, сообщений в секунду, элементов в сообщении"""
+
+    content_type: str
+    rate_per_s: float
+    items: int
+
+    @classmethod
+    def parse(cls, spec: str) -> "SyntheticStream":
+        """
+        :param spec: "CommonSchemeContent:20:200"
+        """
+        content_type, rate_per_s, items = spec.split(":")
+        return cls(content_type=content_type, rate_per_s=float(rate_per_s), items=int(items))
+
+
+def _common_scheme_content(tu_id: int, items: int) -> Dict[str, Any]:
+    diagnostic_areas = [
+        {
+            "id": index,
+            "ldsStatus": random.randint(0, 3),
+            "stationaryStatus": random.randint(0, 2),
+            "stationaryStatusReasons": [],
+            "isMasked": False,
+        }
+        for index in range(items)
+    ]
+    return {"tuId": tu_id, "flowAreas": [{"id": 1, "diagnosticAreas": diagnostic_areas}]}
+
+
+def _input_signals_content(tu_id: int, items: int) -> Dict[str, Any]:
+    signals = [
+        {
+            "id": index,
+            "value": random.uniform(0.0, 100.0),
+            "quality": 192,
+            "isImitated": False,
+            "timestamp": msgpack.Timestamp.from_unix(time.time()),
+        }
+        for index in range(items)
+    ]
+    return {"tuId": tu_id, "inputSignals": signals}
+
+
+def _leaks_content(tu_id: int, items: int) -> Dict[str, Any]:
+    leaks = [
+        {
+            "id": index,
+            "leakStatus": 1,
+            "coordinate": random.uniform(0.0, 200_000.0),
+            "volume": random.uniform(0.0, 10.0),
+            "detectedAt": msgpack.Timestamp.from_unix(time.time()),
+        }
+        for index in range(items)
+    ]
+    return {"tuId": tu_id, "leaks": leaks}
+
+
+def _balance_algorithm_results_content(tu_id: int, items: int) -> Dict[str, Any]:
+    diagnostic_areas = [
+        {
+            "id": index,
+            "name": f"ДУ {index}",
+            "debalance": random.uniform(-1.0, 1.0),
+            "isLeakPossible": False,
+            "isLeakDetected": False,
+            "timeToLeakDetection": 0,
+            "status": random.randint(0, 3),
+            "statusReason": 0,
+            "timeToInitialize": 0,
+        }
+        for index in range(items)
+    ]
+    return {"tuId": tu_id, "flowAreas": [{"id": "1", "isFlowAvailable": True, "diagnosticAreas": diagnostic_areas}]}
+
+
+# Тип контента -> генератор replyContent. Остальные типы получают список однотипных элементов
+CONTENT_BUILDERS: Dict[str, Callable[[int, int], Dict[str, Any]]] = {
+    "BalanceAlgorithmResultsContent": _balance_algorithm_results_content,
+    "CommonSchemeContent": _common_scheme_content,
+    "InputSignalsContent": _input_signals_content,
+    "LeaksContent": _leaks_content,
+}
+
+
+class WsHubEmulator:
+    """
+    Локальная замена api-gateway для замеров приёма: SignalR handshake, varint-фреймы messagepack,
+    push-сообщения синтетических потоков с заданной частотой и размером, Completion на каждый вызов.
+    Сообщения, которые к моменту отправки накопились по расписанию потока, уходят одним фреймом.
+    В заголовках каждого push - время отправки (time.perf_counter) для замера задержки в том же процессе.
+    Пример использования:
+    async with WsHubEmulator([SyntheticStream("CommonSchemeContent", 20, 200)]) as hub:
+        async with WebSocketClient(hub.host, "", "", scheme="ws") as ws_client:
+            ...
+    """
+
+    def __init__(
+        self,
+        streams: List[SyntheticStream],
+        host: str = Bench_Const.HOST,
+        port: int = 0,
+        tu_id: int = Bench_Const.TU_ID,
+    ) -> None:
+        self._streams = streams
+        self._bind_host = host
+        self._port = port
+        self._tu_id = tu_id
+        self._server: Optional[websockets.Server] = None
+        self.messages_sent = 0
+        self.bytes_sent = 0
+
+    @property
+    def host(self) -> str:
+        """host:port для WebSocketClient"""
+        return f"{self._bind_host}:{self._port}"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def start(self) -> None:
+        self._server = await websockets.serve(self._handle_connection, self._bind_host, self._port)
+        self._port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"[HUB EMULATOR] Запущен на ws://{self.host}{WS_Const.WS_HUBS}")
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+        logger.info(f"[HUB EMULATOR] Остановлен, отправлено сообщений: {self.messages_sent}")
+
+    async def _handle_connection(self, connection) -> None:
+        await self._handshake(connection)
+        tasks = [asyncio.create_task(self._push_stream(connection, stream)) for stream in self._streams]
+        decoder = SignalRFrameDecoder()
+        try:
+            async for chunk in connection:
+                for message in decoder.feed_lazy(chunk if isinstance(chunk, bytes) else chunk.encode()):
+                    if message.kind == WS_Const.DEFAULT_SIGNALR_MESSAGE_TYPE and message.invocation_id is not None:
+                        await self._send(connection, [self._completion(message.invocation_id)])
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def _handshake(connection) -> None:
+        request = await connection.recv()
+        if isinstance(request, str):
+            request = request.encode()
+        if WS_Const.RS not in request:
+            raise ValueError(f"Некорректный handshake: {request!r}")
+        await connection.send(Bench_Const.HANDSHAKE_REPLY)
+
+    async def _push_stream(self, connection, stream: SyntheticStream) -> None:
+        """
+        Отправляет сообщения потока по расписанию rate_per_s; отставшие сообщения уходят пачкой в одном фрейме
+        """
+        build_content = CONTENT_BUILDERS.get(stream.content_type, self._generic_content)
+        started_at = time.perf_counter()
+        sent = 0
+        interval = 1.0 / stream.rate_per_s
+        while True:
+            due = int((time.perf_counter() - started_at) * stream.rate_per_s) + 1 - sent
+            if due > 0:
+                messages = [
+                    self._invocation(stream.content_type, build_content(self._tu_id, stream.items)) for _ in range(due)
+                ]
+                await self._send(connection, messages)
+                sent += due
+            await asyncio.sleep(max(0.0, started_at + sent * interval - time.perf_counter()))
+
+    async def _send(self, connection, messages: List[list]) -> None:
+        frame = b"".join(encode_with_varint_prefix(msgpack.packb(message, use_bin_type=True)) for message in messages)
+        await connection.send(frame)
+        self.messages_sent += len(messages)
+        self.bytes_sent += len(frame)
+
+    @staticmethod
+    def _invocation(content_type: str, reply_content: Dict[str, Any]) -> list:
+        payload = {"replyStatus": ReplyStatus.OK.value, "replyErrors": None, "replyContent": reply_content}
+        headers = {Bench_Const.SENT_AT_HEADER: repr(time.perf_counter())}
+        return [WS_Const.DEFAULT_SIGNALR_MESSAGE_TYPE, headers, None, content_type, [payload]]
+
+    @staticmethod
+    def _completion(invocation_id: Any) -> list:
+        payload = {"replyStatus": ReplyStatus.OK.value, "replyErrors": None, "replyContent": None}
+        return [WS_Const.COMPLETION_MESSAGE_TYPE, {}, invocation_id, Bench_Const.COMPLETION_RESULT_KIND, payload]
+
+    @staticmethod
+    def _generic_content(tu_id: int, items: int) -> Dict[str, Any]:
+        return {"tuId": tu_id, "items": [{"id": index, "value": random.random()} for index in range(items)]}
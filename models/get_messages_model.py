@@ -114,7 +114,7 @@ class GetMessagesRequest:
     additionalProperties: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MessagesInfo:
     """Информация о сообщении."""
 
@@ -167,7 +167,7 @@ class PeriodTime:
     additionalProperties: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MessagesContent:
     """Ответ на запрос getMessagesRequest"""
 
@@ -6,7 +6,7 @@ from typing import List, Optional
 from constants.enums import ReplyStatus
 
 
-@dataclass
+@dataclass(slots=True)
 class BalanceAlgorithmDiagnosticArea:
     """
     Результаты работы алгоритма баланса для одного диагностического участка
@@ -23,7 +23,7 @@ class BalanceAlgorithmDiagnosticArea:
     timeToInitialize: int
 
 
-@dataclass
+@dataclass(slots=True)
 class BalanceAlgorithmFlowArea:
     """
     Результаты работы алгоритма баланса для одной flowArea
@@ -34,7 +34,7 @@ class BalanceAlgorithmFlowArea:
     diagnosticAreas: List[BalanceAlgorithmDiagnosticArea]
 
 
-@dataclass
+@dataclass(slots=True)
 class BalanceAlgorithmResultsContent:
     """
     Содержимое BalanceAlgorithmResultsContent
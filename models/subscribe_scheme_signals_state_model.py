@@ -4,12 +4,12 @@ from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class SignalRejection:
     criteriaNames: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class SignalState:
     """Данные о состоянии сигнала на схеме."""
 
@@ -25,13 +25,13 @@ class SignalState:
     imitation: Optional[Any] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ToState:
     id: int = 0
     isInWork: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class SchemeSignalsStateContent:
     tuId: int = 0
     signalsStates: List[SignalState] = field(default_factory=list)
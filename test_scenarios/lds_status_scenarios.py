@@ -5,18 +5,19 @@
 Pytest маркеры и allure декораторы применяются в тестовых файлах.
 """
 
-import time
+import asyncio
 from datetime import datetime
 
 import allure
 
-from constants.architecture_constants import HTTPClientConstants as HttpConst
-from constants.enums import Direction, LdsStatus, MessageType, ReplyStatus, StationaryStatus
+from constants.enums import LdsStatus, MessageType, ReplyStatus, StationaryStatus
 from constants.test_constants import BaseTN3Constants as TestConst
-from models.get_messages_model import Filtering, FilteringObjects, Pagination
+from models.get_messages_model import Filtering, FilteringObjects
 from test_config.models_for_tests import CaseData, LDSStatusConfig, SmokeSuiteConfig
 from utils.helpers import ws_test_utils as t_utils
 from utils.helpers.asserts import SoftAssertions, StepCheck
+from utils.helpers.journal_pager import JournalPager
+from utils.helpers.journal_store import JournalStore
 from utils.helpers.ws_message_parser import ws_message_parser as parser
 
 
@@ -32,6 +33,7 @@ async def lds_status_check_on_longest_flow_area(ws_client, cfg: LDSStatusConfig,
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
     with allure.step("Извлечение и подготовка данных для проверки"):
@@ -71,6 +73,7 @@ async def lds_status_check_with_reasons(ws_client, cfg: SmokeSuiteConfig | LDSSt
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
     with allure.step("Извлечение и подготовка данных для проверки"):
@@ -107,6 +110,7 @@ async def lds_status_check_with_2_reasons(ws_client, cfg: SmokeSuiteConfig | LDS
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
     with allure.step("Извлечение и подготовка данных для проверки"):
@@ -150,6 +154,7 @@ async def lds_status_check_on_multiple_diagnostic_areas(
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
 
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
@@ -191,6 +196,7 @@ async def lds_and_stationary_status_check_with_reasons(
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
     with allure.step("Извлечение и подготовка данных для проверки"):
@@ -248,7 +254,7 @@ async def lds_status_check_degradation_pig_sensor_passage(
         )
         parsed_payload = parser.parse_launch_pig_msg(payload)
         launch_pig_reply_status = parsed_payload.replyStatus
-        time.sleep(cfg.basic_message_timeout)
+        await asyncio.sleep(cfg.basic_message_timeout)
 
     with allure.step("Подключение по ws, получение и обработка сообщения типа: CommonSchemeContent"):
         payload = await t_utils.connect_and_subscribe_msg(
@@ -256,6 +262,7 @@ async def lds_status_check_degradation_pig_sensor_passage(
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
     with allure.step("Извлечение и подготовка данных для проверки"):
@@ -294,34 +301,25 @@ def lds_status_in_journal(http_client, cfg: LDSStatusConfig, test_data: CaseData
     with allure.step("Http запрос сообщений журнала с фильтром messageTypes=MASKING_LDS"):
         end_time = datetime.now()
         start_time = t_utils.datetime_minus_seconds(end_time, TestConst.JOURNAL_STATUS_TOTAL_WAIT)
-        request_body = t_utils.create_journal_req_body(
-            pagination=Pagination(limit=TestConst.JOURNAL_PAGINATION_STATUS_LIMIT, direction=Direction.FIRST.value),
+        # Страницы журнала читаются до сообщений старше start_time, следующая страница запрашивается заранее
+        journal_pager = JournalPager(
+            http_client,
             filtering=Filtering(messageTypes=int(MessageType.LDS_STATUS), objects=FilteringObjects(tuId=cfg.tu_id)),
+            page_limit=TestConst.JOURNAL_PAGINATION_STATUS_LIMIT,
         )
-        response = http_client.post_request(HttpConst.GET_MESSAGES_URL_PATH, request_body)
-        payload = t_utils.get_json_from_http_response(response)
-        parsed_payload = parser.parse_journal_msg(payload)
+        messages_info = journal_pager.collect(not_before=t_utils.localize_as_moscow(start_time))
 
     with allure.step("Извлечение и подготовка данных для проверки"):
-        messages_info = getattr(parsed_payload.replyContent, 'messagesInfo', [])
         StepCheck("Проверка наличия сообщений в журнале", "messagesInfo").actual(messages_info).is_not_empty()
 
     with allure.step("Фильтрация сообщений по времени и controlPoint"):
         filter_start_msk = t_utils.localize_as_moscow(start_time)
         filter_end_msk = t_utils.localize_as_moscow(end_time)
         lds_msg_by_control_points = []
-        time_filtered = [
-            msg
-            for msg in messages_info
-            if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-        ]
-        time_filtered.sort(key=lambda msg: t_utils.ensure_moscow_timezone(msg.time), reverse=True)
-        # Поиск нужных сообщений по КП
+        journal = JournalStore.of(messages_info)
+        # Поиск последних сообщений по КП
         for control_point in control_points:
-            lds_msg = next(
-                (msg for msg in time_filtered if msg.controlPoint == control_point),
-                None,
-            )
+            lds_msg = journal.latest(filter_start_msk, filter_end_msk, control_point=control_point)
             if lds_msg:
                 lds_msg_by_control_points.append(lds_msg)
         StepCheck(
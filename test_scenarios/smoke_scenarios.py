@@ -6,7 +6,7 @@ pytest маркеров.
 Pytest маркеры и allure декораторы применяются в тестовых файлах.
 """
 
-import time
+import asyncio
 from collections import defaultdict
 from datetime import datetime, timedelta
 
@@ -51,6 +51,7 @@ from utils.helpers import mt_mode_report_xlsx_utils as mt_report_utils
 from utils.helpers import report_xlsx_utils as report_utils
 from utils.helpers import ws_test_utils as t_utils
 from utils.helpers.asserts import SoftAssertions, StepCheck
+from utils.helpers.journal_store import JournalStore
 from utils.helpers.ws_message_parser import ws_message_parser as parser
 
 
@@ -124,6 +125,7 @@ async def lds_status_initialization(ws_client, cfg: SmokeSuiteConfig):
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
     with allure.step("Извлечение и подготовка данных для проверки"):
@@ -421,20 +423,14 @@ def lds_status_init_in_journal(http_client, cfg: SmokeSuiteConfig | LDSStatusCon
         filter_start_msk = t_utils.localize_as_moscow(imitator_start_time)
         filter_end_msk = t_utils.localize_as_moscow(end_time)
 
-        time_filtered = [
-            msg
-            for msg in messages_info
-            if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-        ]
-        time_filtered.sort(key=lambda msg: t_utils.ensure_moscow_timezone(msg.time), reverse=True)
-
-        lds_msg = next(
-            (
-                msg
-                for msg in time_filtered
-                if msg.technologicalSection == cfg.tu_name and msg.event == TestConst.JOURNAL_EVENT_LDS_INIT_COLD_START
-            ),
-            None,
+        journal = JournalStore.of(messages_info)
+        time_filtered = journal.range(filter_start_msk, filter_end_msk)
+
+        lds_msg = journal.latest(
+            filter_start_msk,
+            filter_end_msk,
+            technological_section=cfg.tu_name,
+            event=TestConst.JOURNAL_EVENT_LDS_INIT_COLD_START,
         )
 
         allure.attach(
@@ -496,6 +492,7 @@ async def main_page_info(ws_client, cfg: SmokeSuiteConfig):
             "MainPageInfoContent",
             "subscribeMainPageInfoRequest",
             {'tuIds': [cfg.tu_id], 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_main_page_msg(payload)
     with allure.step("Извлечение и подготовка данных для проверки"):
@@ -577,6 +574,7 @@ async def main_page_info_unstationary(ws_client, cfg: SmokeSuiteConfig):
             "MainPageInfoContent",
             "subscribeMainPageInfoRequest",
             {'tuIds': [cfg.tu_id], 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_main_page_msg(payload)
     with allure.step("Извлечение и подготовка данных для проверки"):
@@ -608,6 +606,7 @@ async def leak_is_confirm_on_main_page(ws_client, cfg: SmokeSuiteConfig):
             "MainPageInfoContent",
             "subscribeMainPageInfoRequest",
             {'tuIds': [cfg.tu_id], 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_main_page_msg(payload)
 
@@ -633,6 +632,7 @@ async def leak_is_complete_on_main_page(ws_client, cfg: SmokeSuiteConfig):
             "MainPageInfoContent",
             "subscribeMainPageInfoRequest",
             {'tuIds': [cfg.tu_id], 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_main_page_msg(payload)
 
@@ -669,7 +669,7 @@ async def imitate_sensor_signal(
             sensor_imitate_reply_status
         ).expected(ReplyStatus.OK.value).equal_to()
 
-        time.sleep(cfg.basic_message_timeout)
+        await asyncio.sleep(cfg.basic_message_timeout)
 
     with allure.step(
         "Получение данных для проверки имитации. Тип сообщения: InputSignalsContent. ЭФ Диагностика Сигналов."
@@ -717,7 +717,7 @@ async def imitate_sensor_signal(
         StepCheck("Проверка кода ответа на запрос о снятии имитации", "replyStatus").actual(
             sensor_unimitate_reply_status
         ).expected(ReplyStatus.OK.value).equal_to()
-        time.sleep(cfg.basic_message_timeout)
+        await asyncio.sleep(cfg.basic_message_timeout)
 
     with allure.step("Получение данных для проверки имитации. InputSignalsContent. ЭФ Диагностика Сигналов."):
         payload = await t_utils.connect_and_subscribe_msg(
@@ -766,21 +766,9 @@ async def imitate_sensor_signal(
         end_time = datetime.now()
         filter_start_msk = t_utils.localize_as_moscow(imitator_start_time)
         filter_end_msk = t_utils.localize_as_moscow(end_time)
-        filter_time_messages = [
-            msg
-            for msg in messages_info
-            if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-        ]
-        filter_by_imitation_messages = [
-            msg
-            for msg in filter_time_messages
-            if getattr(msg, "event", None) == imitation_event and getattr(msg, "tag", None) == sensor_address
-        ]
-        filter_by_unimitation_messages = [
-            msg
-            for msg in filter_time_messages
-            if getattr(msg, "event", None) == imitation_event and getattr(msg, "tag", None) == sensor_address
-        ]
+        sensor_messages = JournalStore.of(messages_info).range(filter_start_msk, filter_end_msk, tag=sensor_address)
+        filter_by_imitation_messages = [msg for msg in sensor_messages if msg.event == imitation_event]
+        filter_by_unimitation_messages = [msg for msg in sensor_messages if msg.event == imitation_event]
 
     with SoftAssertions() as soft_failures:
         StepCheck(
@@ -847,7 +835,7 @@ async def mask_signal_test(ws_client, http_client, cfg: SmokeSuiteConfig, test_d
     with allure.step(
         "Подключение по ws, получение и обработка данных о статусе датчиков из сообщения типа: InputSignalsContent"
     ):
-        time.sleep(cfg.basic_message_timeout)
+        await asyncio.sleep(cfg.basic_message_timeout)
         payload = await t_utils.connect_and_subscribe_msg(
             ws_client,
             "InputSignalsContent",
@@ -892,7 +880,7 @@ async def mask_signal_test(ws_client, http_client, cfg: SmokeSuiteConfig, test_d
     with allure.step(
         "Подключение по ws, получение и обработка данных о статусе датчиков из сообщения типа: InputSignalsContent"
     ):
-        time.sleep(cfg.basic_message_timeout)
+        await asyncio.sleep(cfg.basic_message_timeout)
         payload = await t_utils.connect_and_subscribe_msg(
             ws_client,
             "InputSignalsContent",
@@ -961,11 +949,7 @@ async def mask_info_in_journal(http_client, cfg: SmokeSuiteConfig, imitator_star
             and msg.signalName in TestConst.JOURNAL_MASK_EXPECTED_SIGNALS
         ]
 
-        journal_messages = [
-            msg
-            for msg in mask_unmask_msgs
-            if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-        ]
+        journal_messages = JournalStore.of(mask_unmask_msgs).range(filter_start_msk, filter_end_msk)
 
         allure.attach(
             f"Всего получено сообщений: {len(messages_info)}\n"
@@ -1115,7 +1099,7 @@ async def mask_du_on_mini_scheme(ws_client, http_client, cfg: SmokeSuiteConfig):
         }
         response = http_client.post_request(HttpConst.MASK_LDS_URL_PATH, request_body)
         mask_du_reply_status = response.status_code
-        time.sleep(cfg.basic_message_timeout)
+        await asyncio.sleep(cfg.basic_message_timeout)
 
     with allure.step("Подключение по ws и http, получение и обработка данных сообщений для теста"):
         with allure.step("Http запрос, получение и обработка ответа типа: GetOutputSignalsRequest"):
@@ -1281,7 +1265,7 @@ async def unmask_du_on_mini_scheme(ws_client, http_client, cfg: SmokeSuiteConfig
         }
         response = http_client.post_request(HttpConst.UNMASK_LDS_URL_PATH, request_body)
         unmask_du_reply_status = response.status_code
-        time.sleep(cfg.basic_message_timeout)
+        await asyncio.sleep(cfg.basic_message_timeout)
 
     with allure.step("Подключение по ws, получение и обработка данных сообщений для теста"):
         with allure.step("Http запрос, получение и обработка ответа типа: GetOutputSignalsRequest"):
@@ -1416,6 +1400,7 @@ async def lds_status_initialization_out(ws_client, cfg: SmokeSuiteConfig):
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
 
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
@@ -1466,17 +1451,10 @@ def lds_status_init_out_in_journal(http_client, cfg: SmokeSuiteConfig, imitator_
         filter_start_msk = t_utils.localize_as_moscow(imitator_start_time)
         filter_end_msk = t_utils.localize_as_moscow(end_time)
 
-        time_filtered = [
-            msg
-            for msg in messages_info
-            if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-        ]
-        time_filtered.sort(key=lambda msg: t_utils.ensure_moscow_timezone(msg.time), reverse=True)
+        journal = JournalStore.of(messages_info)
+        time_filtered = journal.range(filter_start_msk, filter_end_msk)
 
-        lds_msg = next(
-            (msg for msg in time_filtered if msg.technologicalSection == cfg.tu_name),
-            None,
-        )
+        lds_msg = journal.latest(filter_start_msk, filter_end_msk, technological_section=cfg.tu_name)
 
         allure.attach(
             f"Всего получено сообщений: {len(messages_info)}\n"
@@ -1615,20 +1593,14 @@ def possible_leak_in_journal(http_client, cfg: SmokeSuiteConfig, imitator_start_
         filter_start_msk = t_utils.localize_as_moscow(imitator_start_time)
         filter_end_msk = t_utils.localize_as_moscow(end_time)
 
-        time_filtered = [
-            msg
-            for msg in messages_info
-            if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-        ]
-        time_filtered.sort(key=lambda msg: t_utils.ensure_moscow_timezone(msg.time), reverse=True)
-
-        possible_leak_msg = next(
-            (
-                msg
-                for msg in time_filtered
-                if msg.technologicalSection == cfg.tu_name and msg.event == TestConst.JOURNAL_EVENT_POSSIBLE_LEAK
-            ),
-            None,
+        journal = JournalStore.of(messages_info)
+        time_filtered = journal.range(filter_start_msk, filter_end_msk)
+
+        possible_leak_msg = journal.latest(
+            filter_start_msk,
+            filter_end_msk,
+            technological_section=cfg.tu_name,
+            event=TestConst.JOURNAL_EVENT_POSSIBLE_LEAK,
         )
 
         allure.attach(
@@ -1689,20 +1661,14 @@ def leak_info_in_journal(http_client, cfg: SmokeSuiteConfig, leak: LeakTestConfi
             filter_start_msk = t_utils.localize_as_moscow(imitator_start_time)
             filter_end_msk = t_utils.localize_as_moscow(end_time)
 
-            time_filtered = [
-                msg
-                for msg in messages_info
-                if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-            ]
-            time_filtered.sort(key=lambda msg: t_utils.ensure_moscow_timezone(msg.time), reverse=True)
-
-            leak_message = next(
-                (
-                    msg
-                    for msg in time_filtered
-                    if msg.technologicalSection == cfg.tu_name and TestConst.JOURNAL_EVENT_DETECTED_LEAK in msg.event
-                ),
-                None,
+            journal = JournalStore.of(messages_info)
+            time_filtered = journal.range(filter_start_msk, filter_end_msk)
+
+            leak_message = journal.latest(
+                filter_start_msk,
+                filter_end_msk,
+                technological_section=cfg.tu_name,
+                predicate=lambda msg: TestConst.JOURNAL_EVENT_DETECTED_LEAK in msg.event,
             )
 
             allure.attach(
@@ -1781,20 +1747,14 @@ def completed_leak_info_in_journal(http_client, cfg: SmokeSuiteConfig, leak: Lea
             filter_start_msk = t_utils.localize_as_moscow(imitator_start_time)
             filter_end_msk = t_utils.localize_as_moscow(end_time)
 
-            time_filtered = [
-                msg
-                for msg in messages_info
-                if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-            ]
-            time_filtered.sort(key=lambda msg: t_utils.ensure_moscow_timezone(msg.time), reverse=True)
-
-            completed_leak_message = next(
-                (
-                    msg
-                    for msg in time_filtered
-                    if msg.technologicalSection == cfg.tu_name and msg.event == TestConst.JOURNAL_EVENT_COMPLETED_LEAKS
-                ),
-                None,
+            journal = JournalStore.of(messages_info)
+            time_filtered = journal.range(filter_start_msk, filter_end_msk)
+
+            completed_leak_message = journal.latest(
+                filter_start_msk,
+                filter_end_msk,
+                technological_section=cfg.tu_name,
+                event=TestConst.JOURNAL_EVENT_COMPLETED_LEAKS,
             )
 
             allure.attach(
@@ -2026,6 +1986,7 @@ async def lds_status_during_leak(ws_client, cfg: SmokeSuiteConfig, leak: LeakTes
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
 
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
@@ -2099,7 +2060,7 @@ async def acknowledge_leak_info(ws_client, http_client, cfg: SmokeSuiteConfig, l
     ):
         with allure.step("Очистка очереди websocket сообщений"):
             ws_client.clear_queue()
-        time.sleep(cfg.basic_message_timeout)
+        await asyncio.sleep(cfg.basic_message_timeout)
         parsed_payload = await t_utils.connect_and_get_parsed_msg_by_tu_id(
             cfg.tu_id,
             ws_client,
@@ -2143,20 +2104,14 @@ def acknowledge_leak_in_journal(http_client, cfg: SmokeSuiteConfig, imitator_sta
         filter_start_msk = t_utils.localize_as_moscow(imitator_start_time)
         filter_end_msk = t_utils.localize_as_moscow(end_time)
 
-        time_filtered = [
-            msg
-            for msg in messages_info
-            if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-        ]
-        time_filtered.sort(key=lambda msg: t_utils.ensure_moscow_timezone(msg.time), reverse=True)
-
-        ack_message = next(
-            (
-                msg
-                for msg in time_filtered
-                if msg.technologicalSection == cfg.tu_name and msg.event == TestConst.JOURNAL_EVENT_LEAK_ACKNOWLEDGED
-            ),
-            None,
+        journal = JournalStore.of(messages_info)
+        time_filtered = journal.range(filter_start_msk, filter_end_msk)
+
+        ack_message = journal.latest(
+            filter_start_msk,
+            filter_end_msk,
+            technological_section=cfg.tu_name,
+            event=TestConst.JOURNAL_EVENT_LEAK_ACKNOWLEDGED,
         )
 
         allure.attach(
@@ -3462,12 +3417,7 @@ def stationary_status_in_journal(http_client, cfg: SmokeSuiteConfig, imitator_st
         filter_start_msk = t_utils.localize_as_moscow(imitator_start_time)
         filter_end_msk = t_utils.localize_as_moscow(end_time)
 
-        messages_time_filtered = [
-            msg
-            for msg in messages_info
-            if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-        ]
-        messages_time_filtered.sort(key=lambda msg: t_utils.ensure_moscow_timezone(msg.time), reverse=True)
+        messages_time_filtered = JournalStore.of(messages_info).range(filter_start_msk, filter_end_msk)
 
         # Фильтрация уникальных наименований участков КП-КП
         control_points_list = []
@@ -10,13 +10,14 @@ from datetime import datetime
 import allure
 import pytest
 
-from constants.architecture_constants import HTTPClientConstants as HttpConst
-from constants.enums import Direction, MessageType, StationaryStatus
+from constants.enums import MessageType, StationaryStatus
 from constants.test_constants import BaseTN3Constants as TestConst
-from models.get_messages_model import Filtering, FilteringObjects, Pagination
+from models.get_messages_model import Filtering, FilteringObjects
 from test_config.models_for_tests import BaseSuiteConfig, CaseData
 from utils.helpers import ws_test_utils as t_utils
 from utils.helpers.asserts import SoftAssertions, StepCheck
+from utils.helpers.journal_pager import JournalPager
+from utils.helpers.journal_store import JournalStore
 from utils.helpers.ws_message_parser import ws_message_parser as parser
 
 
@@ -33,6 +34,7 @@ async def stationary_status_check_with_reasons(ws_client, cfg: BaseSuiteConfig,
             "CommonSchemeContent",
             "SubscribeCommonSchemeRequest",
             {'tuId': cfg.tu_id, 'additionalProperties': None},
+            max_age_s=TestConst.SUBSCRIPTION_SNAPSHOT_MAX_AGE_S,
         )
         parsed_payload = parser.parse_common_scheme_info_msg(payload)
     with allure.step("Извлечение и подготовка данных для проверки"):
@@ -72,34 +74,26 @@ def stationary_status_in_journal(http_client, cfg: BaseSuiteConfig, test_data: C
     with allure.step("Http запрос сообщений журнала с фильтром messageTypes=PUMPING_STATUS"):
         end_time = datetime.now()
         start_time = t_utils.datetime_minus_seconds(end_time, TestConst.JOURNAL_STATUS_TOTAL_WAIT)
-        request_body = t_utils.create_journal_req_body(
-            pagination=Pagination(limit=TestConst.JOURNAL_PAGINATION_STATUS_LIMIT, direction=Direction.FIRST.value),
+        # Страницы журнала читаются до сообщений старше start_time, следующая страница запрашивается заранее
+        journal_pager = JournalPager(
+            http_client,
             filtering=Filtering(messageTypes=int(MessageType.PUMPING_STATUS), objects=FilteringObjects(tuId=cfg.tu_id)),
+            page_limit=TestConst.JOURNAL_PAGINATION_STATUS_LIMIT,
         )
-        response = http_client.post_request(HttpConst.GET_MESSAGES_URL_PATH, request_body)
-        payload = t_utils.get_json_from_http_response(response)
-        parsed_payload = parser.parse_journal_msg(payload)
+        messages_info = journal_pager.collect(not_before=t_utils.localize_as_moscow(start_time))
 
     with allure.step("Извлечение и подготовка данных для проверки"):
-        messages_info = getattr(parsed_payload.replyContent, 'messagesInfo', [])
         StepCheck("Проверка наличия сообщений в журнале", "messagesInfo").actual(messages_info).is_not_empty()
 
     with allure.step("Фильтрация сообщений по времени и controlPoint"):
         filter_start_msk = t_utils.localize_as_moscow(start_time)
         filter_end_msk = t_utils.localize_as_moscow(end_time)
         stationary_msg_by_control_points = []
-        time_filtered = [
-            msg
-            for msg in messages_info
-            if filter_start_msk <= t_utils.ensure_moscow_timezone(msg.time) <= filter_end_msk
-        ]
-        time_filtered.sort(key=lambda msg: t_utils.ensure_moscow_timezone(msg.time), reverse=True)
+        journal = JournalStore.of(messages_info)
+        time_filtered = journal.range(filter_start_msk, filter_end_msk)
         # Поиск нужных сообщений по КП
         for control_point in control_points:
-            stationary_msg = next(
-                (msg for msg in time_filtered if msg.controlPoint == control_point),
-                None,
-            )
+            stationary_msg = journal.latest(filter_start_msk, filter_end_msk, control_point=control_point)
             if stationary_msg:
                 stationary_msg_by_control_points.append(stationary_msg)
         StepCheck(
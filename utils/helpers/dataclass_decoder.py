@@ -0,0 +1,329 @@
+"""
+Сгенерированные декодеры dict -> dataclass вместо dacite.from_dict для ws-сообщений.
+
+При первом обращении к dataclass по аннотациям полей генерируется функция декодирования
+(исходный код через exec), вложенные типы разбираются один раз, а не на каждом сообщении.
+Семантика ошибок та же, что у dacite: если сгенерированный декодер не уверен в результате
+(неверный тип, нет обязательного поля, не dict вместо dataclass), сообщение декодируется
+dacite.from_dict с тем же Config - он и выбрасывает DaciteError с прежним текстом.
+Типы, которые декодер не поддерживает (Union, Tuple, InitVar, generic dataclass ...), всегда идут через dacite.
+"""
+
+import dataclasses
+import logging
+import types
+import typing
+from typing import Any, Callable, Dict, List, Type, TypeVar
+
+from dacite import Config, from_dict
+from dacite.types import is_instance as dacite_is_instance
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# dacite >= 1.8 принимает int для полей float/complex (numeric tower PEP 484)
+_INT_AS_FLOAT = dacite_is_instance(1, float)
+
+_UNION_TYPES = (typing.Union, types.UnionType)
+
+
+class _Miss(Exception):
+    """Сгенерированный декодер не гарантирует результат dacite - сообщение декодирует dacite"""
+
+
+class _Unsupported(Exception):
+    """Тип поля не поддерживается генератором - dataclass декодирует dacite"""
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+class DataclassDecoderCompiler:
+    """
+    Кэш сгенерированных декодеров для одного dacite.Config.
+    Пример использования:
+    compiler = DataclassDecoderCompiler(config)
+    reply = compiler.decode(SubscribeBalanceAlgorithmResultsReply, payload)
+    """
+
+    def __init__(self, config: Config) -> None:
+        self._config = config
+        self._hooks: Dict[Any, Callable[[Any], Any]] = dict(config.type_hooks)
+        self._convert_key = getattr(config, "convert_key", None) or _identity
+        # dataclass -> декодер dict (без fallback), None - dataclass декодирует только dacite
+        self._fast: Dict[type, Callable[[dict], Any]] = {}
+        self._decoders: Dict[type, Callable[[Any], Any]] = {}
+        self._compiling: set = set()
+
+    @property
+    def is_supported_config(self) -> bool:
+        config = self._config
+        return (
+            config.check_types
+            and not config.strict
+            and not config.cast
+            and not config.forward_references
+            and not getattr(config, "strict_unions_match", False)
+        )
+
+    def decode(self, data_class: Type[T], data: Any) -> T:
+        """
+        То же, что dacite.from_dict(data_class, data, config)
+        :raises DaciteError: как dacite.from_dict
+        """
+        decoder = self._decoders.get(data_class)
+        if decoder is None:
+            decoder = self._build_decoder(data_class)
+        return decoder(data)
+
+    def _build_decoder(self, data_class: type) -> Callable[[Any], Any]:
+        config = self._config
+        fast = self._get_fast(data_class) if self.is_supported_config else None
+
+        def _dacite_decode(data: Any) -> Any:
+            return from_dict(data_class=data_class, data=data, config=config)
+
+        if fast is None:
+            decoder = _dacite_decode
+        else:
+
+            def decoder(data: Any) -> Any:
+                if data.__class__ is dict:
+                    try:
+                        return fast(data)
+                    except _Miss:
+                        pass
+                return _dacite_decode(data)
+
+        self._decoders[data_class] = decoder
+        return decoder
+
+    def _get_fast(self, data_class: type):
+        if data_class in self._fast:
+            return self._fast[data_class]
+        if data_class in self._compiling:
+            # Рекурсивный dataclass: декодер ещё генерируется, берём его из кэша при вызове
+            return lambda data: self._fast[data_class](data)
+        self._compiling.add(data_class)
+        try:
+            fast = self._compile_dataclass(data_class)
+        except _Unsupported as error:
+            logger.debug(f"[DECODER] {data_class.__name__} декодируется dacite: {error}")
+            fast = None
+        finally:
+            self._compiling.discard(data_class)
+        self._fast[data_class] = fast
+        return fast
+
+    def _compile_dataclass(self, data_class: type) -> Callable[[dict], Any]:
+        if typing.get_origin(data_class) is not None or getattr(data_class, "__parameters__", ()):
+            raise _Unsupported("generic dataclass")
+        try:
+            hints = typing.get_type_hints(data_class)
+        except NameError as error:
+            raise _Unsupported(f"forward reference: {error}")
+
+        namespace: Dict[str, Any] = {"_cls": data_class, "_Miss": _Miss, "_ABSENT": _ABSENT}
+        lines = ["def _decode(data):", "    _get = data.get"]
+        kwargs = []
+        for index, field in enumerate(dataclasses.fields(data_class)):
+            if not field.init:
+                raise _Unsupported(f"поле {field.name} без init")
+            field_type = hints[field.name]
+            variable = f"v{index}"
+            lines.append(f"    {variable} = _get({self._convert_key(field.name)!r}, _ABSENT)")
+            lines.append(f"    if {variable} is _ABSENT:")
+            lines.extend(f"        {line}" for line in self._default_lines(field, field_type, variable, namespace))
+            lines.append("    else:")
+            lines.extend(f"        {line}" for line in self._value_lines(field_type, variable, index, namespace))
+            kwargs.append(f"{field.name}={variable}")
+        lines.append(f"    return _cls({', '.join(kwargs)})")
+        source = "\n".join(lines)
+        exec(compile(source, f"<decoder {data_class.__qualname__}>", "exec"), namespace)  # noqa: S102
+        return namespace["_decode"]
+
+    @staticmethod
+    def _default_lines(field: dataclasses.Field, field_type: Any, variable: str, namespace: dict) -> List[str]:
+        if field.default is not dataclasses.MISSING:
+            namespace[f"_default_{variable}"] = field.default
+            return [f"{variable} = _default_{variable}"]
+        if field.default_factory is not dataclasses.MISSING:
+            namespace[f"_factory_{variable}"] = field.default_factory
+            return [f"{variable} = _factory_{variable}()"]
+        if _is_optional(field_type):
+            return [f"{variable} = None"]
+        return ["raise _Miss"]
+
+    def _value_lines(self, field_type: Any, variable: str, index: int, namespace: dict) -> List[str]:
+        """
+        Проверка/преобразование значения поля. Простые типы - inline isinstance, остальные - builder-функция
+        """
+        check = self._inline_check(field_type)
+        if check is not None:
+            checked_type, optional = check
+            namespace[f"_t{index}"] = checked_type
+            if checked_type is object:
+                return ["pass"]
+            condition = f"not isinstance({variable}, _t{index})"
+            if optional:
+                condition = f"{variable} is not None and {condition}"
+            return [f"if {condition}:", "    raise _Miss"]
+        namespace[f"_b{index}"] = self._compile_type(field_type)
+        return [f"{variable} = _b{index}({variable})"]
+
+    def _inline_check(self, field_type: Any):
+        """
+        (класс для isinstance, допускается None) для полей простых типов без hook, иначе None
+        """
+        optional = False
+        if field_type in self._hooks:
+            return None
+        if _is_optional(field_type):
+            inner = _optional_inner(field_type)
+            if inner is None or inner in self._hooks:
+                return None
+            field_type, optional = inner, True
+        if field_type is Any:
+            return object, optional
+        if not isinstance(field_type, type) or dataclasses.is_dataclass(field_type):
+            return None
+        if typing.get_origin(field_type) is not None:
+            return None
+        return _isinstance_target(field_type), optional
+
+    def _compile_type(self, type_: Any) -> Callable[[Any], Any]:
+        """
+        Builder значения типа type_ (как dacite._build_value + проверка is_instance), при сомнении - _Miss
+        """
+        builder = self._compile_unhooked(type_)
+        hook = self._hooks.get(type_)
+        if hook is None:
+            return builder
+        if builder is _identity:
+            return hook
+        return lambda value: builder(hook(value))
+
+    def _compile_unhooked(self, type_: Any) -> Callable[[Any], Any]:
+        if type_ is Any:
+            return _identity
+        origin = typing.get_origin(type_)
+        if origin in _UNION_TYPES:
+            inner_type = _optional_inner(type_)
+            if inner_type is None:
+                raise _Unsupported(f"Union {type_}")
+            inner = self._compile_type(inner_type)
+            return lambda value: None if value is None else inner(value)
+        if origin is list:
+            (item_type,) = typing.get_args(type_) or (Any,)
+            return self._list_builder(self._compile_type(item_type))
+        if origin is dict:
+            key_type, value_type = typing.get_args(type_) or (Any, Any)
+            return self._dict_builder(self._compile_check(key_type), self._compile_type(value_type))
+        if origin is not None:
+            raise _Unsupported(f"тип {type_}")
+        if isinstance(type_, type) and dataclasses.is_dataclass(type_):
+            return self._dataclass_builder(type_)
+        if isinstance(type_, type):
+            # Классы без параметров (int, str, Enum, голые list/dict) dacite только проверяет isinstance
+            return self._class_builder(_isinstance_target(type_))
+        raise _Unsupported(f"тип {type_}")
+
+    def _compile_check(self, type_: Any) -> Callable[[Any], bool]:
+        """Проверка ключей dict (ключи dacite не преобразует)"""
+        if type_ is Any:
+            return lambda value: True
+        if isinstance(type_, type) and typing.get_origin(type_) is None and not dataclasses.is_dataclass(type_):
+            target = _isinstance_target(type_)
+            return lambda value: isinstance(value, target)
+        raise _Unsupported(f"ключ dict {type_}")
+
+    def _dataclass_builder(self, data_class: type) -> Callable[[Any], Any]:
+        fast = self._get_fast(data_class)
+        if fast is None:
+            config = self._config
+
+            def build_with_dacite(value: Any) -> Any:
+                if value.__class__ is not dict:
+                    raise _Miss
+                try:
+                    return from_dict(data_class=data_class, data=value, config=config)
+                except Exception:
+                    raise _Miss
+
+            return build_with_dacite
+
+        def build(value: Any) -> Any:
+            if value.__class__ is not dict:
+                raise _Miss
+            return fast(value)
+
+        return build
+
+    @staticmethod
+    def _class_builder(target: Any) -> Callable[[Any], Any]:
+        def build(value: Any) -> Any:
+            if isinstance(value, target):
+                return value
+            raise _Miss
+
+        return build
+
+    @staticmethod
+    def _list_builder(item_builder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        if item_builder is _identity:
+
+            def build_any(value: Any) -> Any:
+                if value.__class__ is not list:
+                    raise _Miss
+                return list(value)
+
+            return build_any
+
+        def build(value: Any) -> Any:
+            if value.__class__ is not list:
+                raise _Miss
+            return [item_builder(item) for item in value]
+
+        return build
+
+    @staticmethod
+    def _dict_builder(key_check: Callable[[Any], bool], value_builder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        def build(value: Any) -> Any:
+            if value.__class__ is not dict:
+                raise _Miss
+            result = {}
+            for key, item in value.items():
+                if not key_check(key):
+                    raise _Miss
+                result[key] = value_builder(item)
+            return result
+
+        return build
+
+
+class _AbsentType:
+    def __repr__(self) -> str:
+        return "<absent>"
+
+
+_ABSENT = _AbsentType()
+
+
+def _is_optional(type_: Any) -> bool:
+    return typing.get_origin(type_) in _UNION_TYPES and type(None) in typing.get_args(type_)
+
+
+def _optional_inner(type_: Any) -> Any:
+    """X для Optional[X], иначе None (Union из нескольких типов)"""
+    args = typing.get_args(type_)
+    if len(args) == 2 and args[1] is type(None):
+        return args[0]
+    return None
+
+
+def _isinstance_target(type_: type) -> Any:
+    if _INT_AS_FLOAT and type_ in (float, complex):
+        return int, type_
+    return type_
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Tuple, TypeVar
+
+SourceT = TypeVar("SourceT")
+ValueT = TypeVar("ValueT")
+
+
+class IdentityCache(Generic[SourceT, ValueT]):
+    """
+    LRU-кэш значений, построенных по объекту-источнику (например, список из ответа), с ключом id источника.
+    Источник хранится вместе со значением, чтобы его id не переиспользовался, пока запись в кэше;
+    отпечаток источника пересобирает значение, если список изменили на месте.
+    Пример использования:
+    _INDEX_CACHE = IdentityCache(Index_Const.CACHE_SIZE, _fingerprint)
+    scheme_index = _INDEX_CACHE.get_or_build(flow_areas, SchemeIndex)
+    """
+
+    def __init__(self, max_size: int, fingerprint: Callable[[SourceT], Hashable]) -> None:
+        self._max_size = max_size
+        self._fingerprint = fingerprint
+        self._entries: OrderedDict[int, Tuple[SourceT, Any, ValueT]] = OrderedDict()
+
+    def get_or_build(self, source: SourceT, build: Callable[[SourceT], ValueT]) -> ValueT:
+        key = id(source)
+        fingerprint = self._fingerprint(source)
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] is source and cached[1] == fingerprint:
+            self._entries.move_to_end(key)
+            return cached[2]
+        value = build(source)
+        self._entries[key] = (source, fingerprint, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        return value
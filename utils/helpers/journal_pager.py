@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional
+
+from constants.architecture_constants import HTTPClientConstants as HttpConst
+from constants.architecture_constants import JournalPagerConstants as Pager_Const
+from constants.enums import Direction
+from models.get_messages_model import Filtering, MessagesInfo, Pagination, PeriodTime
+from utils.helpers import ws_test_utils as t_utils
+from utils.helpers.time_conversion_utils import to_epoch_us
+from utils.helpers.ws_message_parser import ws_message_parser as parser
+
+logger = logging.getLogger(__name__)
+
+
+class JournalPager:
+    """
+    Постраничное чтение журнала (POST GetMessages) от новых сообщений к старым.
+    Первая страница запрашивается с Direction.FIRST, следующие - Direction.NEXT от последнего сообщения
+    предыдущей страницы (pagination.id/eventTime). Filtering и periodTime уходят в запрос, т.е. фильтруются
+    на сервере. Пока вызывающий код обрабатывает страницу, следующая запрашивается в фоновом потоке.
+    Чтение заканчивается на неполной странице, после max_pages страниц, на сообщениях старше not_before
+    или как только найдено искомое сообщение (find).
+    Пример использования:
+    pager = JournalPager(http_client, Filtering(messageTypes=int(MessageType.LDS_STATUS)))
+    messages_info = pager.collect(not_before=filter_start_msk)
+    lds_msg = pager.find(lambda msg: msg.technologicalSection == cfg.tu_name, not_before=filter_start_msk)
+    """
+
+    def __init__(
+        self,
+        http_client,
+        filtering: Optional[Filtering] = None,
+        page_limit: int = Pager_Const.PAGE_LIMIT,
+        max_pages: int = Pager_Const.MAX_PAGES,
+        period_time: Optional[PeriodTime] = None,
+        prefetch: bool = True,
+    ) -> None:
+        self._http_client = http_client
+        self._filtering = filtering
+        self._page_limit = page_limit
+        self._max_pages = max_pages
+        self._period_time = period_time
+        self._prefetch = prefetch
+        self.pages_fetched = 0
+
+    def pages(self, not_before: Optional[datetime] = None) -> Iterator[List[MessagesInfo]]:
+        """
+        Страницы журнала по порядку; после страницы с сообщениями старше not_before следующие не запрашиваются
+        :param not_before: datetime с timezone (например, localize_as_moscow), без timezone считается UTC
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-pager") if self._prefetch else None
+        try:
+            page = self._fetch_page(None)
+            page_number = 1
+            while page:
+                next_cursor = self._next_cursor(page, page_number, not_before)
+                pending: Optional[Future] = None
+                if next_cursor is not None and executor is not None:
+                    # Контекст копируется, чтобы вложения ответа попали в буфер текущего теста
+                    pending = executor.submit(contextvars.copy_context().run, self._fetch_page, next_cursor)
+                yield page
+                if next_cursor is None:
+                    return
+                page = pending.result() if pending is not None else self._fetch_page(next_cursor)
+                page_number += 1
+        finally:
+            if executor is not None:
+                # Если итерацию прервали, уже запрошенная страница отбрасывается без ожидания ответа
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def messages(self, not_before: Optional[datetime] = None) -> Iterator[MessagesInfo]:
+        """
+        Сообщения всех страниц без повторов на границах страниц, сообщения старше not_before пропускаются
+        """
+        not_before_us = None if not_before is None else to_epoch_us(not_before)
+        seen_ids = set()
+        for page in self.pages(not_before):
+            for msg in page:
+                if msg.messageId is not None:
+                    if msg.messageId in seen_ids:
+                        continue
+                    seen_ids.add(msg.messageId)
+                if not_before_us is not None and msg.time is not None and to_epoch_us(msg.time) < not_before_us:
+                    continue
+                yield msg
+
+    def collect(self, not_before: Optional[datetime] = None) -> List[MessagesInfo]:
+        return list(self.messages(not_before))
+
+    def find(
+        self, predicate: Callable[[MessagesInfo], bool], not_before: Optional[datetime] = None
+    ) -> Optional[MessagesInfo]:
+        """
+        Самое позднее сообщение, удовлетворяющее predicate; следующие страницы после него не запрашиваются
+        """
+        return next((msg for msg in self.messages(not_before) if predicate(msg)), None)
+
+    def _fetch_page(self, pagination: Optional[Pagination]) -> List[MessagesInfo]:
+        request_body = t_utils.create_journal_req_body(
+            pagination=pagination or Pagination(limit=self._page_limit, direction=Direction.FIRST.value),
+            periodTime=self._period_time,
+            filtering=self._filtering,
+        )
+        response = self._http_client.post_request(HttpConst.GET_MESSAGES_URL_PATH, request_body)
+        payload = t_utils.get_json_from_http_response(response)
+        parsed_payload = parser.parse_journal_msg(payload)
+        self.pages_fetched += 1
+        return getattr(parsed_payload.replyContent, "messagesInfo", None) or []
+
+    def _next_cursor(
+        self, page: List[MessagesInfo], page_number: int, not_before: Optional[datetime]
+    ) -> Optional[Pagination]:
+        """
+        Пагинация следующей страницы или None, если читать дальше не нужно
+        """
+        if len(page) < self._page_limit:
+            return None
+        if page_number >= self._max_pages:
+            logger.warning(f"[JOURNAL] Прочитано {page_number} страниц журнала, остальные не запрашиваются")
+            return None
+        page_times = [msg.time for msg in page if msg.time is not None]
+        if not_before is not None and page_times and min(map(to_epoch_us, page_times)) < to_epoch_us(not_before):
+            return None
+        last_msg = page[-1]
+        if last_msg.messageId is None or last_msg.time is None:
+            logger.warning("[JOURNAL] У последнего сообщения страницы нет messageId/time, дальше не читаю")
+            return None
+        return Pagination(
+            limit=self._page_limit,
+            id=int(last_msg.messageId),
+            direction=Direction.NEXT.value,
+            eventTime=last_msg.time,
+        )
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from constants.architecture_constants import JournalStoreConstants as Journal_Const
+from utils.helpers.identity_cache import IdentityCache
+from utils.helpers.time_conversion_utils import to_epoch_us
+
+
+class JournalStore:
+    """
+    Индекс сообщений журнала (messagesInfo из GetMessagesReply) по времени - единственное место,
+    где сценарии сравнивают время сообщений журнала с диапазоном. Время каждого сообщения один раз переводится
+    в микросекунды от эпохи (без timezone - UTC, как ensure_moscow_timezone), поэтому границы диапазона
+    (localize_as_moscow) и время сообщений сравниваются без перевода в московскую таймзону по сообщению.
+    Сообщения упорядочиваются от новых к старым (при равном времени - в порядке ответа),
+    по tag, technologicalSection, event и controlPoint строятся словари позиций.
+    Диапазон времени ищется bisect, а не перебором всех сообщений. Сообщения без time в выборки не попадают.
+    Пример использования:
+    journal = JournalStore.of(messages_info)
+    time_filtered = journal.range(filter_start_msk, filter_end_msk)
+    lds_msg = journal.latest(filter_start_msk, filter_end_msk, technological_section=cfg.tu_name)
+    """
+
+    def __init__(self, messages_info: Optional[List[Any]]) -> None:
+        self.messages_info: List[Any] = messages_info or []
+        timed = [
+            (-to_epoch_us(msg_time), number, msg)
+            for number, msg in enumerate(self.messages_info)
+            if (msg_time := getattr(msg, "time", None)) is not None
+        ]
+        timed.sort(key=lambda item: item[:2])
+        # Позиция в _messages/_keys - место сообщения в порядке от новых к старым; _keys - минус время в мкс
+        self._keys: List[int] = [item[0] for item in timed]
+        self._messages: List[Any] = [item[2] for item in timed]
+        events = [getattr(msg, "event", None) for msg in self._messages]
+        self._values: Dict[str, List[Any]] = {
+            "tag": [getattr(msg, "tag", None) for msg in self._messages],
+            "technological_section": [getattr(msg, "technologicalSection", None) for msg in self._messages],
+            "event": events,
+            "stripped_event": [event.rstrip() if isinstance(event, str) else event for event in events],
+            "control_point": [getattr(msg, "controlPoint", None) for msg in self._messages],
+        }
+        self._indexes: Dict[str, Dict[Any, List[int]]] = {
+            field: self._build_index(values) for field, values in self._values.items()
+        }
+
+    @classmethod
+    def of(cls, messages_info: Optional[List[Any]]) -> JournalStore:
+        """
+        Индекс для списка messagesInfo из кэша последних индексов (пересобирается, если список изменился).
+        Повторные проверки по одному ответу журнала в наборе используют один индекс
+        """
+        if not messages_info:
+            return cls(messages_info)
+        return _STORE_CACHE.get_or_build(messages_info, cls)
+
+    @classmethod
+    def from_reply(cls, parsed_payload: Any) -> JournalStore:
+        return cls.of(getattr(getattr(parsed_payload, "replyContent", None), "messagesInfo", None))
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def range(self, range_start: datetime, range_end: datetime, tag: Optional[str] = None) -> List[Any]:
+        """
+        Сообщения с range_start <= time <= range_end (границы включительно) от новых к старым
+        :param tag: только сообщения с этим tag
+        """
+        return [self._messages[position] for position in self._range_positions(range_start, range_end, tag=tag)]
+
+    def latest(
+        self,
+        range_start: Optional[datetime] = None,
+        range_end: Optional[datetime] = None,
+        *,
+        tag: Optional[str] = None,
+        technological_section: Optional[str] = None,
+        event: Optional[str] = None,
+        stripped_event: Optional[str] = None,
+        control_point: Optional[str] = None,
+        predicate: Optional[Callable[[Any], bool]] = None,
+    ) -> Optional[Any]:
+        """
+        Самое позднее сообщение в диапазоне, удовлетворяющее всем заданным условиям (None - условие не проверяется)
+        :param event: event совпадает с точностью до символа
+        :param stripped_event: event без пробелов справа совпадает с заданным
+        :param predicate: дополнительная проверка сообщения
+        """
+        return next(
+            self._iter_matches(
+                range_start,
+                range_end,
+                {
+                    "tag": tag,
+                    "technological_section": technological_section,
+                    "event": event,
+                    "stripped_event": stripped_event,
+                    "control_point": control_point,
+                },
+                predicate,
+            ),
+            None,
+        )
+
+    def _iter_matches(
+        self,
+        range_start: Optional[datetime],
+        range_end: Optional[datetime],
+        conditions: Dict[str, Any],
+        predicate: Optional[Callable[[Any], bool]],
+    ) -> Iterator[Any]:
+        conditions = {field: value for field, value in conditions.items() if value is not None}
+        lo, hi = self._bounds(range_start, range_end)
+        candidates: Any = range(lo, hi)
+        driver = None
+        # Перебор по самому короткому списку позиций среди заданных условий, остальные проверяются по значениям
+        for field, value in conditions.items():
+            positions = self._indexes[field].get(value, [])
+            positions = positions[bisect_left(positions, lo) : bisect_left(positions, hi)]
+            if driver is None or len(positions) < len(candidates):
+                candidates, driver = positions, field
+        checks = [(self._values[field], value) for field, value in conditions.items() if field != driver]
+        for position in candidates:
+            if all(values[position] == value for values, value in checks):
+                msg = self._messages[position]
+                if predicate is None or predicate(msg):
+                    yield msg
+
+    def _range_positions(self, range_start: datetime, range_end: datetime, tag: Optional[str] = None) -> List[int]:
+        lo, hi = self._bounds(range_start, range_end)
+        if tag is None:
+            return list(range(lo, hi))
+        positions = self._indexes["tag"].get(tag, [])
+        return positions[bisect_left(positions, lo) : bisect_left(positions, hi)]
+
+    def _bounds(self, range_start: Optional[datetime], range_end: Optional[datetime]) -> Tuple[int, int]:
+        """
+        Срез позиций [lo, hi) для диапазона времени: ключи - минус время, поэтому граница end даёт lo
+        """
+        lo = 0 if range_end is None else bisect_left(self._keys, -to_epoch_us(range_end))
+        hi = len(self._keys) if range_start is None else bisect_right(self._keys, -to_epoch_us(range_start))
+        return lo, max(lo, hi)
+
+    @staticmethod
+    def _build_index(values: List[Any]) -> Dict[Any, List[int]]:
+        """
+        Значение поля -> позиции сообщений с этим значением (по возрастанию, т.е. от новых к старым)
+        """
+        index: Dict[Any, List[int]] = {}
+        for position, value in enumerate(values):
+            if value is not None:
+                index.setdefault(value, []).append(position)
+        return index
+
+
+def _fingerprint(messages_info: List[Any]) -> Tuple[int, ...]:
+    return len(messages_info), id(messages_info[0]), id(messages_info[-1])
+
+
+_STORE_CACHE: IdentityCache[List[Any], JournalStore] = IdentityCache(Journal_Const.CACHE_SIZE, _fingerprint)
@@ -70,11 +70,12 @@ def attach_allure_alert(message: str) -> None:
         allure.attach(message, name="ALERT", attachment_type=allure.attachment_type.TEXT)
 
 
-def get_basic_info(http_client: StandHttpClient, parser: WsMessageParser) -> BasicInfoReply:
+def get_basic_info(http_client: StandHttpClient, parser: WsMessageParser, use_cache: bool = True) -> BasicInfoReply:
     """
     Выполняет getBasicInfoRequest и парсит ответ BasicInfoContent.
+    :param use_cache: False - не брать ответ из кэша набора (ожидание изменений)
     """
-    response = http_client.post_request(HttpConst.GET_BASIC_INFO_URL_PATH, {})
+    response = http_client.post_request(HttpConst.GET_BASIC_INFO_URL_PATH, {}, use_cache=use_cache)
     payload = t_utils.get_json_from_http_response(response)
     return parser.parse_basic_info_msg(payload)
 
@@ -87,11 +88,13 @@ def is_tu_in_basic_info(tus: Optional[list[BasicTUInfo]], tu_id: int, tu_name: s
 def get_basic_info_admin(
     http_client: StandHttpClient,
     parser: WsMessageParser,
+    use_cache: bool = True,
 ) -> GetBasicInfoAdminReply:
     """
     Выполняет GetBasicInfoAdminRequest и парсит ответ.
+    :param use_cache: False - не брать ответ из кэша набора (ожидание изменений)
     """
-    response = http_client.post_request(HttpConst.GET_BASIC_INFO_ADMIN_URL_PATH, {})
+    response = http_client.post_request(HttpConst.GET_BASIC_INFO_ADMIN_URL_PATH, {}, use_cache=use_cache)
     payload = t_utils.get_json_from_http_response(response)
     return parser.parse_get_basic_info_admin_msg(payload)
 
@@ -108,7 +111,8 @@ def get_basic_info_admin_with_retry(
     for attempt in range(1, retries + 1):
         with _step(f"Запрос списка ТУ в Администрировании - попытка {attempt} из {retries}"):
             try:
-                return get_basic_info_admin(http_client, parser)
+                # Повторная попытка не должна получить тот же ответ из кэша
+                return get_basic_info_admin(http_client, parser, use_cache=attempt == 1)
             except (
                 asyncio.TimeoutError,
                 ConnectionError,
@@ -306,7 +310,7 @@ async def poll_admin_tu_status(
     ):
         deadline = asyncio.get_running_loop().time() + total_wait_seconds
         while asyncio.get_running_loop().time() < deadline:
-            admin_reply = get_basic_info_admin(http_client, parser)
+            admin_reply = get_basic_info_admin(http_client, parser, use_cache=False)
             tus = admin_reply.replyContent.basicInfo.tus if admin_reply.replyContent else []
             tu = next((item for item in tus if item.tuId == tu_id), None)
             if tu and tu.status == expected_status.value:
@@ -413,7 +417,7 @@ async def poll_basic_info_tu_presence(
     ):
         deadline = asyncio.get_running_loop().time() + total_wait_seconds
         while asyncio.get_running_loop().time() < deadline:
-            reply = get_basic_info(http_client, parser)
+            reply = get_basic_info(http_client, parser, use_cache=False)
             tus = reply.replyContent.basicInfo.tus if reply.replyContent else None
             found = is_tu_in_basic_info(tus, tu_id, tu_name)
             if expect_present and found:
@@ -13,12 +13,17 @@ import pytest
 import requests
 
 from clients.http_client import StandHttpClient
+from clients.http_response_cache import HttpResponseCache
 from clients.keycloak_clients import KeycloakAuthError, KeycloakClient
 from clients.testops_client import logger
 from clients.websocket_client import WebSocketClient
+from clients.websocket_pool import WebSocketPool
+from clients.ws_snapshot_store import WsSnapshotStore
+from clients.ws_traffic_recorder import WsTrafficRecorder
 from constants.architecture_constants import EnvKeyConstants as EnvConst
 from constants.architecture_constants import HTTPClientConstants as HttpConst
 from constants.architecture_constants import WebSocketClientConstants as WSCliConst
+from constants.architecture_constants import WsRecordingConstants as RecConst
 
 # Один KeycloakClient на pytest-сессию; TTL токена проверяется внутри клиента.
 _keycloak_client: KeycloakClient | None = None
@@ -109,12 +114,17 @@ def get_token(max_retries: int = 12, backoff: float = 5.0, force_refresh: bool =
 def clear_suite_auth(group_state: dict) -> None:
     """
     Сбрасывает кэш auth в group_state перед инициализацией нового dataset.
-    Очищает stand_host, auth_token, x_user_id и метку auth_suite.
+    Очищает stand_host, auth_token, x_user_id, метку auth_suite, последние ws-сообщения
+    и кэш http-ответов набора.
     """
     group_state["stand_host"] = None
     group_state["auth_token"] = None
     group_state["x_user_id"] = None
     group_state["auth_suite"] = None
+    if snapshot_store := group_state.get("ws_snapshot_store"):
+        snapshot_store.clear()
+    if response_cache := group_state.get("http_response_cache"):
+        response_cache.clear()
 
 
 def _fetch_x_user_id(http_client: StandHttpClient, max_retries: int = 5, backoff: float = 5.0) -> str:
@@ -127,7 +137,7 @@ def _fetch_x_user_id(http_client: StandHttpClient, max_retries: int = 5, backoff
     last_exc = None
     for attempt in range(1, max_retries + 1):
         try:
-            response = http_client.post_request(HttpConst.PING_URL_PATH, {})
+            response = http_client.post_request(HttpConst.PING_URL_PATH, {}, use_cache=attempt == 1)
             x_user_id = response.headers.get(HttpConst.X_USER_ID_KEY)
             if not x_user_id:
                 raise ValueError("/Ping не вернул x-user-id")
@@ -167,7 +177,7 @@ def ensure_suite_auth(group_state: dict, suite_name: str) -> None:
 
     stand_host = build_stand_host()
     auth_token = get_token(force_refresh=True)
-    http_client = StandHttpClient(stand_host, auth_token)
+    http_client = StandHttpClient(stand_host, auth_token, response_cache=get_suite_http_response_cache(group_state))
     x_user_id = _fetch_x_user_id(http_client)
 
     group_state["stand_host"] = stand_host
@@ -204,7 +214,11 @@ def _require_auth(group_state: dict, *, require_x_user_id: bool = False) -> None
 def init_http_stand_client(group_state: dict) -> StandHttpClient:
     """Создает StandHttpClient. Креды из group_state (кэш на dataset)."""
     _require_auth(group_state)
-    return StandHttpClient(group_state["stand_host"], group_state["auth_token"])
+    return StandHttpClient(
+        group_state["stand_host"],
+        group_state["auth_token"],
+        response_cache=get_suite_http_response_cache(group_state),
+    )
 
 
 def init_ws_stand_client(group_state: dict) -> WebSocketClient:
@@ -214,4 +228,85 @@ def init_ws_stand_client(group_state: dict) -> WebSocketClient:
         group_state["stand_host"],
         group_state["auth_token"],
         group_state["x_user_id"],
+        snapshot_store=get_suite_ws_snapshot_store(group_state),
+        recorder=get_suite_ws_recorder(group_state),
     )
+
+
+def get_suite_ws_snapshot_store(group_state: dict) -> WsSnapshotStore:
+    """Последние ws-сообщения по типу контента, общие для ws-клиентов набора."""
+    snapshot_store = group_state.get("ws_snapshot_store")
+    if snapshot_store is None:
+        snapshot_store = WsSnapshotStore()
+        group_state["ws_snapshot_store"] = snapshot_store
+    return snapshot_store
+
+
+def get_suite_http_response_cache(group_state: dict) -> HttpResponseCache:
+    """Кэш ответов справочных http-запросов, общий для http-клиентов набора."""
+    response_cache = group_state.get("http_response_cache")
+    if response_cache is None:
+        response_cache = HttpResponseCache()
+        group_state["http_response_cache"] = response_cache
+    return response_cache
+
+
+def get_suite_ws_recorder(group_state: dict) -> WsTrafficRecorder | None:
+    """
+    Запись входящего ws-трафика набора (--ws-record), None - запись выключена.
+    Файл <каталог>/<набор>.wsrec создаётся при первом ws-клиенте набора.
+    """
+    record_dir = group_state.get("ws_record_dir")
+    if not record_dir:
+        return None
+    recorder = group_state.get("ws_recorder")
+    if recorder is None:
+        suite = group_state.get("current_suite") or group_state.get("auth_suite") or "__default__"
+        recorder = WsTrafficRecorder(os.path.join(record_dir, RecConst.FILE_NAME_TEMPLATE.format(suite=suite)))
+        group_state["ws_recorder"] = recorder
+    return recorder
+
+
+def close_suite_ws_recorder(group_state: dict) -> None:
+    """Закрывает запись ws-трафика набора и сохраняет индекс."""
+    if recorder := group_state.get("ws_recorder"):
+        group_state["ws_recorder"] = None
+        recorder.close()
+
+
+def get_suite_ws_pool(group_state: dict) -> WebSocketPool:
+    """
+    Возвращает WebSocketPool набора (общие ws-соединения на dataset). Креды из group_state.
+    При смене auth (новый dataset) пул пересоздаётся.
+    """
+    _require_auth(group_state, require_x_user_id=True)
+    credentials = (group_state["stand_host"], group_state["auth_token"], group_state["x_user_id"])
+    ws_pool = group_state.get("ws_pool")
+    if ws_pool is not None and (ws_pool.host, ws_pool.access_token, ws_pool.x_user_id) != credentials:
+        close_suite_ws_pool(group_state)
+        ws_pool = None
+    if ws_pool is None:
+        ws_pool = WebSocketPool(
+            *credentials,
+            snapshot_store=get_suite_ws_snapshot_store(group_state),
+            recorder=get_suite_ws_recorder(group_state),
+        )
+        group_state["ws_pool"] = ws_pool
+    return ws_pool
+
+
+def close_suite_ws_pool(group_state: dict) -> None:
+    """Закрывает ws-соединения пула набора."""
+    if ws_pool := group_state.get("ws_pool"):
+        group_state["ws_pool"] = None
+        ws_pool.close()
+
+
+def open_ws_stand_client(group_state: dict) -> WebSocketClient:
+    """
+    ws-клиент теста: сессия общего пула набора (--ws-pool), либо отдельное соединение.
+    Используется как async context manager.
+    """
+    if group_state.get("use_ws_pool"):
+        return get_suite_ws_pool(group_state).session()
+    return init_ws_stand_client(group_state)
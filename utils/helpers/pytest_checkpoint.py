@@ -0,0 +1,224 @@
+"""
+Checkpoint сессии стенда и возобновление прогона (--resume).
+
+Если pytest-процесс падает посреди набора, имитатор продолжает работать на стенде.
+Checkpoint хранит состояние сессии стенда из group_state (стенд, пути к данным на сервере, время старта
+имитатора и core, resolved tuId) и список завершённых тестов.
+С --resume прогон подключается к живому имитатору и продолжает оставшиеся тесты по их offset.
+
+Auth (stand_host, access token, x-user-id) в checkpoint не сохраняется: при возобновлении
+он запрашивается заново через ensure_suite_auth.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from clients.testops_client import logger
+from constants.architecture_constants import CheckpointConstants as CheckpointConst
+from constants.architecture_constants import ImitatorConstants as ImConst
+from constants.test_constants import BaseTN3Constants
+from infra.suite_pack_setup_manager import SuitePackSetupManager
+
+
+@dataclass
+class ActiveSessionCheckpoint:
+    """Сессия стенда (набор или пакет наборов), идущая в момент сохранения"""
+
+    session_key: str
+    remote_data_paths: Dict[str, str]
+    imitator_start_times: Dict[str, str]  # isoformat
+    imitator_duration_m: float
+    suite_start_epoch: float  # time.time() старта core
+    resolved_tu_id: Optional[int] = None
+    admin_tu_name: Optional[str] = None
+    use_lds_configurator: bool = False
+    pre_run_running_tus: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def elapsed_s(self) -> float:
+        return time.time() - self.suite_start_epoch
+
+    @property
+    def is_expired(self) -> bool:
+        """Имитатор уже должен был завершиться по --stopTime"""
+        return self.elapsed_s >= self.imitator_duration_m * BaseTN3Constants.SEC_PER_MIN
+
+    def get_start_times(self) -> Dict[str, datetime]:
+        return {suite: datetime.fromisoformat(value) for suite, value in self.imitator_start_times.items()}
+
+
+@dataclass
+class SessionCheckpoint:
+    """Checkpoint прогона на стенде"""
+
+    stand_name: str
+    completed_nodeids: List[str] = field(default_factory=list)
+    active_session: Optional[ActiveSessionCheckpoint] = None
+    saved_at: float = 0.0
+
+
+class SessionCheckpointStore:
+    """
+    Хранение checkpoint в JSON-файле (отдельный файл на стенд).
+    Пример использования (conftest):
+    store = SessionCheckpointStore(stand_name)
+    store.begin_session(group_state, stand_manager, imitator_duration_m)  # после успешного setup набора
+    store.mark_completed(item.nodeid)                                      # после каждого теста
+    store.end_session()                                                    # teardown набора
+    store.clear()                                                          # штатное завершение сессии
+    """
+
+    def __init__(self, stand_name: str, checkpoint_dir: Optional[Path] = None) -> None:
+        self._stand_name = stand_name
+        self._path = (checkpoint_dir or Path.cwd()) / CheckpointConst.FILE_NAME_TEMPLATE.format(stand=stand_name)
+        self._checkpoint = SessionCheckpoint(stand_name=stand_name)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def completed_nodeids(self) -> set[str]:
+        return set(self._checkpoint.completed_nodeids)
+
+    def is_completed(self, nodeid: str) -> bool:
+        return normalize_nodeid(nodeid) in self._checkpoint.completed_nodeids
+
+    def load(self) -> Optional[SessionCheckpoint]:
+        """
+        Загружает checkpoint прошлого прогона этого стенда
+        """
+        if not self._path.exists():
+            return None
+        try:
+            with self._path.open("r", encoding=ImConst.ENCODING_UTF_8) as checkpoint_file:
+                raw = json.load(checkpoint_file)
+            active_session = raw.get("active_session")
+            self._checkpoint = SessionCheckpoint(
+                stand_name=raw["stand_name"],
+                completed_nodeids=list(raw.get("completed_nodeids", [])),
+                active_session=ActiveSessionCheckpoint(**active_session) if active_session else None,
+                saved_at=raw.get("saved_at", 0.0),
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.exception(f"[CHECKPOINT] [ERROR] Не удалось прочитать checkpoint {self._path}")
+            return None
+        if self._checkpoint.stand_name != self._stand_name:
+            logger.warning(f"[CHECKPOINT] [WARNING] Checkpoint {self._path} относится к другому стенду")
+            self._checkpoint = SessionCheckpoint(stand_name=self._stand_name)
+            return None
+        logger.info(
+            f"[CHECKPOINT] Загружен checkpoint: завершено тестов {len(self._checkpoint.completed_nodeids)}, "
+            f"активная сессия: {getattr(self._checkpoint.active_session, 'session_key', None)}"
+        )
+        return self._checkpoint
+
+    def begin_session(self, group_state: dict, stand_manager, imitator_duration_m: float) -> None:
+        """
+        Сохраняет состояние сессии стенда после успешного setup набора/пакета
+        """
+        session_key = group_state["current_suite"]
+        if isinstance(stand_manager, SuitePackSetupManager):
+            remote_data_paths = stand_manager.remote_data_paths
+            start_times = stand_manager.start_times
+        else:
+            remote_data_paths = {session_key: stand_manager.remote_data_path}
+            start_times = {session_key: stand_manager.start_time}
+        elapsed_s = time.monotonic() - group_state["suite_start_time"]
+        self._checkpoint.active_session = ActiveSessionCheckpoint(
+            session_key=session_key,
+            remote_data_paths=remote_data_paths,
+            imitator_start_times={suite: start_time.isoformat() for suite, start_time in start_times.items()},
+            imitator_duration_m=imitator_duration_m,
+            suite_start_epoch=time.time() - elapsed_s,
+            resolved_tu_id=group_state.get("resolved_tu_id"),
+            admin_tu_name=group_state.get("admin_tu_name"),
+            use_lds_configurator=bool(group_state.get("use_lds_configurator")),
+            pre_run_running_tus=group_state.get("pre_run_running_tus"),
+        )
+        self._save()
+
+    def mark_completed(self, nodeid: str) -> None:
+        nodeid = normalize_nodeid(nodeid)
+        if nodeid in self._checkpoint.completed_nodeids:
+            return
+        self._checkpoint.completed_nodeids.append(nodeid)
+        self._save()
+
+    def end_session(self) -> None:
+        """
+        Сессия стенда завершена штатно (имитатор остановлен, данные удалены)
+        """
+        if self._checkpoint.active_session is None:
+            return
+        self._checkpoint.active_session = None
+        self._save()
+
+    def take_resumable_session(self, session_key: str) -> Optional[ActiveSessionCheckpoint]:
+        """
+        Возвращает сохранённую сессию, если к ней можно подключиться: тот же набор/пакет
+        и имитатор ещё не должен был завершиться. Сессия забирается из checkpoint один раз.
+        """
+        active_session = self._checkpoint.active_session
+        if active_session is None or active_session.session_key != session_key:
+            return None
+        if active_session.is_expired:
+            logger.warning(
+                f"[CHECKPOINT] [WARNING] Имитатор сессии {session_key} уже завершился "
+                f"({active_session.elapsed_s / 60:.1f} из {active_session.imitator_duration_m} мин.)"
+            )
+            self.end_session()
+            return None
+        return active_session
+
+    def clear(self) -> None:
+        """
+        Удаляет checkpoint после штатного завершения прогона
+        """
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+        self._checkpoint = SessionCheckpoint(stand_name=self._stand_name)
+
+    @staticmethod
+    def restore_group_state(group_state: dict, active_session: ActiveSessionCheckpoint) -> None:
+        """
+        Переносит состояние сохранённой сессии в group_state: монотонное время старта core
+        пересчитывается от сохранённого epoch, чтобы offset_wait продолжил ту же шкалу
+        """
+        group_state["suite_start_time"] = time.monotonic() - active_session.elapsed_s
+        start_times = active_session.get_start_times()
+        group_state["imitator_start_times"] = start_times if len(start_times) > 1 else {}
+        group_state["imitator_start_time"] = next(iter(start_times.values()))
+        group_state["resolved_tu_id"] = active_session.resolved_tu_id
+        group_state["admin_tu_name"] = active_session.admin_tu_name
+        group_state["use_lds_configurator"] = active_session.use_lds_configurator
+        group_state["pre_run_running_tus"] = active_session.pre_run_running_tus
+
+    def _save(self) -> None:
+        """
+        Атомарная запись: временный файл + os.replace, чтобы падение во время записи не портило checkpoint
+        """
+        self._checkpoint.saved_at = time.time()
+        tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        try:
+            with tmp_path.open("w", encoding=ImConst.ENCODING_UTF_8) as checkpoint_file:
+                json.dump(asdict(self._checkpoint), checkpoint_file, ensure_ascii=False, indent=2, default=str)
+            os.replace(tmp_path, self._path)
+        except OSError:
+            logger.exception(f"[CHECKPOINT] [ERROR] Не удалось сохранить checkpoint {self._path}")
+
+
+def normalize_nodeid(nodeid: str) -> str:
+    """
+    nodeid без суффикса группы xdist (--dist loadgroup добавляет "@<группа>")
+    """
+    return nodeid.split("@", 1)[0]
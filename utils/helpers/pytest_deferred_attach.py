@@ -0,0 +1,120 @@
+"""
+Отложенные Allure-вложения распарсенных и сырых сообщений.
+
+Парсер ws-сообщений и http-клиент прикрепляют к отчёту каждое сообщение. На крупных ответах str()/json.dumps
+таких сообщений занимает большую часть времени теста, а allure-results разрастаются вложениями успешных тестов.
+Во время теста вложения складываются в буфер теста (ссылка на объект и функция рендеринга), а рендерятся
+и прикрепляются только при падении теста (setup/call/teardown) или с опцией --allure-verbose-attachments.
+Отложенные вложения прикрепляются к тесту целиком, а не к шагу, в котором пришло сообщение.
+Вне теста (хуки setup набора, скрипты) вложения прикрепляются сразу, как раньше.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Optional
+
+import pytest
+from allure import attach, attachment_type
+
+from constants.architecture_constants import AllureAttachConstants as Attach_Const
+
+logger = logging.getLogger(__name__)
+
+DEFERRED_ATTACHMENTS_KEY = pytest.StashKey["DeferredAttachments"]()
+
+_current_attachments: contextvars.ContextVar[Optional["DeferredAttachments"]] = contextvars.ContextVar(
+    "current_deferred_attachments", default=None
+)
+
+
+@dataclass
+class _PendingAttachment:
+    render: Callable[[], str]
+    name: str
+    attachment_type: Any
+
+
+class DeferredAttachments:
+    """
+    Буфер вложений одного теста: хранит последние MAX_PENDING вложений, остальные вытесняются
+    """
+
+    def __init__(self, verbose: bool = False, max_pending: int = Attach_Const.MAX_PENDING) -> None:
+        self.verbose = verbose
+        self._pending: Deque[_PendingAttachment] = deque(maxlen=max_pending)
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, render: Callable[[], str], name: str, attachment_type: Any) -> None:
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        self._pending.append(_PendingAttachment(render=render, name=name, attachment_type=attachment_type))
+
+    def flush(self) -> int:
+        """
+        Рендерит и прикрепляет накопленные вложения
+        :return: количество прикреплённых вложений
+        """
+        if self.dropped:
+            _attach_now(
+                lambda: f"Вытеснено ранних вложений: {self.dropped}",
+                name=Attach_Const.DROPPED_ATTACHMENT_NAME,
+                attachment_type=attachment_type.TEXT,
+            )
+        attached = 0
+        while self._pending:
+            pending = self._pending.popleft()
+            _attach_now(pending.render, name=pending.name, attachment_type=pending.attachment_type)
+            attached += 1
+        self.dropped = 0
+        return attached
+
+    def discard(self) -> None:
+        self._pending.clear()
+        self.dropped = 0
+
+
+def attach_deferred(render: Callable[[], str], name: str, attachment_type: Any) -> None:
+    """
+    Прикрепляет вложение при падении текущего теста (или сразу: вне теста и в verbose-режиме)
+    :param render: формирует тело вложения; вызывается только если вложение попадёт в отчёт
+    """
+    attachments = _current_attachments.get()
+    if attachments is None or attachments.verbose:
+        _attach_now(render, name=name, attachment_type=attachment_type)
+    else:
+        attachments.add(render, name=name, attachment_type=attachment_type)
+
+
+def activate_deferred_attachments(attachments: Optional[DeferredAttachments]) -> None:
+    """
+    Делает буфер текущим для контекста (теста или задачи окна --concurrent-offsets), None - вложения сразу
+    """
+    _current_attachments.set(attachments)
+
+
+def flush_item_attachments(item) -> None:
+    """
+    Прикрепляет вложения упавшего теста
+    """
+    if (attachments := item.stash.get(DEFERRED_ATTACHMENTS_KEY, None)) and len(attachments):
+        logger.debug(f"[ALLURE] {item.nodeid}: прикрепляю отложенные вложения ({len(attachments)})")
+        attachments.flush()
+
+
+def discard_item_attachments(item) -> None:
+    if attachments := item.stash.get(DEFERRED_ATTACHMENTS_KEY, None):
+        attachments.discard()
+
+
+def _attach_now(render: Callable[[], str], name: str, attachment_type: Any) -> None:
+    try:
+        attach(render(), name=name, attachment_type=attachment_type)
+    except (KeyError, RuntimeError) as error:
+        logger.debug("Allure attach пропущен: %s", error)
@@ -0,0 +1,152 @@
+"""
+Замер опоздания тестов относительно offset.
+
+Тесты набора выполняются последовательно, поэтому каждый следующий тест может стартовать позже своего offset.
+Для каждого теста фиксируется плановый старт (offset), фактический старт (после offset_wait),
+длительность call-фазы и опоздание; по набору - накопленное опоздание.
+Данные прикладываются к Allure-отчёту теста и сохраняются в JSON по итогам сессии.
+"""
+
+from __future__ import annotations
+
+import json
+import warnings
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from clients.testops_client import logger
+from constants.architecture_constants import ImitatorConstants as ImConst
+from constants.architecture_constants import OffsetDriftConstants as DriftConst
+
+
+class OffsetDriftWarning(UserWarning):
+    """Тест стартовал позже своего offset больше допустимого"""
+
+
+@dataclass
+class DriftRecord:
+    """Опоздание одного теста (секунды от старта core)"""
+
+    nodeid: str
+    suite_name: str
+    scheduled_start_s: float
+    actual_start_s: float
+    lateness_s: float
+    lateness_delta_s: float  # на сколько выросло опоздание относительно предыдущего теста набора
+    duration_s: Optional[float] = None
+
+
+@dataclass
+class SuiteDriftReport:
+    """Опоздания тестов набора"""
+
+    suite_name: str
+    tests: List[DriftRecord] = field(default_factory=list)
+
+    @property
+    def cumulative_drift_s(self) -> float:
+        return self.tests[-1].lateness_s if self.tests else 0.0
+
+    @property
+    def max_lateness_s(self) -> float:
+        return max((test.lateness_s for test in self.tests), default=0.0)
+
+    def to_dict(self) -> dict:
+        return {
+            "suite_name": self.suite_name,
+            "cumulative_drift_s": round(self.cumulative_drift_s, 3),
+            "max_lateness_s": round(self.max_lateness_s, 3),
+            "tests": [asdict(test) for test in self.tests],
+        }
+
+
+class OffsetDriftRecorder:
+    """
+    Сбор опозданий по тестам.
+    Пример использования (conftest):
+    recorder = OffsetDriftRecorder()
+    recorder.record_start(item.nodeid, suite_name, scheduled_start_s, actual_start_s)  # offset_wait
+    recorder.record_duration(item.nodeid, report.duration)                                 # makereport call
+    recorder.write_json("offset_drift.json")                                               # sessionfinish
+    """
+
+    def __init__(self, warning_threshold_s: float = DriftConst.DRIFT_WARNING_THRESHOLD_S) -> None:
+        self._warning_threshold_s = warning_threshold_s
+        self._suites: Dict[str, SuiteDriftReport] = {}
+        self._records: Dict[str, DriftRecord] = {}
+
+    @property
+    def suites(self) -> List[SuiteDriftReport]:
+        return list(self._suites.values())
+
+    def record_start(self, nodeid: str, suite_name: str, scheduled_start_s: float, actual_start_s: float) -> None:
+        """
+        Фиксирует фактический старт теста после ожидания offset
+        """
+        suite_report = self._suites.setdefault(suite_name, SuiteDriftReport(suite_name=suite_name))
+        lateness_s = max(0.0, actual_start_s - scheduled_start_s)
+        previous_lateness_s = suite_report.cumulative_drift_s
+        record = DriftRecord(
+            nodeid=nodeid,
+            suite_name=suite_name,
+            scheduled_start_s=round(scheduled_start_s, 3),
+            actual_start_s=round(actual_start_s, 3),
+            lateness_s=round(lateness_s, 3),
+            lateness_delta_s=round(lateness_s - previous_lateness_s, 3),
+        )
+        suite_report.tests.append(record)
+        self._records[nodeid] = record
+
+        if lateness_s > self._warning_threshold_s:
+            message = (
+                f"[OFFSET DRIFT] Тест {nodeid} стартовал на {lateness_s:.1f} с позже offset "
+                f"({scheduled_start_s:.0f} с), порог {self._warning_threshold_s:.0f} с"
+            )
+            logger.warning(message)
+            warnings.warn(OffsetDriftWarning(message))
+
+    def record_duration(self, nodeid: str, duration_s: float) -> Optional[DriftRecord]:
+        """
+        Фиксирует длительность call-фазы теста
+        """
+        record = self._records.get(nodeid)
+        if record is not None:
+            record.duration_s = round(duration_s, 3)
+        return record
+
+    def format_attachment(self, nodeid: str) -> Optional[str]:
+        """
+        Текст Allure-вложения: запись теста и накопленное опоздание набора на момент теста
+        """
+        record = self._records.get(nodeid)
+        if record is None:
+            return None
+        suite_report = self._suites[record.suite_name]
+        payload = {
+            "test": asdict(record),
+            "suite_cumulative_drift_s": round(suite_report.cumulative_drift_s, 3),
+            "suite_max_lateness_s": round(suite_report.max_lateness_s, 3),
+            "warning_threshold_s": self._warning_threshold_s,
+        }
+        return json.dumps(payload, ensure_ascii=False, indent=2)
+
+    def write_json(self, file_path: str) -> Optional[Path]:
+        """
+        Сохраняет отчёт по всем наборам. Пустой отчёт не сохраняется
+        """
+        if not self._suites:
+            return None
+        path = Path(file_path)
+        report = {
+            "warning_threshold_s": self._warning_threshold_s,
+            "suites": [suite_report.to_dict() for suite_report in self._suites.values()],
+        }
+        with path.open("w", encoding=ImConst.ENCODING_UTF_8) as report_file:
+            json.dump(report, report_file, ensure_ascii=False, indent=2)
+        for suite_report in self._suites.values():
+            logger.info(
+                f"[OFFSET DRIFT] Набор {suite_report.suite_name}: накопленное опоздание "
+                f"{suite_report.cumulative_drift_s:.1f} с, максимальное {suite_report.max_lateness_s:.1f} с"
+            )
+        return path
@@ -0,0 +1,370 @@
+"""
+Параллельное выполнение тестов набора с одинаковым offset (--concurrent-offsets).
+
+Тесты одного набора данных с одинаковым offset (например, шесть проверок утечки на 65 мин.) образуют окно.
+Когда pytest доходит до вызова первого теста окна, все тесты окна запускаются одновременно
+на одном event loop (async-тесты - задачами, sync-тесты - через asyncio.to_thread),
+каждый со своим ws/http клиентом. Результаты окна сохраняются, и в call-фазе каждого теста
+pytest получает именно его результат: исключение (fail/skip/soft assertions) и Allure-шаги/вложения.
+
+Allure: на время выполнения окна плагины allure_commons, принимающие шаги/вложения/dynamic-метки,
+подменяются маршрутизатором. Вызовы из задач окна (contextvar задачи) он раскладывает по буферам тестов,
+остальные вызовы (поток WS-пула, prefetch журнала) передаёт настоящим плагинам без изменений.
+В call-фазе теста буфер воспроизводится в настоящий Allure-listener уже в контексте этого теста.
+
+Старт и длительность тестов окна для замера опоздания (offset_drift) берутся из результатов окна:
+тесты 2..N проходят setup и call-фазу pytest уже после выполнения окна.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+from allure_commons import hookimpl as allure_hookimpl
+from allure_commons import plugin_manager as allure_plugin_manager
+from allure_commons._hooks import AllureDeveloperHooks, AllureUserHooks
+from pluggy import PluginManager
+
+from clients.testops_client import logger
+from constants.test_constants import BaseTN3Constants
+from utils.helpers.pytest_auth import init_http_stand_client, open_ws_stand_client
+from utils.helpers.pytest_deferred_attach import DeferredAttachments, activate_deferred_attachments
+from utils.helpers.suite_packing import get_suite_imitator_start_time
+
+# Фикстуры, которые окно умеет создавать само (параметры параметризации поддерживаются всегда)
+WS_CLIENT_FIXTURE = "ws_client"
+HTTP_CLIENT_FIXTURE = "http_client"
+IMITATOR_START_TIME_FIXTURE = "imitator_start_time"
+SUPPORTED_FIXTURES = {WS_CLIENT_FIXTURE, HTTP_CLIENT_FIXTURE, IMITATOR_START_TIME_FIXTURE}
+
+# Hook-и allure_commons, которые тест вызывает через allure.step/attach/dynamic
+WINDOW_ALLURE_HOOKS = (
+    "start_step",
+    "stop_step",
+    "attach_data",
+    "attach_file",
+    "add_title",
+    "add_description",
+    "add_description_html",
+    "add_label",
+    "add_link",
+    "add_parameter",
+)
+
+OFFSET_WINDOW_KEY = pytest.StashKey["OffsetWindow"]()
+
+_current_window_item: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_window_item", default=None
+)
+
+
+@dataclass
+class WindowItemResult:
+    """Результат теста, выполненного в окне"""
+
+    exception: Optional[BaseException] = None
+    allure_calls: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+    started: Optional[float] = None  # time.monotonic() старта теста в окне
+    duration_s: float = 0.0
+
+
+@dataclass
+class OffsetWindow:
+    """Группа тестов одного набора с одинаковым offset"""
+
+    suite_name: str
+    offset: float
+    items: List[Any] = field(default_factory=list)
+    test_functions: Dict[str, Callable] = field(default_factory=dict)
+    results: Dict[str, WindowItemResult] = field(default_factory=dict)
+    executed: bool = False
+
+
+class _WindowAllureRouter:
+    """
+    Плагин allure_commons на время окна: вызовы из задач окна складываются в буфер теста этой задачи,
+    вызовы без теста окна в contextvar передаются подменённым плагинам
+    """
+
+    def __init__(self, window: OffsetWindow, plugins: List[Tuple[Any, Optional[str]]]) -> None:
+        self._window = window
+        self._forward_manager = PluginManager("allure")
+        self._forward_manager.add_hookspecs(AllureUserHooks)
+        self._forward_manager.add_hookspecs(AllureDeveloperHooks)
+        for plugin, name in plugins:
+            self._forward_manager.register(plugin, name)
+
+    def _route(self, hook_name: str, **kwargs) -> None:
+        nodeid = _current_window_item.get()
+        if nodeid is None:
+            getattr(self._forward_manager.hook, hook_name)(**kwargs)
+            return
+        self._window.results.setdefault(nodeid, WindowItemResult()).allure_calls.append((hook_name, kwargs))
+
+    @allure_hookimpl
+    def start_step(self, uuid, title, params):
+        self._route("start_step", uuid=uuid, title=title, params=params)
+
+    @allure_hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        self._route("stop_step", uuid=uuid, exc_type=exc_type, exc_val=exc_val, exc_tb=exc_tb)
+
+    @allure_hookimpl
+    def attach_data(self, body, name, attachment_type, extension):
+        self._route("attach_data", body=body, name=name, attachment_type=attachment_type, extension=extension)
+
+    @allure_hookimpl
+    def attach_file(self, source, name, attachment_type, extension):
+        self._route("attach_file", source=source, name=name, attachment_type=attachment_type, extension=extension)
+
+    @allure_hookimpl
+    def add_title(self, test_title):
+        self._route("add_title", test_title=test_title)
+
+    @allure_hookimpl
+    def add_description(self, test_description):
+        self._route("add_description", test_description=test_description)
+
+    @allure_hookimpl
+    def add_description_html(self, test_description_html):
+        self._route("add_description_html", test_description_html=test_description_html)
+
+    @allure_hookimpl
+    def add_label(self, label_type, labels):
+        self._route("add_label", label_type=label_type, labels=labels)
+
+    @allure_hookimpl
+    def add_link(self, url, link_type, name):
+        self._route("add_link", url=url, link_type=link_type, name=name)
+
+    @allure_hookimpl
+    def add_parameter(self, name, value, excluded, mode):
+        self._route("add_parameter", name=name, value=value, excluded=excluded, mode=mode)
+
+
+class OffsetWindowExecutor:
+    """
+    Формирует окна одинакового offset после сбора тестов и выполняет их конкурентно.
+    Пример использования (conftest):
+    executor = OffsetWindowExecutor(config.group_state)
+    executor.build_windows(session.items)                       # pytest_collection_finish
+    if executor.run_item(pyfuncitem): return True               # pytest_pyfunc_call
+    """
+
+    def __init__(self, group_state: dict) -> None:
+        self._group_state = group_state
+
+    @staticmethod
+    def is_windowed(item) -> bool:
+        return item.stash.get(OFFSET_WINDOW_KEY, None) is not None
+
+    def build_windows(self, items: List[Any]) -> List[OffsetWindow]:
+        """
+        Объединяет подряд идущие поддерживаемые тесты одного набора с одинаковым offset.
+        Окна из одного теста не создаются - такой тест выполняется штатно.
+        """
+        windows: List[OffsetWindow] = []
+        current: Optional[OffsetWindow] = None
+        for item in items:
+            key = self._get_window_key(item)
+            if key is None:
+                current = None
+                continue
+            if current is None or (current.suite_name, current.offset) != key:
+                current = OffsetWindow(suite_name=key[0], offset=key[1])
+                windows.append(current)
+            current.items.append(item)
+
+        windows = [window for window in windows if len(window.items) > 1]
+        for window in windows:
+            for item in window.items:
+                # item.obj запоминается до запуска: pytest-asyncio подменяет его sync-обёрткой на время runtest
+                window.test_functions[item.nodeid] = item.obj
+                item.stash[OFFSET_WINDOW_KEY] = window
+            logger.info(
+                f"[OFFSET WINDOW] Набор {window.suite_name}, offset {window.offset} мин.: "
+                f"{len(window.items)} тестов выполняются параллельно"
+            )
+        return windows
+
+    def run_item(self, item) -> bool:
+        """
+        Call-фаза теста из окна. Первый тест окна запускает выполнение всего окна,
+        затем каждый тест воспроизводит свои Allure-вызовы и поднимает своё исключение.
+        :return: True, если тест обработан окном (pytest_pyfunc_call не должен вызывать тест повторно)
+        """
+        window: Optional[OffsetWindow] = item.stash.get(OFFSET_WINDOW_KEY, None)
+        if window is None:
+            return False
+        if not window.executed:
+            self._execute_window(window)
+
+        result = window.results.setdefault(item.nodeid, WindowItemResult())
+        allure_calls, result.allure_calls = result.allure_calls, []
+        for hook_name, kwargs in allure_calls:
+            getattr(allure_plugin_manager.hook, hook_name)(**kwargs)
+        exception, result.exception = result.exception, None
+        if exception is not None:
+            raise exception
+        return True
+
+    @staticmethod
+    def is_window_executed(item) -> bool:
+        """
+        Окно теста уже выполнено: setup теста идёт после его фактического выполнения
+        """
+        window: Optional[OffsetWindow] = item.stash.get(OFFSET_WINDOW_KEY, None)
+        return window is not None and window.executed
+
+    @staticmethod
+    def get_item_duration(item) -> Optional[float]:
+        """
+        Длительность теста внутри окна (call-фаза pytest длится всё окно или ~0)
+        """
+        window: Optional[OffsetWindow] = item.stash.get(OFFSET_WINDOW_KEY, None)
+        result = window.results.get(item.nodeid) if window is not None else None
+        return result.duration_s if result is not None and result.started is not None else None
+
+    def _get_window_key(self, item) -> Optional[Tuple[str, float]]:
+        """
+        Ключ окна (набор, offset) для поддерживаемого теста, иначе None
+        """
+        suite_marker = item.get_closest_marker("test_suite_name")
+        offset_marker = item.get_closest_marker("offset")
+        if not suite_marker or not offset_marker:
+            return None
+        try:
+            offset = float(offset_marker.args[0])
+        except (TypeError, ValueError):
+            return None
+        if item.get_closest_marker("critical_stop"):
+            # Падение critical_stop должно останавливать сессию до запуска следующих тестов
+            return None
+        callspec_params = set(getattr(getattr(item, "callspec", None), "params", {}))
+        argnames = set(item._fixtureinfo.argnames)
+        if not argnames.issubset(callspec_params | SUPPORTED_FIXTURES):
+            return None
+        return suite_marker.args[0], offset
+
+    def _execute_window(self, window: OffsetWindow) -> None:
+        """
+        Выполняет все тесты окна на отдельном event loop с перехватом Allure-вызовов.
+        Проверка готовности набора (require_suite_infra) выполняется здесь для всех тестов окна:
+        их собственный setup проходит уже после выполнения окна
+        """
+        window.executed = True
+        if self._get_suite_gate_error() is not None:
+            for item in window.items:
+                window.results.setdefault(item.nodeid, WindowItemResult()).exception = self._get_suite_gate_error()
+            return
+
+        routed_plugins = {
+            impl.plugin
+            for hook_name in WINDOW_ALLURE_HOOKS
+            for impl in getattr(allure_plugin_manager.hook, hook_name).get_hookimpls()
+        }
+        original_plugins = [(plugin, allure_plugin_manager.get_name(plugin)) for plugin in routed_plugins]
+        for plugin, _ in original_plugins:
+            allure_plugin_manager.unregister(plugin)
+        router = _WindowAllureRouter(window, original_plugins)
+        allure_plugin_manager.register(router)
+
+        started = time.monotonic()
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._run_window_items(window))
+        finally:
+            loop.close()
+            allure_plugin_manager.unregister(router)
+            for plugin, name in original_plugins:
+                allure_plugin_manager.register(plugin, name)
+        self._record_drift_starts(window)
+        logger.info(
+            f"[OFFSET WINDOW] Набор {window.suite_name}, offset {window.offset} мин.: "
+            f"окно выполнено за {time.monotonic() - started:.1f} с"
+        )
+
+    def _get_suite_gate_error(self) -> Optional[BaseException]:
+        """
+        Исключение для тестов окна, если инфраструктура набора не готова или watchdog остановил набор
+        """
+        cfg = self._group_state
+        if cfg.get("current_suite") and not cfg.get("suite_infra_ready"):
+            return pytest.skip.Exception("[SETUP] [ERROR] Набор пропущен: инфраструктура не готова")
+        if (watchdog := cfg.get("suite_watchdog")) and watchdog.is_aborted:
+            return pytest.fail.Exception(watchdog.abort_reason)
+        return None
+
+    def _record_drift_starts(self, window: OffsetWindow) -> None:
+        """
+        Фактический старт каждого теста окна для замера опоздания (offset_wait тестов окна его не пишет)
+        """
+        recorder = self._group_state.get("offset_drift_recorder")
+        suite_start_time = self._group_state.get("suite_start_time")
+        if recorder is None or not suite_start_time:
+            return
+        scheduled_start_s = window.offset * BaseTN3Constants.SEC_PER_MIN
+        for item in window.items:
+            result = window.results.get(item.nodeid)
+            if result is not None and result.started is not None:
+                actual_start_s = result.started - suite_start_time
+                recorder.record_start(item.nodeid, window.suite_name, scheduled_start_s, actual_start_s)
+
+    async def _run_window_items(self, window: OffsetWindow) -> None:
+        # gather создаётся внутри loop окна: вне запущенного loop он привязался бы к loop потока по умолчанию
+        await asyncio.gather(*(self._run_window_item(window, item) for item in window.items))
+
+    async def _run_window_item(self, window: OffsetWindow, item) -> None:
+        """
+        Выполняет один тест окна: собирает аргументы, вызывает тест, сохраняет исключение
+        """
+        _current_window_item.set(item.nodeid)
+        result = window.results.setdefault(item.nodeid, WindowItemResult())
+        # Свой буфер отложенных вложений: при падении они попадут в Allure-вызовы этого теста
+        attachments = DeferredAttachments(verbose=self._group_state.get("allure_verbose_attachments", False))
+        activate_deferred_attachments(attachments)
+        result.started = started = time.monotonic()
+        test_function = window.test_functions[item.nodeid]
+        argnames = item._fixtureinfo.argnames
+        callspec_params = getattr(getattr(item, "callspec", None), "params", {})
+        try:
+            kwargs = {name: callspec_params[name] for name in argnames if name in callspec_params}
+            if HTTP_CLIENT_FIXTURE in argnames:
+                kwargs[HTTP_CLIENT_FIXTURE] = init_http_stand_client(self._group_state)
+            if IMITATOR_START_TIME_FIXTURE in argnames:
+                kwargs[IMITATOR_START_TIME_FIXTURE] = self._get_imitator_start_time(window.suite_name)
+
+            if WS_CLIENT_FIXTURE in argnames:
+                async with open_ws_stand_client(self._group_state) as ws_client:
+                    kwargs[WS_CLIENT_FIXTURE] = ws_client
+                    await self._call_test(test_function, kwargs)
+            else:
+                await self._call_test(test_function, kwargs)
+        except (KeyboardInterrupt, SystemExit):
+            raise
+        except BaseException as error:
+            result.exception = error
+        finally:
+            if result.exception is not None and not isinstance(result.exception, pytest.skip.Exception):
+                attachments.flush()
+            result.duration_s = time.monotonic() - started
+
+    @staticmethod
+    async def _call_test(test_function: Callable, kwargs: dict) -> None:
+        if inspect.iscoroutinefunction(test_function):
+            await test_function(**kwargs)
+        else:
+            # contextvar задачи копируется в поток, поэтому Allure-вызовы попадут в буфер этого теста
+            await asyncio.to_thread(test_function, **kwargs)
+
+    def _get_imitator_start_time(self, suite_name: str):
+        start_time = get_suite_imitator_start_time(self._group_state, suite_name)
+        if start_time is None:
+            pytest.fail("imitator_start_time не установлен. Убедитесь что тест запущен после инициализации имитатора.")
+        return start_time
@@ -0,0 +1,86 @@
+"""
+Параллельный прогон наборов данных на пуле стендов (pytest-xdist).
+
+Каждый xdist-воркер арендует свой стенд из пула (--stand-pool / STAND_POOL) на всю сессию,
+наборы данных распределяются по воркерам целиком через маркер xdist_group (--dist loadgroup).
+Без пула поведение прежнее: один процесс, один стенд из STAND_NAME.
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from clients.testops_client import logger
+from constants.architecture_constants import EnvKeyConstants as EnvConst
+from constants.architecture_constants import StandLeaseConstants as LeaseConst
+from infra.stand_lease_manager import StandLeaseError, StandLeaseManager
+
+
+def is_xdist_worker(config) -> bool:
+    """Процесс является воркером pytest-xdist."""
+    return hasattr(config, "workerinput")
+
+
+def is_xdist_controller(config) -> bool:
+    """Процесс является управляющим процессом pytest-xdist (тесты не выполняет)."""
+    if is_xdist_worker(config):
+        return False
+    return config.getoption("dist", default="no") != "no"
+
+
+def get_worker_id(config) -> str:
+    """Идентификатор воркера xdist (gw0, gw1, ...) или master без xdist."""
+    if is_xdist_worker(config):
+        return config.workerinput.get("workerid", "master")
+    return os.environ.get(LeaseConst.XDIST_WORKER_ENV_KEY, "master")
+
+
+def get_stand_pool(config) -> list[str]:
+    """Список стендов из --stand-pool, иначе из переменной окружения STAND_POOL."""
+    stand_pool_option = config.getoption("--stand-pool") or os.environ.get(EnvConst.STAND_POOL)
+    return StandLeaseManager.parse_stand_pool(stand_pool_option)
+
+
+def is_stand_pool_enabled(config) -> bool:
+    return bool(get_stand_pool(config))
+
+
+def acquire_session_stand(config) -> None:
+    """
+    Арендует стенд из пула для текущего процесса и подставляет его в STAND_NAME,
+    чтобы build_stand_host и StandSetupManager работали с арендованным стендом.
+    Управляющий процесс xdist стенд не арендует.
+    """
+    cfg = config.group_state
+    cfg["stand_name"] = os.environ.get(EnvConst.STAND_NAME)
+    stand_pool = get_stand_pool(config)
+    if not stand_pool or is_xdist_controller(config):
+        return
+
+    worker_id = get_worker_id(config)
+    lease_manager = StandLeaseManager(stand_pool, owner=worker_id)
+    worker_index = int(worker_id[2:]) if worker_id.startswith("gw") and worker_id[2:].isdigit() else 0
+    try:
+        stand_name = lease_manager.acquire(start_index=worker_index)
+    except StandLeaseError as error:
+        pytest.exit(f"[SETUP] [ERROR] Воркер {worker_id}: {error}")
+
+    os.environ[EnvConst.STAND_NAME] = stand_name
+    cfg["stand_name"] = stand_name
+    cfg["stand_lease_manager"] = lease_manager
+    logger.info(f"[SETUP] Воркер {worker_id} работает со стендом {stand_name}")
+
+
+def release_session_stand(config) -> None:
+    """Освобождает арендованный стенд в конце сессии."""
+    cfg = getattr(config, "group_state", {})
+    if lease_manager := cfg.get("stand_lease_manager"):
+        lease_manager.release()
+        cfg["stand_lease_manager"] = None
+
+
+def add_suite_xdist_group(item, suite_name: str) -> None:
+    """Все тесты набора данных выполняются на одном воркере (один стенд, один имитатор)."""
+    item.add_marker(pytest.mark.xdist_group(name=suite_name))
@@ -0,0 +1,277 @@
+"""
+План прогона (--plan): временная шкала выбранных тестов без обращения к стенду.
+
+Для каждой сессии стенда (набор данных или пакет наборов --pack-suites) считается:
+- оценка setup/teardown стенда;
+- длительность имитатора (compute_imitator_duration);
+- плановый старт каждого теста по offset и ожидаемый старт с учётом последовательного выполнения;
+- пересечения тестов (плановые интервалы выполнения накладываются друг на друга);
+- критический тест: удаление какого одного теста сильнее всего сокращает сессию.
+Итог - ожидаемое общее время прогона. План печатается в консоль и сохраняется в JSON (--plan-file).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from constants.architecture_constants import ImitatorConstants as ImConst
+from constants.architecture_constants import TimelinePlanConstants as PlanConst
+from constants.test_constants import BaseTN3Constants
+
+
+@dataclass
+class PlannedTest:
+    """Тест на временной шкале сессии (секунды от старта core)"""
+
+    nodeid: str
+    suite_name: str
+    offset_m: Optional[float]
+    scheduled_start_s: Optional[float]
+    expected_start_s: float
+    expected_end_s: float
+    drift_s: float
+    overlaps_with: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SessionPlan:
+    """Сессия стенда: один набор данных или пакет наборов"""
+
+    session_key: str
+    suites: List[str]
+    setup_estimate_s: float
+    teardown_estimate_s: float
+    imitator_duration_m: Dict[str, Optional[float]]
+    run_duration_s: float
+    wall_time_s: float
+    session_start_s: float
+    critical_test: Optional[str]
+    critical_test_reduction_s: float
+    tests: List[PlannedTest] = field(default_factory=list)
+
+
+@dataclass
+class TimelinePlan:
+    """План всего прогона"""
+
+    concurrent_offsets: bool
+    test_duration_estimate_s: float
+    total_wall_time_s: float
+    sessions: List[SessionPlan] = field(default_factory=list)
+
+
+class TimelinePlanner:
+    """
+    Строит план прогона по итоговому списку тестов.
+    Пример использования (conftest):
+    planner = TimelinePlanner(compute_imitator_duration, _get_session_key)
+    plan = planner.build(session.items)
+    planner.write_json(plan, "test_plan.json")
+    """
+
+    def __init__(
+        self,
+        duration_fn: Callable,
+        session_key_fn: Callable,
+        concurrent_offsets: bool = False,
+        setup_estimate_s: float = PlanConst.SUITE_SETUP_ESTIMATE_S,
+        teardown_estimate_s: float = PlanConst.SUITE_TEARDOWN_ESTIMATE_S,
+        test_duration_estimate_s: float = PlanConst.TEST_DURATION_ESTIMATE_S,
+    ) -> None:
+        self._duration_fn = duration_fn
+        self._session_key_fn = session_key_fn
+        self._concurrent_offsets = concurrent_offsets
+        self._setup_estimate_s = setup_estimate_s
+        self._teardown_estimate_s = teardown_estimate_s
+        self._test_duration_estimate_s = test_duration_estimate_s
+
+    def build(self, items: List) -> TimelinePlan:
+        """
+        Строит план. Порядок сессий и тестов - порядок выполнения pytest (после сортировки по offset)
+        """
+        sessions_items: Dict[str, List] = {}
+        for item in items:
+            session_key = self._session_key_fn(item) or ""
+            sessions_items.setdefault(session_key, []).append(item)
+
+        plan = TimelinePlan(
+            concurrent_offsets=self._concurrent_offsets,
+            test_duration_estimate_s=self._test_duration_estimate_s,
+            total_wall_time_s=0.0,
+        )
+        for session_key, session_items in sessions_items.items():
+            session_plan = self._build_session(session_key, session_items, session_start_s=plan.total_wall_time_s)
+            plan.sessions.append(session_plan)
+            plan.total_wall_time_s += session_plan.wall_time_s
+        return plan
+
+    def format_report(self, plan: TimelinePlan) -> List[str]:
+        """
+        Текстовый отчёт для консоли
+        """
+        lines = [f"[PLAN] Сессий стенда: {len(plan.sessions)}, ожидаемое время прогона: {_fmt(plan.total_wall_time_s)}"]
+        for session_plan in plan.sessions:
+            durations = ", ".join(
+                f"{suite}={duration if duration is not None else '?'} мин."
+                for suite, duration in session_plan.imitator_duration_m.items()
+            )
+            lines.append("")
+            lines.append(
+                f"[PLAN] {session_plan.session_key}: старт через {_fmt(session_plan.session_start_s)}, "
+                f"setup ~{_fmt(session_plan.setup_estimate_s)}, тесты {_fmt(session_plan.run_duration_s)}, "
+                f"всего {_fmt(session_plan.wall_time_s)}. Имитатор: {durations}"
+            )
+            for test in session_plan.tests:
+                offset = f"{test.offset_m:g} мин." if test.offset_m is not None else "без offset"
+                drift = f" (+{_fmt(test.drift_s)})" if test.drift_s > 0 else ""
+                overlap = f" пересекается с {len(test.overlaps_with)}" if test.overlaps_with else ""
+                lines.append(f"    {offset:>12} -> {_fmt(test.expected_start_s)}{drift}{overlap}  {test.nodeid}")
+            if session_plan.critical_test:
+                lines.append(
+                    f"[PLAN] Критический тест {session_plan.session_key}: {session_plan.critical_test} "
+                    f"(без него сессия короче на {_fmt(session_plan.critical_test_reduction_s)})"
+                )
+        return lines
+
+    @staticmethod
+    def write_json(plan: TimelinePlan, file_path: str) -> Path:
+        path = Path(file_path)
+        with path.open("w", encoding=ImConst.ENCODING_UTF_8) as plan_file:
+            json.dump(asdict(plan), plan_file, ensure_ascii=False, indent=2)
+        return path
+
+    def _build_session(self, session_key: str, session_items: List, session_start_s: float) -> SessionPlan:
+        suites: List[str] = []
+        first_suite_items = {}
+        for item in session_items:
+            suite_name = _get_suite_name(item)
+            if suite_name not in first_suite_items:
+                suites.append(suite_name)
+                first_suite_items[suite_name] = item
+
+        imitator_duration_m = {
+            suite_name: self._get_imitator_duration(item, suite_name) for suite_name, item in first_suite_items.items()
+        }
+
+        offsets = [_get_offset_m(item) for item in session_items]
+        schedule = self._simulate(offsets)
+        run_duration_s = max((end for _, end in schedule), default=0.0)
+
+        tests: List[PlannedTest] = []
+        for item, offset_m, (start_s, end_s) in zip(session_items, offsets, schedule):
+            scheduled_start_s = offset_m * BaseTN3Constants.SEC_PER_MIN if offset_m is not None else None
+            tests.append(
+                PlannedTest(
+                    nodeid=item.nodeid,
+                    suite_name=_get_suite_name(item),
+                    offset_m=offset_m,
+                    scheduled_start_s=scheduled_start_s,
+                    expected_start_s=start_s,
+                    expected_end_s=end_s,
+                    drift_s=start_s - scheduled_start_s if scheduled_start_s is not None else 0.0,
+                )
+            )
+        self._fill_overlaps(tests)
+        critical_test, critical_reduction_s = self._find_critical_test(session_items, offsets, run_duration_s)
+
+        wall_time_s = (
+            self._setup_estimate_s + ImConst.CORE_START_DELAY_S + run_duration_s + self._teardown_estimate_s
+        )
+        return SessionPlan(
+            session_key=session_key,
+            suites=suites,
+            setup_estimate_s=self._setup_estimate_s,
+            teardown_estimate_s=self._teardown_estimate_s,
+            imitator_duration_m=imitator_duration_m,
+            run_duration_s=run_duration_s,
+            wall_time_s=wall_time_s,
+            session_start_s=session_start_s,
+            critical_test=critical_test,
+            critical_test_reduction_s=critical_reduction_s,
+            tests=tests,
+        )
+
+    def _simulate(self, offsets: List[Optional[float]]) -> List[Tuple[float, float]]:
+        """
+        Ожидаемые интервалы выполнения тестов: тест стартует не раньше своего offset и не раньше
+        окончания предыдущего. При --concurrent-offsets тесты с одинаковым offset стартуют вместе.
+        """
+        schedule: List[Tuple[float, float]] = []
+        clock = 0.0
+        window_offset: Optional[float] = None
+        window_start = 0.0
+        for offset_m in offsets:
+            offset_s = offset_m * BaseTN3Constants.SEC_PER_MIN if offset_m is not None else 0.0
+            if self._concurrent_offsets and offset_m is not None and offset_m == window_offset:
+                start_s = window_start
+            else:
+                start_s = max(offset_s, clock)
+                window_offset, window_start = offset_m, start_s
+            end_s = start_s + self._test_duration_estimate_s
+            clock = max(clock, end_s)
+            schedule.append((start_s, end_s))
+        return schedule
+
+    @staticmethod
+    def _fill_overlaps(tests: List[PlannedTest]) -> None:
+        """
+        Пересечения по плановым интервалам [offset, offset + оценка длительности)
+        """
+        for index, test in enumerate(tests):
+            if test.scheduled_start_s is None:
+                continue
+            for other in tests[index + 1 :]:
+                if other.scheduled_start_s is None:
+                    continue
+                test_end = test.scheduled_start_s + (test.expected_end_s - test.expected_start_s)
+                other_end = other.scheduled_start_s + (other.expected_end_s - other.expected_start_s)
+                if test.scheduled_start_s < other_end and other.scheduled_start_s < test_end:
+                    test.overlaps_with.append(other.nodeid)
+                    other.overlaps_with.append(test.nodeid)
+
+    def _find_critical_test(
+        self, session_items: List, offsets: List[Optional[float]], run_duration_s: float
+    ) -> Tuple[Optional[str], float]:
+        """
+        Тест, без которого сессия сокращается сильнее всего
+        """
+        best_nodeid: Optional[str] = None
+        best_reduction_s = 0.0
+        for index, item in enumerate(session_items):
+            reduced_offsets = offsets[:index] + offsets[index + 1 :]
+            reduced_duration_s = max((end for _, end in self._simulate(reduced_offsets)), default=0.0)
+            reduction_s = run_duration_s - reduced_duration_s
+            if reduction_s > best_reduction_s:
+                best_nodeid, best_reduction_s = item.nodeid, reduction_s
+        return best_nodeid, best_reduction_s
+
+    def _get_imitator_duration(self, item, suite_name: str) -> Optional[float]:
+        try:
+            return self._duration_fn(item, suite_name)
+        except pytest.fail.Exception:
+            return None
+
+
+def _get_suite_name(item) -> str:
+    suite_marker = item.get_closest_marker("test_suite_name")
+    return suite_marker.args[0] if suite_marker else ""
+
+
+def _get_offset_m(item) -> Optional[float]:
+    if offset_marker := item.get_closest_marker("offset"):
+        try:
+            return float(offset_marker.args[0])
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def _fmt(seconds: float) -> str:
+    minutes, secs = divmod(int(round(seconds)), BaseTN3Constants.SEC_PER_MIN)
+    hours, minutes = divmod(minutes, BaseTN3Constants.SEC_PER_MIN)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
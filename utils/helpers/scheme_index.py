@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from constants.architecture_constants import SchemeIndexConstants as Index_Const
+from constants.test_constants import BaseTN3Constants as TestConst
+from models.subscribe_common_scheme_model import DiagnosticArea, FlowArea
+from utils.helpers.identity_cache import IdentityCache
+
+
+class SchemeIndex:
+    """
+    Индекс ДУ схемы (flowAreas из SubscribeCommonSchemeReply): словари по id ДУ, pipe id и имени,
+    самый протяженный участок карты течения и базовые ДУ. Строится один раз на список flowAreas.
+    Дубликаты ДУ разрешаются как при поиске перебором: остаётся ДУ с наибольшим количеством pipeIds,
+    при равенстве - первый по порядку flowAreas.
+    Пример использования:
+    scheme_index = SchemeIndex.of(parsed_payload.replyContent.flowAreas)
+    diagnostic_area = scheme_index.by_pipe_id(pipe_id)
+    """
+
+    def __init__(self, flow_areas: Optional[List[FlowArea]]) -> None:
+        self.flow_areas: List[FlowArea] = flow_areas or []
+        self._by_id: Dict[Any, DiagnosticArea] = {}
+        self._by_pipe_id: Dict[Any, DiagnosticArea] = {}
+        self._by_name: Dict[str, DiagnosticArea] = {}
+        for flow_area in self.flow_areas:
+            for diagnostic_area in flow_area.diagnosticAreas or ():
+                self._put(self._by_id, diagnostic_area.id, diagnostic_area)
+                for pipe_id in diagnostic_area.pipeIds or ():
+                    self._put(self._by_pipe_id, pipe_id, diagnostic_area)
+                if (name := getattr(diagnostic_area, "name", None)) is not None:
+                    self._put(self._by_name, name, diagnostic_area)
+        self.longest_flow_area: Optional[FlowArea] = self._find_longest_flow_area(self.flow_areas)
+
+    @classmethod
+    def of(cls, flow_areas: Optional[List[FlowArea]]) -> SchemeIndex:
+        """
+        Индекс для списка flowAreas из кэша последних индексов (пересобирается, если список изменился)
+        """
+        if not flow_areas:
+            return cls(flow_areas)
+        return _INDEX_CACHE.get_or_build(flow_areas, cls)
+
+    @classmethod
+    def from_reply(cls, parsed_payload: Any) -> SchemeIndex:
+        return cls.of(getattr(getattr(parsed_payload, "replyContent", None), "flowAreas", None))
+
+    def by_id(self, id_value: Any) -> Optional[DiagnosticArea]:
+        return self._by_id.get(id_value)
+
+    def by_pipe_id(self, pipe_id: Any) -> Optional[DiagnosticArea]:
+        return self._by_pipe_id.get(pipe_id)
+
+    def by_name(self, name: str) -> Optional[DiagnosticArea]:
+        return self._by_name.get(name)
+
+    def by_ids(self, id_list: Iterable[Any]) -> List[DiagnosticArea]:
+        return [area for id_value in id_list if (area := self._by_id.get(id_value)) is not None]
+
+    def by_pipe_ids(self, pipe_ids: Iterable[Any]) -> List[DiagnosticArea]:
+        return [area for pipe_id in pipe_ids if (area := self._by_pipe_id.get(pipe_id)) is not None]
+
+    def base_diagnostic_areas(self) -> List[DiagnosticArea]:
+        """
+        Базовые ДУ (TestConst.DIAGNOSTIC_AREA_BASE_IDS) в порядке констант
+        """
+        return self.by_ids(base_id for base_id, _ in TestConst.DIAGNOSTIC_AREA_BASE_IDS.values())
+
+    def base_neighbors(self, name: str) -> Tuple[Optional[DiagnosticArea], List[DiagnosticArea]]:
+        """
+        Базовый ДУ по имени из TestConst.DIAGNOSTIC_AREA_BASE_IDS и его соседние ДУ
+        """
+        base_id, neighbor_ids = TestConst.DIAGNOSTIC_AREA_BASE_IDS.get(name, (None, None))
+        return self.by_id(base_id), self.by_ids(neighbor_ids or ())
+
+    @staticmethod
+    def _put(index: Dict[Any, DiagnosticArea], key: Any, diagnostic_area: DiagnosticArea) -> None:
+        current = index.get(key)
+        if current is None or _pipe_ids_count(diagnostic_area) > _pipe_ids_count(current):
+            index[key] = diagnostic_area
+
+    @staticmethod
+    def _find_longest_flow_area(flow_areas: List[FlowArea]) -> Optional[FlowArea]:
+        if not flow_areas:
+            return None
+        try:
+            return max(flow_areas, key=lambda flow_area: len(flow_area.diagnosticAreas))
+        except (TypeError, ValueError):
+            return None
+
+
+def _fingerprint(flow_areas: List[FlowArea]) -> Tuple[int, ...]:
+    return (len(flow_areas), *(len(flow_area.diagnosticAreas or ()) for flow_area in flow_areas))
+
+
+_INDEX_CACHE: IdentityCache[List[FlowArea], SchemeIndex] = IdentityCache(Index_Const.CACHE_SIZE, _fingerprint)
+
+
+def _pipe_ids_count(diagnostic_area: DiagnosticArea) -> int:
+    return len(diagnostic_area.pipeIds or ())
@@ -0,0 +1,114 @@
+"""
+Планировщик пакетов наборов данных (--pack-suites).
+
+Наборы данных на разных ТУ (tn{id}_tags.txt) не мешают друг другу, поэтому их можно прогонять
+в одной сессии стенда: одна остановка/очистка/запуск контейнеров, по имитатору на каждый набор,
+тесты наборов выполняются по общей шкале offset.
+
+Наборы совместимы, если:
+- ТУ наборов не пересекаются;
+- длительности имитаторов отличаются не больше, чем на DURATION_TOLERANCE_M;
+- ни один набор не использует LDS Configurator (setup/teardown СОУ рассчитан на один ТУ);
+- совпадают measure_conversion_rules (signal_unit_conversion_rules.json общий для стенда).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from constants.architecture_constants import SuitePackingConstants as PackConst
+
+
+@dataclass(frozen=True)
+class SuitePackCandidate:
+    """Набор данных, который может попасть в пакет"""
+
+    suite_name: str
+    data_id: int
+    data_name: str
+    tu_id: int
+    duration_m: float
+    measure_conversion_rules: Optional[Any] = None
+    use_lds_configurator: bool = False
+
+
+@dataclass
+class SuitePack:
+    """Пакет наборов данных, прогоняемых в одной сессии стенда"""
+
+    suites: List[SuitePackCandidate] = field(default_factory=list)
+
+    @property
+    def name(self) -> str:
+        return PackConst.PACK_NAME_SEPARATOR.join(suite.suite_name for suite in self.suites)
+
+    @property
+    def tu_ids(self) -> set[int]:
+        return {suite.tu_id for suite in self.suites}
+
+    @property
+    def duration_m(self) -> float:
+        return max(suite.duration_m for suite in self.suites)
+
+    @property
+    def is_packed(self) -> bool:
+        return len(self.suites) > 1
+
+
+class SuitePackingPlanner:
+    """
+    Жадная упаковка совместимых наборов: наборы перебираются от длинных к коротким,
+    каждый добавляется в первый совместимый пакет, иначе открывает новый.
+    Пример использования:
+    planner = SuitePackingPlanner()
+    packs = planner.plan(candidates)
+    """
+
+    def __init__(
+        self,
+        max_pack_size: int = PackConst.MAX_PACK_SIZE,
+        duration_tolerance_m: float = PackConst.DURATION_TOLERANCE_M,
+    ) -> None:
+        self._max_pack_size = max_pack_size
+        self._duration_tolerance_m = duration_tolerance_m
+
+    def plan(self, candidates: List[SuitePackCandidate]) -> List[SuitePack]:
+        """
+        :return: пакеты в порядке исходных наборов (по первому набору пакета)
+        """
+        packs: List[SuitePack] = []
+        for candidate in sorted(candidates, key=lambda suite: suite.duration_m, reverse=True):
+            pack = next((pack for pack in packs if self.is_compatible(pack, candidate)), None)
+            if pack is None:
+                pack = SuitePack()
+                packs.append(pack)
+            pack.suites.append(candidate)
+
+        order = {candidate.suite_name: index for index, candidate in enumerate(candidates)}
+        for pack in packs:
+            pack.suites.sort(key=lambda suite: order[suite.suite_name])
+        packs.sort(key=lambda pack: order[pack.suites[0].suite_name])
+        return packs
+
+    def is_compatible(self, pack: SuitePack, candidate: SuitePackCandidate) -> bool:
+        """
+        Можно ли добавить набор в пакет
+        """
+        if len(pack.suites) >= self._max_pack_size:
+            return False
+        if candidate.use_lds_configurator or any(suite.use_lds_configurator for suite in pack.suites):
+            return False
+        if candidate.tu_id in pack.tu_ids:
+            return False
+        if abs(pack.duration_m - candidate.duration_m) > self._duration_tolerance_m:
+            return False
+        return all(suite.measure_conversion_rules == candidate.measure_conversion_rules for suite in pack.suites)
+
+
+def get_suite_imitator_start_time(group_state: dict, suite_name: Optional[str]):
+    """
+    Время старта имитатора набора: в пакете у каждого набора свой имитатор, иначе общее время сессии
+    """
+    start_times = group_state.get("imitator_start_times") or {}
+    return start_times.get(suite_name) or group_state.get("imitator_start_time")
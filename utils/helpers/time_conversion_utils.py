@@ -0,0 +1,158 @@
+"""
+Преобразования времени для парсеров и хелперов сценариев.
+
+Объекты часовых поясов (ZoneInfo по имени, timezone со смещением в минутах из пар [Timestamp, tz] бэкенда)
+создаются один раз и переиспользуются. Функции повторяют прежнее поведение хелперов ws_test_utils
+и WsMessageParser.timestamp_to_datetime, но не строят tz на каждый вызов и не идут в strptime
+там, где формат строки однозначен.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+from msgpack import Timestamp
+
+from constants.test_constants import BaseTN3Constants as TestConst
+
+MOSCOW_TZ = ZoneInfo(TestConst.ZONE_INFO)
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# Позиции разделителей строки OUTPUT_TIME_FORMAT ("%Y-%m-%dT%H:%M:%SZ")
+_OUTPUT_TIME_LENGTH = 20
+_OUTPUT_TIME_SEPARATORS = ((4, "-"), (7, "-"), (10, "T"), (13, ":"), (16, ":"), (19, "Z"))
+_OUTPUT_TIME_DIGITS = ((0, 4), (5, 2), (8, 2), (11, 2), (14, 2), (17, 2))
+
+
+@lru_cache(maxsize=None)
+def get_timezone(tz_name: str) -> ZoneInfo:
+    return ZoneInfo(tz_name)
+
+
+@lru_cache(maxsize=None)
+def offset_timezone(offset_minutes: int) -> timezone:
+    """
+    timezone со смещением от UTC в минутах (второй элемент пары [Timestamp, tz] бэкенда)
+    """
+    if offset_minutes == 0:
+        return timezone.utc
+    return timezone(timedelta(minutes=offset_minutes))
+
+
+def timestamp_to_datetime(value: Any) -> Optional[datetime]:
+    """
+    Время из пары [msgpack.Timestamp, смещение в минутах], msgpack.Timestamp (UTC) или ISO-строки в datetime с tz.
+    Дробная часть Timestamp отбрасывается, как и раньше
+    :raises (AttributeError, TypeError, ValueError): значение не удалось преобразовать
+    """
+    if value is None:
+        return None
+    if isinstance(value, list) and len(value) == 2:
+        time_timestamp, timezone_offset = value
+        if isinstance(time_timestamp, Timestamp):
+            return datetime.fromtimestamp(time_timestamp.seconds, offset_timezone(timezone_offset))
+    if isinstance(value, Timestamp):
+        return datetime.fromtimestamp(value.seconds, tz=timezone.utc)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return datetime.strptime(value.replace("Z", "+00:00"), TestConst.JOURNAL_TIME_FORMAT)
+    return None
+
+
+def ensure_moscow_timezone(input_datetime: datetime) -> None | datetime:
+    """
+    Конвертирует datetime в московское время, если оно не в московской таймзоне.
+
+    :param input_datetime: datetime объект (без timezone считается UTC)
+    :return: datetime в московской таймзоне
+    """
+    if input_datetime is None:
+        return input_datetime
+    if input_datetime.tzinfo is None:
+        input_datetime = input_datetime.replace(tzinfo=timezone.utc)
+    elif input_datetime.tzinfo is MOSCOW_TZ:
+        return input_datetime
+    return input_datetime.astimezone(MOSCOW_TZ)
+
+
+def localize_as_moscow(input_datetime: datetime) -> None | datetime:
+    """
+    Присваивает datetime московский часовой пояс без сдвига времени.
+    Если datetime уже имеет timezone - конвертирует в московское время.
+    """
+    if input_datetime is None:
+        return input_datetime
+    if input_datetime.tzinfo is None:
+        return input_datetime.replace(tzinfo=MOSCOW_TZ)
+    if input_datetime.tzinfo is MOSCOW_TZ:
+        return input_datetime
+    return input_datetime.astimezone(MOSCOW_TZ)
+
+
+def to_moscow_timezone(date_str: str) -> Optional[datetime]:
+    """
+    Преобразует строку времени UTC формата OUTPUT_TIME_FORMAT в московское время
+    """
+    if not date_str or not date_str.strip():
+        return None
+
+    try:
+        if date_str.startswith(("'", '"', '')) or date_str.endswith(("'", '"', '')):
+            date_str = date_str.strip().strip("'").strip('"')
+
+        return _parse_output_time(date_str).astimezone(MOSCOW_TZ)
+
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def report_time_offset_hours(tz_name: str = TestConst.ZONE_INFO) -> Optional[int]:
+    """
+    Смещение часового пояса (часы от UTC) для поля timeOffset в запросах отчётов.
+    """
+    utc_offset = datetime.now(get_timezone(tz_name)).utcoffset()
+    if utc_offset is None:
+        return None
+    return int(utc_offset.total_seconds() // TestConst.SECONDS_PER_HOUR)
+
+
+def now_in(tz_name: str) -> datetime:
+    return datetime.now(get_timezone(tz_name))
+
+
+def moscow_now() -> datetime:
+    """Текущее время в часовом поясе Europe/Moscow."""
+    return datetime.now(MOSCOW_TZ)
+
+
+def to_epoch_us(value: datetime) -> int:
+    """
+    Момент времени в микросекундах от эпохи. datetime без timezone считается UTC (как ensure_moscow_timezone)
+    """
+    if value.tzinfo is None:
+        return (value - _EPOCH_NAIVE) // _MICROSECOND
+    return (value - _EPOCH_UTC) // _MICROSECOND
+
+
+def _parse_output_time(date_str: str) -> datetime:
+    """
+    Строка "%Y-%m-%dT%H:%M:%SZ" в datetime UTC: строки с разделителями на своих местах
+    разбираются fromisoformat, остальные (и ошибки) - strptime, как раньше
+    """
+    if (
+        len(date_str) == _OUTPUT_TIME_LENGTH
+        and all(date_str[pos] == sep for pos, sep in _OUTPUT_TIME_SEPARATORS)
+        and "".join(date_str[start : start + size] for start, size in _OUTPUT_TIME_DIGITS).isdigit()
+    ):
+        try:
+            return datetime.fromisoformat(date_str[:-1]).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    return datetime.strptime(date_str, TestConst.OUTPUT_TIME_FORMAT).replace(tzinfo=timezone.utc)
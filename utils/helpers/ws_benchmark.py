@@ -0,0 +1,425 @@
+"""
+Замер пропускной способности приёма WS: WebSocketClient (фреймы, роутер, декодирование)
+и, опционально, парсинг WsMessageParser на синтетических потоках локального эмулятора хаба.
+
+Запуск:
+python -m utils.helpers.ws_benchmark --duration 10 --stream CommonSchemeContent:50:200 --stream LeaksContent:5:10
+python -m utils.helpers.ws_benchmark --decoders --items 5000
+python -m utils.helpers.ws_benchmark --duration 300 --stream BalanceAlgorithmResultsContent:1:500 --record balance.wsrec
+python -m utils.helpers.ws_benchmark --model-memory balance.wsrec
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import gc
+import logging
+import random
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+import typing
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dacite import Config, from_dict
+
+from clients.websocket_client import WebSocketClient
+from clients.ws_traffic_recorder import WsRecordingReader, WsTrafficRecorder
+from constants.architecture_constants import WsBenchmarkConstants as Bench_Const
+from constants.enums import ReplyStatus
+from infra.ws_hub_emulator import CONTENT_BUILDERS, SyntheticStream, WsHubEmulator
+from models.subscribe_balance_algorithm_results_model import SubscribeBalanceAlgorithmResultsReply
+from models.subscribe_scheme_signals_state_model import SchemeSignalsStateReply
+from utils.helpers.dataclass_decoder import DataclassDecoderCompiler
+from utils.msgpack_utils.msgpack_utils import SignalRFrameDecoder
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WsBenchmarkReport:
+    duration_s: float
+    messages_sent: int
+    messages_received: int
+    bytes_received: int
+    latencies_ms: List[float] = field(default_factory=list)
+    received_by_type: Dict[str, int] = field(default_factory=dict)
+    dropped: int = 0
+    peak_traced_mb: Optional[float] = None
+    max_rss_mb: float = 0.0
+
+    @property
+    def throughput_msg_s(self) -> float:
+        return self.messages_received / self.duration_s if self.duration_s else 0.0
+
+    @property
+    def throughput_mb_s(self) -> float:
+        return self.bytes_received / self.duration_s / 2**20 if self.duration_s else 0.0
+
+    def latency_percentiles_ms(self) -> Dict[int, float]:
+        if len(self.latencies_ms) < 2:
+            return {percentile: (self.latencies_ms[0] if self.latencies_ms else 0.0) for percentile in
+                    Bench_Const.LATENCY_PERCENTILES}  # fmt: skip
+        quantiles = statistics.quantiles(self.latencies_ms, n=100, method="inclusive")
+        return {percentile: quantiles[percentile - 1] for percentile in Bench_Const.LATENCY_PERCENTILES}
+
+    def format(self) -> str:
+        percentiles = ", ".join(f"p{key}={value:.2f}" for key, value in self.latency_percentiles_ms().items())
+        by_type = ", ".join(f"{name}: {count}" for name, count in sorted(self.received_by_type.items()))
+        lines = [
+            f"Длительность: {self.duration_s:.1f} с",
+            f"Отправлено/получено сообщений: {self.messages_sent}/{self.messages_received} (вытеснено {self.dropped})",
+            f"Пропускная способность: {self.throughput_msg_s:.0f} сообщ/с, {self.throughput_mb_s:.2f} МБ/с",
+            f"Задержка, мс: {percentiles}",
+            f"По типам: {by_type}",
+            f"Пиковая память процесса (maxrss): {self.max_rss_mb:.1f} МБ",
+        ]
+        if self.peak_traced_mb is not None:
+            lines.append(f"Пик выделенной памяти Python (tracemalloc): {self.peak_traced_mb:.1f} МБ")
+        return "\n".join(lines)
+
+
+def _get_parser_config() -> Config:
+    """Конфиг dacite WsMessageParser (импорт по требованию: тянет модели, allure и pytest)."""
+    from utils.helpers.ws_message_parser import ws_message_parser
+
+    return ws_message_parser._dacite_config
+
+
+def _get_parsers() -> Dict[str, Callable[[list], object]]:
+    """Парсеры WsMessageParser по типу контента (импорт по требованию: тянет модели, allure и pytest)."""
+    from utils.helpers.ws_message_parser import ws_message_parser as parser
+
+    parser.suppress_recv_logging = True
+    return {
+        "CommonSchemeContent": parser.parse_common_scheme_info_msg,
+        "InputSignalsContent": parser.parse_input_signals_info_msg,
+        "LeaksContent": parser.parse_leaks_content_msg,
+    }
+
+
+@dataclass
+class DecoderBenchmarkResult:
+    data_class: str
+    items: int
+    dacite_ms: float
+    compiled_ms: float
+
+    @property
+    def speedup(self) -> float:
+        return self.dacite_ms / self.compiled_ms if self.compiled_ms else 0.0
+
+    def format(self) -> str:
+        return (
+            f"{self.data_class} ({self.items} элементов): dacite {self.dacite_ms:.2f} мс, "
+            f"сгенерированный декодер {self.compiled_ms:.2f} мс, ускорение x{self.speedup:.1f}"
+        )
+
+
+def _balance_algorithm_results_payload(items: int) -> Dict[str, Any]:
+    content = CONTENT_BUILDERS[Bench_Const.BALANCE_CONTENT_TYPE](Bench_Const.TU_ID, items)
+    return {"replyStatus": ReplyStatus.OK.value, "replyErrors": None, "replyContent": content}
+
+
+def _scheme_signals_state_payload(items: int) -> Dict[str, Any]:
+    signals_states = [
+        {
+            "id": index,
+            "quality": 192,
+            "isRejected": False,
+            "isMasked": False,
+            "isImitated": False,
+            "rejection": None,
+            "generationTime": None,
+            "receivedTime": None,
+            "value": random.uniform(0.0, 100.0),
+            "imitation": None,
+        }
+        for index in range(items)
+    ]
+    content = {"tuId": Bench_Const.TU_ID, "signalsStates": signals_states, "toStates": []}
+    return {"replyStatus": ReplyStatus.OK.value, "replyErrors": None, "replyContent": content}
+
+
+# Модель -> генератор крупного ответа для сравнения декодеров
+DECODER_PAYLOADS: Dict[type, Callable[[int], Dict[str, Any]]] = {
+    SubscribeBalanceAlgorithmResultsReply: _balance_algorithm_results_payload,
+    SchemeSignalsStateReply: _scheme_signals_state_payload,
+}
+
+
+def run_decoder_benchmark(
+    items: int = Bench_Const.DECODER_ITEMS,
+    repeats: int = Bench_Const.DECODER_REPEATS,
+    config: Optional[Config] = None,
+) -> List[DecoderBenchmarkResult]:
+    """
+    Сравнивает dacite.from_dict и DataclassDecoderCompiler на крупных ответах, время - медиана по repeats
+    :param config: конфиг dacite (None - конфиг WsMessageParser, импорт тянет allure и pytest)
+    """
+    config = config or _get_parser_config()
+    compiler = DataclassDecoderCompiler(config)
+    results = []
+    for data_class, build_payload in DECODER_PAYLOADS.items():
+        payload = build_payload(items)
+        if compiler.decode(data_class, payload) != from_dict(data_class=data_class, data=payload, config=config):
+            raise AssertionError(f"Декодеры вернули разные {data_class.__name__}")
+        timings = {}
+        for name, decode in (
+            ("dacite", lambda: from_dict(data_class=data_class, data=payload, config=config)),
+            ("compiled", lambda: compiler.decode(data_class, payload)),
+        ):
+            samples = []
+            for _ in range(repeats):
+                started_at = time.perf_counter()
+                decode()
+                samples.append((time.perf_counter() - started_at) * 1000)
+            timings[name] = statistics.median(samples)
+        results.append(
+            DecoderBenchmarkResult(
+                data_class=data_class.__name__,
+                items=items,
+                dacite_ms=timings["dacite"],
+                compiled_ms=timings["compiled"],
+            )
+        )
+    return results
+
+
+@dataclass
+class ModelMemoryReport:
+    messages: int
+    diagnostic_areas: int
+    slotted_mb: float
+    plain_mb: float
+
+    def format(self) -> str:
+        saved = 1 - self.slotted_mb / self.plain_mb if self.plain_mb else 0.0
+        return "\n".join(
+            [
+                f"Сообщений BalanceAlgorithmResultsContent: {self.messages}, diagnosticAreas: {self.diagnostic_areas}",
+                f"Модели со __slots__: {self.slotted_mb:.1f} МБ",
+                f"Те же модели без __slots__: {self.plain_mb:.1f} МБ",
+                f"Экономия: {saved:.0%}",
+            ]
+        )
+
+
+def _without_slots(data_class: type, clones: Optional[Dict[type, type]] = None) -> type:
+    """
+    Копия dataclass (и вложенных dataclass в аннотациях) без __slots__ - база для сравнения памяти
+    """
+    clones = {} if clones is None else clones
+    if data_class in clones:
+        return clones[data_class]
+    hints = typing.get_type_hints(data_class)
+    fields = [
+        (
+            model_field.name,
+            _replace_dataclasses(hints[model_field.name], clones),
+            dataclasses.field(default=model_field.default, default_factory=model_field.default_factory),
+        )
+        for model_field in dataclasses.fields(data_class)
+    ]
+    clones[data_class] = dataclasses.make_dataclass(data_class.__name__, fields)
+    return clones[data_class]
+
+
+def _replace_dataclasses(type_: Any, clones: Dict[type, type]) -> Any:
+    if dataclasses.is_dataclass(type_):
+        return _without_slots(type_, clones)
+    origin = typing.get_origin(type_)
+    args = typing.get_args(type_)
+    if origin is list:
+        return List[_replace_dataclasses(args[0], clones)]
+    if origin is typing.Union:
+        return typing.Union[tuple(_replace_dataclasses(arg, clones) for arg in args)]
+    return type_
+
+
+def _read_balance_algorithm_payloads(path: str) -> List[Dict[str, Any]]:
+    payloads = []
+    for recorded in WsRecordingReader(path).frames([Bench_Const.BALANCE_CONTENT_TYPE]):
+        for message in SignalRFrameDecoder().feed_lazy(recorded.frame):
+            if message.content_type != Bench_Const.BALANCE_CONTENT_TYPE:
+                continue
+            args = message.decode()[-1]
+            payloads.extend(arg for arg in args if isinstance(arg, dict) and "replyStatus" in arg)
+    return payloads
+
+
+def _retained_diagnostic_areas_mb(
+    payloads: List[Dict[str, Any]], data_class: type, config: Config
+) -> Tuple[float, int]:
+    """
+    Память diagnosticAreas, накопленных так же, как в poll_balance_algorithm_diagnostic_areas
+    """
+    compiler = DataclassDecoderCompiler(config)
+    compiler.decode(data_class, payloads[0])
+    gc.collect()
+    tracemalloc.start()
+    try:
+        collected_diagnostic_areas = []
+        for payload in payloads:
+            reply_content = compiler.decode(data_class, payload).replyContent
+            if reply_content and reply_content.flowAreas:
+                for flow_area in reply_content.flowAreas:
+                    collected_diagnostic_areas.extend(flow_area.diagnosticAreas)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return retained / 2**20, len(collected_diagnostic_areas)
+
+
+def measure_model_memory(path: str, config: Optional[Config] = None) -> ModelMemoryReport:
+    """
+    Сравнивает память diagnosticAreas из записи BalanceAlgorithmResultsContent (WsTrafficRecorder)
+    для моделей со __slots__ и их копий без __slots__
+    :param config: конфиг dacite (None - конфиг WsMessageParser, импорт тянет allure и pytest)
+    """
+    config = config or _get_parser_config()
+    payloads = _read_balance_algorithm_payloads(path)
+    if not payloads:
+        raise ValueError(f"В записи {path} нет сообщений {Bench_Const.BALANCE_CONTENT_TYPE}")
+    slotted_mb, diagnostic_areas = _retained_diagnostic_areas_mb(payloads, SubscribeBalanceAlgorithmResultsReply, config)
+    plain_mb, _ = _retained_diagnostic_areas_mb(payloads, _without_slots(SubscribeBalanceAlgorithmResultsReply), config)
+    return ModelMemoryReport(
+        messages=len(payloads), diagnostic_areas=diagnostic_areas, slotted_mb=slotted_mb, plain_mb=plain_mb
+    )
+
+
+class _ByteCountingWebSocketClient(WebSocketClient):
+    """WebSocketClient, считающий байты принятых фреймов (пропускная способность - по стороне клиента)"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.bytes_received = 0
+
+    async def _handle_frame(self, chunk) -> None:
+        self.bytes_received += len(chunk)
+        await super()._handle_frame(chunk)
+
+
+class _EmulatorThread:
+    """Эмулятор хаба на отдельном event loop, чтобы генерация не делила loop с замеряемым клиентом"""
+
+    def __init__(self, streams: List[SyntheticStream]) -> None:
+        self.emulator = WsHubEmulator(streams)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="ws-hub-emulator", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.emulator.start(), self._loop).result(Bench_Const.STOP_TIMEOUT_S)
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.emulator.stop(), self._loop).result(Bench_Const.STOP_TIMEOUT_S)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=Bench_Const.STOP_TIMEOUT_S)
+        self._loop.close()
+
+
+async def run_ws_benchmark(
+    streams: List[SyntheticStream],
+    duration_s: float = Bench_Const.DURATION_S,
+    parse: bool = False,
+    trace_memory: bool = False,
+    recorder: Optional[WsTrafficRecorder] = None,
+) -> WsBenchmarkReport:
+    """
+    Принимает потоки эмулятора duration_s секунд и извлекает каждое сообщение из очереди клиента
+    :param parse: дополнительно парсить сообщения WsMessageParser (CommonScheme, InputSignals, Leaks)
+    :param trace_memory: пик памяти Python через tracemalloc (заметно замедляет приём)
+    :param recorder: записывать принятые фреймы (например, для --model-memory)
+    """
+    parsers = _get_parsers() if parse else {}
+    emulator_thread = _EmulatorThread(streams)
+    emulator_thread.start()
+    if trace_memory:
+        tracemalloc.start()
+    report = WsBenchmarkReport(duration_s=duration_s, messages_sent=0, messages_received=0, bytes_received=0)
+    try:
+        ws_client = _ByteCountingWebSocketClient(emulator_thread.emulator.host, "", "", recorder=recorder, scheme="ws")
+        async with ws_client:
+            ws_client.suppress_recv_logging = True
+            started_at = time.perf_counter()
+            deadline = started_at + duration_s
+            while (remaining := deadline - time.perf_counter()) > 0:
+                try:
+                    message = await asyncio.wait_for(ws_client.recv_queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                received_at = time.perf_counter()
+                content_type = message[3] if len(message) > 3 and isinstance(message[3], str) else None
+                if content_type is None:
+                    continue
+                if parse_message := parsers.get(content_type):
+                    parse_message(message)
+                sent_at = message[1].get(Bench_Const.SENT_AT_HEADER) if isinstance(message[1], dict) else None
+                if sent_at is not None:
+                    report.latencies_ms.append((received_at - float(sent_at)) * 1000)
+                report.messages_received += 1
+                report.received_by_type[content_type] = report.received_by_type.get(content_type, 0) + 1
+            report.duration_s = time.perf_counter() - started_at
+            report.bytes_received = ws_client.bytes_received
+            report.dropped = ws_client.get_queue_stats()["any"].dropped
+    finally:
+        emulator_thread.stop()
+        if trace_memory:
+            report.peak_traced_mb = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+    report.messages_sent = emulator_thread.emulator.messages_sent
+    report.max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер приёма WS на локальном эмуляторе хаба")
+    parser.add_argument("--duration", type=float, default=Bench_Const.DURATION_S, help="Длительность замера, с")
+    parser.add_argument(
+        "--stream",
+        action="append",
+        default=None,
+        help="Поток content_type:сообщений_в_секунду:элементов. Можно несколько",
+    )
+    parser.add_argument("--parse", action="store_true", help="Парсить сообщения WsMessageParser")
+    parser.add_argument("--trace-memory", action="store_true", help="Пик памяти через tracemalloc")
+    parser.add_argument("--decoders", action="store_true", help="Сравнить dacite и сгенерированные декодеры")
+    parser.add_argument("--items", type=int, default=Bench_Const.DECODER_ITEMS, help="Элементов в ответе (--decoders)")
+    parser.add_argument("--record", default=None, help="Записать принятые фреймы в файл")
+    parser.add_argument(
+        "--model-memory",
+        default=None,
+        metavar="RECORDING",
+        help="Память diagnosticAreas из записи BalanceAlgorithmResultsContent: модели со __slots__ и без",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.decoders:
+        for result in run_decoder_benchmark(args.items):
+            print(result.format())
+        return
+    if args.model_memory:
+        print(measure_model_memory(args.model_memory).format())
+        return
+    streams = [SyntheticStream.parse(spec) for spec in (args.stream or Bench_Const.DEFAULT_STREAMS)]
+    recorder = WsTrafficRecorder(args.record) if args.record else None
+    try:
+        report = asyncio.run(
+            run_ws_benchmark(
+                streams, args.duration, parse=args.parse, trace_memory=args.trace_memory, recorder=recorder
+            )
+        )
+    finally:
+        if recorder is not None:
+            recorder.close()
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,17 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from typing import Any, Dict, List, Optional, Type, TypeVar
 from uuid import UUID
-from zoneinfo import ZoneInfo
 
-from allure import attach, attachment_type
-from dacite import Config, DaciteError, from_dict
-from msgpack import Timestamp
+from allure import attachment_type
+from dacite import Config, DaciteError
 from pytest import fail
 
 import models.subscribe_scheme_signals_state_model as signals_state_model
 from constants.architecture_constants import WebSocketClientConstants as WS_Const
 from constants.enums import ExportedDataType, ExportStatus, ReplyStatus
-from constants.test_constants import BaseTN3Constants as TestConst
 from models.acknowledge_leak_model import AcknowledgeLeakReply
 from models.basic_info_model import BasicInfoReply
 from models.export_reports_model import ReportDataExportedNotification
@@ -43,6 +40,9 @@ from models.unimitate_signal_model import UnimitateSignalReply
 from models.unmask_lds_command_model import UnmaskLdsReply
 from models.unmask_signal_model import UnmaskSignalReply
 from models.upload_exported_file_model import DownloadExportedDataReply
+from utils.helpers import time_conversion_utils as time_conversion
+from utils.helpers.dataclass_decoder import DataclassDecoderCompiler
+from utils.helpers.pytest_deferred_attach import attach_deferred
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +60,9 @@ class WsMessageParser:
 
     def __init__(self, dacite_config: Config = None):
         self._dacite_config = dacite_config or self._get_default_config()
+        self._decoder = DataclassDecoderCompiler(self._dacite_config)
+        # Декодеры для Config, переданных в _parse_message: id(config) -> (config, декодер)
+        self._config_decoders: Dict[int, tuple[Config, DataclassDecoderCompiler]] = {}
         self.suppress_recv_logging: bool = False
 
     @staticmethod
@@ -68,20 +71,7 @@ class WsMessageParser:
         Преобразует время из формата пары msgpack. Timestamp и tz в datetime с timezone
         """
         try:
-            if value is None:
-                return None
-            if isinstance(value, list) and len(value) == 2:
-                time_timestamp, timezone_offset = value
-                if isinstance(time_timestamp, Timestamp):
-                    datetime_timezone = timezone(timedelta(minutes=timezone_offset))
-                    return datetime.fromtimestamp(time_timestamp.seconds, datetime_timezone)
-            if isinstance(value, Timestamp):
-                return datetime.fromtimestamp(value.seconds, tz=timezone.utc)
-            if isinstance(value, str):
-                try:
-                    return datetime.fromisoformat(value)
-                except ValueError:
-                    return datetime.strptime(value.replace("Z", "+00:00"), TestConst.JOURNAL_TIME_FORMAT)
+            return time_conversion.timestamp_to_datetime(value)
         except (AttributeError, TypeError, ValueError) as error:
             fail(f"Ошибка конвертации времени: {error}")
 
@@ -341,23 +331,29 @@ class WsMessageParser:
         if error_message:
             fail(f"Ошибка в сообщении типа: {data_class_name} текст ошибки: {error_message}")
         try:
-            message = from_dict(
-                data_class=data_class, data=data, config=config or self._dacite_config  # type: ignore[arg-type]
-            )
+            message = self._get_decoder(config).decode(data_class, data)
             if not self.suppress_recv_logging:
-                try:
-                    attach(
-                        str(message) + f" {datetime.now(ZoneInfo(WS_Const.ZONE_INFO))}",
-                        name=data_class_name,
-                        attachment_type=attachment_type.TEXT,
-                    )
-                except (KeyError, RuntimeError) as error:
-                    logger.debug("Allure attach пропущен: %s", error)
+                parsed_at = time_conversion.now_in(WS_Const.ZONE_INFO)
+                attach_deferred(
+                    lambda: f"{message} {parsed_at}", name=data_class_name, attachment_type=attachment_type.TEXT
+                )
 
             return message
         except DaciteError as error:
             fail(f"Ошибка парсинга сообщения типа: {data_class_name} текст ошибки: {error}")
 
+    def _get_decoder(self, config: Optional[Config]) -> DataclassDecoderCompiler:
+        """
+        Сгенерированные декодеры для config (по умолчанию - для конфига парсера)
+        """
+        if config is None or config is self._dacite_config:
+            return self._decoder
+        cached = self._config_decoders.get(id(config))
+        if cached is None or cached[0] is not config:
+            cached = (config, DataclassDecoderCompiler(config))
+            self._config_decoders[id(config)] = cached
+        return cached[1]
+
     def _parse_scheme_signal_states(self, raw_signals: list) -> list[signals_state_model.SignalState]:
         """Разворачивает signalsStates: поддерживает формат [type, dict] и уже готовые dict."""
         signals_states = []
@@ -390,18 +386,14 @@ class WsMessageParser:
     @staticmethod
     def _create_attach_from_ws_message(ws_message) -> None:
         """
-        Создает txt вложение ws сообщения в аллюр
+        Создает txt вложение ws сообщения в аллюр (при падении теста, см. pytest_deferred_attach)
         """
 
-        str_message = str(ws_message)
-        try:
-            attach(
-                str_message,
-                name=f"Распакованное сообщение от api-gateway {datetime.now(ZoneInfo(WS_Const.ZONE_INFO))}",
-                attachment_type=attachment_type.TEXT,
-            )
-        except (KeyError, RuntimeError) as error:
-            logger.debug("Allure attach пропущен: %s", error)
+        attach_deferred(
+            lambda: str(ws_message),
+            name=f"Распакованное сообщение от api-gateway {time_conversion.now_in(WS_Const.ZONE_INFO)}",
+            attachment_type=attachment_type.TEXT,
+        )
 
     def _should_suppress_recv_attach(self) -> bool:
         if self.suppress_recv_logging:
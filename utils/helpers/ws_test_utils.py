@@ -8,7 +8,6 @@ from dataclasses import asdict, is_dataclass
 from datetime import datetime, timedelta, timezone
 from enum import IntEnum, IntFlag
 from typing import Any, Callable, List, Optional, Set, Type, TypeVar
-from zoneinfo import ZoneInfo
 
 import allure
 from msgpack import Timestamp as MsgpackTimestamp
@@ -42,6 +41,15 @@ from models.subscribe_all_leaks_info_model import SubscribeAllLeaksInfoReply
 from models.subscribe_common_scheme_model import DiagnosticArea, FlowArea
 from models.subscribe_leaks_model import Leak
 from models.subscribe_main_page_info_model import MainPageLeakInfo
+from utils.helpers.journal_store import JournalStore
+from utils.helpers.scheme_index import SchemeIndex
+from utils.helpers.time_conversion_utils import (  # noqa: F401 - хелперы времени доступны и через t_utils
+    ensure_moscow_timezone,
+    localize_as_moscow,
+    moscow_now,
+    report_time_offset_hours,
+    to_moscow_timezone,
+)
 from utils.helpers.ws_message_parser import ws_message_parser
 from utils.msgpack_utils.message_filters import is_desired_invocation_id, is_desired_type
 
@@ -119,49 +127,6 @@ def get_leak_time_window(
     return leak_start, leak_end
 
 
-def ensure_moscow_timezone(input_datetime: datetime) -> None | datetime:
-    """
-    Конвертирует datetime в московское время, если оно не в московской таймзоне.
-
-    :param input_datetime: datetime объект
-    :return: datetime в московской таймзоне
-    """
-    if input_datetime is None:
-        return input_datetime
-
-    # Если datetime без timezone - считаем что это UTC
-    if input_datetime.tzinfo is None:
-        input_datetime = input_datetime.replace(tzinfo=timezone.utc)
-
-    # Конвертируем в московское время
-    return input_datetime.astimezone(ZoneInfo(TestConst.ZONE_INFO))
-
-
-def report_time_offset_hours(tz_name: str = TestConst.ZONE_INFO) -> Optional[int]:
-    """
-    Смещение часового пояса (часы от UTC) для поля timeOffset в запросах отчётов.
-    """
-    now = datetime.now(ZoneInfo(tz_name))
-    utc_offset = now.utcoffset()
-    if utc_offset is None:
-        return None
-    return int(utc_offset.total_seconds() // TestConst.SECONDS_PER_HOUR)
-
-
-def localize_as_moscow(input_datetime: datetime) -> None | datetime:
-    """
-    Присваивает datetime московский часовой пояс без сдвига времени.
-    Если datetime уже имеет timezone - конвертирует в московское время.
-    """
-    if input_datetime is None:
-        return input_datetime
-
-    moscow_tz = ZoneInfo(TestConst.ZONE_INFO)
-    if input_datetime.tzinfo is None:
-        return input_datetime.replace(tzinfo=moscow_tz)
-    return input_datetime.astimezone(moscow_tz)
-
-
 def format_datetime_moscow(value: Optional[datetime]) -> str:
     """Строковое представление datetime в Europe/Moscow для вложений Allure."""
     if value is None:
@@ -194,19 +159,16 @@ def find_rejection_journal_message(
     """
     Фильтрует сообщения журнала по tag и временному диапазону,
     затем ищет целевое сообщение по technologicalSection и event.
-    """
-    time_filtered = [
-        msg for msg in messages_info if msg.tag == tag and range_start <= ensure_moscow_timezone(msg.time) <= range_end
-    ]
-    time_filtered.sort(key=lambda msg: ensure_moscow_timezone(msg.time), reverse=True)
-
-    target_msg = next(
-        (
-            msg
-            for msg in time_filtered
-            if msg.technologicalSection == technological_section and msg.event.rstrip() == expected_event
-        ),
-        None,
+    Поиск идёт по индексу JournalStore, построенному один раз на список messages_info.
+    """
+    journal = JournalStore.of(messages_info)
+    time_filtered = journal.range(range_start, range_end, tag=tag)
+    target_msg = journal.latest(
+        range_start,
+        range_end,
+        tag=tag,
+        technological_section=technological_section,
+        stripped_event=expected_event,
     )
     return time_filtered, target_msg
 
@@ -230,9 +192,8 @@ def get_longest_flow_area(flow_areas: List[FlowArea]) -> Optional[FlowArea]:
     if not flow_areas:
         return None
     try:
-        longest_flow_area = max(flow_areas, key=lambda flow_area: len(flow_area.diagnosticAreas))
-        return longest_flow_area
-    except (TypeError, ValueError):
+        return SchemeIndex.of(flow_areas).longest_flow_area
+    except (AttributeError, TypeError, ValueError):
         return None
 
 
@@ -399,21 +360,10 @@ def find_diagnostic_area_by_id(flow_areas: List[FlowArea], id_value: Optional[in
     """
     Ищет ДУ по id в списке участков карты течений, исключает дубликаты по количеству pipeIds
     """
-    candidates = []
     if not flow_areas or not id_value:
         return None
     try:
-        for flow_area in flow_areas:
-            for diagnostic_area in flow_area.diagnosticAreas:
-                if diagnostic_area.id == id_value:
-                    candidates.append(diagnostic_area)
-        if not candidates:
-            return None
-        elif len(candidates) == 1:
-            return candidates[0]
-        else:
-            # Среди дубликатов ищет ДУ с наибольшим количеством pipeIds
-            return max(candidates, key=lambda candidate: len(candidate.pipeIds))
+        return SchemeIndex.of(flow_areas).by_id(id_value)
     except (AttributeError, KeyError, RuntimeError, TypeError, ValueError):
         return None
 
@@ -422,21 +372,10 @@ def find_diagnostic_area_by_pipe_id(flow_areas: List[FlowArea], pipe_id: int) ->
     """
     Ищет ДУ по pipe id в списке участков карты течений, исключает дубликаты по количеству pipeIds
     """
-    candidates = []
     if not flow_areas:
         return None
     try:
-        for flow_area in flow_areas:
-            for diagnostic_area in flow_area.diagnosticAreas:
-                if diagnostic_area.pipeIds and pipe_id in diagnostic_area.pipeIds:
-                    candidates.append(diagnostic_area)
-        if not candidates:
-            return None
-        elif len(candidates) == 1:
-            return candidates[0]
-        else:
-            # Среди дубликатов ищет ДУ с наибольшим количеством pipeIds
-            return max(candidates, key=lambda candidate: len(candidate.pipeIds))
+        return SchemeIndex.of(flow_areas).by_pipe_id(pipe_id)
     except (AttributeError, KeyError, RuntimeError, TypeError, ValueError):
         return None
 
@@ -445,31 +384,32 @@ def find_diagnostic_areas_by_ids(flow_areas: List[FlowArea], id_list: List[int])
     """
     Получает список ДУ из списка flow_areas по списку id
     """
-    diagnostic_areas = [
+    return [
         result
         for diagnostic_area_id in id_list
         if (result := find_diagnostic_area_by_id(flow_areas, diagnostic_area_id)) is not None
     ]
 
-    return diagnostic_areas
-
 
 def find_diagnostic_areas_by_pipe_ids(flow_areas: List[FlowArea], id_list: List[int]) -> List[DiagnosticArea]:
     """
     Получает список ДУ из списка flow_areas по списку pipe id
     """
-    diagnostic_areas = [
+    return [
         result for pipe_id in id_list if (result := find_diagnostic_area_by_pipe_id(flow_areas, pipe_id)) is not None
     ]
 
-    return diagnostic_areas
-
 
 def find_base_diagnostic_areas(flow_areas: List[FlowArea]) -> List[DiagnosticArea]:
     """
-    Получает список базовых ДУ из списка flow_areas
+    Получает список базовых ДУ (TestConst.DIAGNOSTIC_AREA_BASE_IDS) из списка flow_areas
     """
-    return find_diagnostic_areas_by_ids(flow_areas, TestConst.DIAGNOSTIC_AREA_BASE_IDS)
+    if not flow_areas:
+        return []
+    try:
+        return SchemeIndex.of(flow_areas).base_diagnostic_areas()
+    except (AttributeError, KeyError, RuntimeError, TypeError, ValueError):
+        return []
 
 
 def find_leak_by_coordinate(
@@ -490,24 +430,6 @@ def find_leak_by_coordinate(
     return None
 
 
-def to_moscow_timezone(date_str: str) -> Optional[datetime]:
-    """
-    Преобразует строку времени в московское время
-    """
-    if not date_str or not date_str.strip():
-        return None
-
-    try:
-        if date_str.startswith(("'", '"', '')) or date_str.endswith(("'", '"', '')):
-            date_str = date_str.strip().strip("'").strip('"')
-
-        date_utc = datetime.strptime(date_str, TestConst.OUTPUT_TIME_FORMAT).replace(tzinfo=timezone.utc)
-        return date_utc.astimezone(ZoneInfo(TestConst.ZONE_INFO))
-
-    except (AttributeError, TypeError, ValueError):
-        return None
-
-
 def create_dict_from_dataclass(cls: Type, **kwargs) -> Optional[dict]:
     """Создает словарь из экземпляра dataclass c нужными параметрами"""
     if not is_dataclass(cls):
@@ -535,6 +457,9 @@ def create_journal_req_body(**kwargs) -> dict:
         for key in ('start', 'end'):
             if isinstance(period.get(key), datetime):
                 period[key] = datetime_to_iso_format(period[key])
+    pagination = result.get('pagination')
+    if pagination and isinstance(pagination.get('eventTime'), datetime):
+        pagination['eventTime'] = datetime_to_iso_format(pagination['eventTime'])
     return result
 
 
@@ -1223,14 +1148,22 @@ async def connect_and_subscribe_msg(
     ws_invoke_type: str,
     ws_invoke_params: Any = None,
     timeout: float = TestConst.BASIC_MESSAGE_TIMEOUT,
+    max_age_s: Optional[float] = None,
 ) -> list:
     """
     Подключение типа subscribe к заданной подписке и получение сообщения с заданным типом контента
+    :param max_age_s: если сообщение подписки с теми же параметрами уже приходило не раньше max_age_s секунд
+    назад (этому или другому клиенту набора), оно возвращается сразу, без ожидания следующего push.
+    None - всегда ждать новое сообщение
     """
     await connect(ws_client, ws_invoke_type, ws_invoke_params)
     try:
         with allure.step(f"Получение сообщения с контентом типа: {ws_message_type}"):
-            payload = await ws_client.receive_by_type(ws_message_type, timeout=timeout)
+            payload = None
+            if max_age_s is not None:
+                payload = ws_client.get_latest_by_type(ws_message_type, ws_invoke_params, max_age_s=max_age_s)
+            if payload is None:
+                payload = await ws_client.receive_by_type(ws_message_type, timeout=timeout)
 
         return payload
     except (asyncio.TimeoutError, OSError, ConnectionError, ConnectionResetError) as error:
@@ -1301,8 +1234,3 @@ def get_leak_diagnostic_area_samples(
         fail(f"За {total_wait} секунд не пришло ни одного сообщения для ДУ с name={leak_diagnostic_area_name}.")
     return leak_diagnostic_area_samples
 
-
-def moscow_now() -> datetime:
-    """Текущее время в часовом поясе Europe/Moscow."""
-    return datetime.now(ZoneInfo(TestConst.ZONE_INFO))
-    
\ No newline at end of file
@@ -1,8 +1,10 @@
 import logging
-from typing import Any, List
+from typing import Any, List, Optional, Tuple
 
 import msgpack
 
+from constants.architecture_constants import WebSocketClientConstants as WS_Const
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,8 +13,6 @@ def encode_with_varint_prefix(payload: bytes) -> bytes:
     Префиксирует payload длиной в varint, затем объединяет с телом в bytes.
     Это расчет длины тела меседжа в битах с установкой заголовка для signalr-based интеграций
     """
-    from clients.websocket_client import logger
-
     length = len(payload)
     parts = []
     while True:
@@ -23,18 +23,17 @@ def encode_with_varint_prefix(payload: bytes) -> bytes:
         else:
             parts.append(byte)
             break
-    logger.info(f"Длина байтов до тела сообщения {parts}")
     return bytes(parts) + payload
 
 
-def read_varint(data: bytes) -> (int, int):
+def read_varint(data: bytes, offset: int = 0) -> Tuple[int, int]:
     """
-    Читает varint (7 бит данных + MSB-флаг продолжения) из начала байтовой строки.
+    Читает varint (7 бит данных + MSB-флаг продолжения) с позиции offset байтовой строки.
     Возвращает кортеж (значение, кол-во байт в префиксе).
     """
     value = 0
     shift = 0
-    index = 0
+    index = offset
     while True:
         if index >= len(data):
             raise ValueError("Varint extends beyond data length")
@@ -46,20 +45,200 @@ def read_varint(data: bytes) -> (int, int):
         if (byte & 0x80) == 0:
             break
         shift += 7
-    return value, index
+    return value, index - offset
 
 
-def parse_message(data_bytes) -> List[Any]:
+class LazySignalRMessage:
     """
-    Распаковывает все объекты из тела меседжа
+    Сообщение SignalR, у которого сразу декодирован только заголовок: тип сообщения, invocation_id
+    и тип контента (target). Тело декодируется при первом обращении к decode() - сообщения,
+    которые никто не извлёк (нет получателя, очередь очищена или переполнена), не декодируются.
     """
 
-    length, header_len = read_varint(data_bytes)
-    logger.info(f"SignalR varint length: {length} bytes (префикс занял {header_len} байт)")
+    __slots__ = ("kind", "invocation_id", "content_type", "size", "_payload", "_message")
+
+    _UNDECODED = object()
+
+    def __init__(self, payload) -> None:
+        """
+        :param payload: messagepack одного сообщения (bytes/memoryview, без varint-префикса)
+        """
+        self._payload = payload
+        self._message = self._UNDECODED
+        self.size = len(payload)
+        self.kind, self.invocation_id, self.content_type = self._peek_header(payload)
+
+    @property
+    def is_ping(self) -> bool:
+        return self.kind == WS_Const.PING_MESSAGE_TYPE
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._message is not self._UNDECODED
+
+    def decode(self) -> Any:
+        """
+        Сообщение целиком (как parse_message), декодируется один раз
+        """
+        message = self._message
+        if message is self._UNDECODED:
+            message = msgpack.unpackb(self._payload, strict_map_key=False)
+            self._message = message
+        return message
+
+    def __repr__(self) -> str:
+        return (
+            f"SignalR(type={self.kind}, invocation_id={self.invocation_id}, "
+            f"content={self.content_type}, {self.size} байт)"
+        )
+
+    @classmethod
+    def _peek_header(cls, payload) -> Tuple[Optional[int], Optional[Any], Optional[str]]:
+        """
+        Читает первые элементы массива сообщения: [тип, заголовки, invocation_id, target, ...].
+        invocation_id есть у Invocation, StreamItem, Completion, StreamInvocation, CancelInvocation;
+        target (тип контента) - у Invocation и StreamInvocation.
+        В Unpacker копируется только начало сообщения, целиком - если заголовок в него не поместился
+        """
+        head = memoryview(payload)[: WS_Const.HEADER_PEEK_BYTES]
+        try:
+            return cls._unpack_header(head, is_complete=len(head) == len(payload))
+        except msgpack.OutOfData:
+            return cls._unpack_header(payload, is_complete=True)
+
+    @staticmethod
+    def _unpack_header(data, is_complete: bool) -> Tuple[Optional[int], Optional[Any], Optional[str]]:
+        """
+        :param is_complete: data - сообщение целиком; иначе при нехватке данных поднимается OutOfData
+        """
+        unpacker = msgpack.Unpacker(strict_map_key=False)
+        unpacker.feed(data)
+        kind = invocation_id = content_type = None
+        try:
+            length = unpacker.read_array_header()
+            if length < 1:
+                return None, None, None
+            kind = unpacker.unpack()
+            if kind not in _INVOCATION_ID_MESSAGE_TYPES or length <= WS_Const.INVOCATION_ID_INDEX:
+                return kind, None, None
+            unpacker.skip()
+            invocation_id = unpacker.unpack()
+            if kind in _TARGET_MESSAGE_TYPES and length > WS_Const.EVENT_TYPE_INDEX:
+                target = unpacker.unpack()
+                content_type = target if isinstance(target, str) else None
+        except msgpack.OutOfData:
+            if not is_complete:
+                raise
+        except (ValueError, msgpack.UnpackException):
+            # Не массив SignalR - тело будет декодировано целиком по запросу
+            pass
+        return kind, invocation_id, content_type
+
+
+_INVOCATION_ID_MESSAGE_TYPES = (
+    WS_Const.DEFAULT_SIGNALR_MESSAGE_TYPE,
+    WS_Const.STREAM_ITEM_MESSAGE_TYPE,
+    WS_Const.COMPLETION_MESSAGE_TYPE,
+    WS_Const.STREAM_INVOCATION_MESSAGE_TYPE,
+    WS_Const.CANCEL_INVOCATION_MESSAGE_TYPE,
+)
+_TARGET_MESSAGE_TYPES = (WS_Const.DEFAULT_SIGNALR_MESSAGE_TYPE, WS_Const.STREAM_INVOCATION_MESSAGE_TYPE)
+
+
+def decode_message(message: Any) -> Any:
+    """
+    Декодированное сообщение: тело LazySignalRMessage, остальное - как есть
+    """
+    if isinstance(message, LazySignalRMessage):
+        return message.decode()
+    return message
+
 
-    # 3) извлекаем payload
-    payload = data_bytes[header_len: header_len + length]  # fmt: skip
-    if len(payload) < length:
+class SignalRFrameDecoder:
+    """
+    Потоковый декодер SignalR (messagepack с varint-префиксом длины).
+    Один ws-фрейм может содержать несколько сообщений - декодер возвращает все.
+    Незавершённое сообщение в конце фрейма сохраняется в буфере и дополняется следующим фреймом.
+    Payload читается через memoryview без копирования; в буфер копируется только незавершённый хвост.
+    Пример использования:
+    decoder = SignalRFrameDecoder()
+    for message in decoder.feed(chunk):       # декодированные сообщения
+        ...
+    for message in decoder.feed_lazy(chunk):  # LazySignalRMessage, тело декодируется по запросу
+        ...
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    @property
+    def pending_bytes(self) -> int:
+        """Байт незавершённого сообщения в буфере"""
+        return len(self._buffer)
+
+    def feed(self, chunk) -> List[Any]:
+        """
+        Декодирует все завершённые сообщения фрейма
+        :param chunk: bytes/bytearray/memoryview фрейма
+        """
+        return [msgpack.unpackb(payload, strict_map_key=False) for payload in self.split(chunk)]
+
+    def feed_lazy(self, chunk) -> List[LazySignalRMessage]:
+        """
+        Завершённые сообщения фрейма с декодированным заголовком
+        """
+        return [LazySignalRMessage(payload) for payload in self.split(chunk)]
+
+    def split(self, chunk) -> List[memoryview]:
+        """
+        Payload (без varint-префикса) всех завершённых сообщений фрейма
+        """
+        if self._buffer:
+            self._buffer += chunk
+            data = self._buffer
+        else:
+            data = chunk
+        view = memoryview(data)
+        payloads = []
+        offset = 0
+        total = len(view)
+        while offset < total:
+            try:
+                length, header_len = read_varint(view, offset)
+            except ValueError:
+                break
+            start = offset + header_len
+            end = start + length
+            if end > total:
+                break
+            payloads.append(view[start:end])
+            offset = end
+        # Выданные memoryview ссылаются на data: буфер не изменяется, а заменяется новым
+        self._buffer = bytearray(view[offset:])
+        return payloads
+
+    def reset(self) -> None:
+        self._buffer = bytearray()
+
+
+def parse_messages(data_bytes) -> List[Any]:
+    """
+    Распаковывает все сообщения ws-фрейма
+    """
+    decoder = SignalRFrameDecoder()
+    messages = decoder.feed(data_bytes)
+    if decoder.pending_bytes:
         raise ValueError("Данных меньше, чем указано в префиксе длины")
-    unpacked_object = msgpack.unpackb(payload, strict_map_key=False)
-    return unpacked_object
+    return messages
+
+
+def parse_message(data_bytes) -> List[Any]:
+    """
+    Распаковывает первое сообщение ws-фрейма
+    """
+    length, header_len = read_varint(data_bytes)
+    with memoryview(data_bytes) as view:
+        payload = view[header_len: header_len + length]  # fmt: skip
+        if len(payload) < length:
+            raise ValueError("Данных меньше, чем указано в префиксе длины")
+        return msgpack.unpackb(payload, strict_map_key=False)